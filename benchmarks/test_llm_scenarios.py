@@ -31,6 +31,7 @@ class PTIValidator:
         # Elemento
         'elemento.crea', 'elemento.legge', 'elemento.scrive',
         'elemento.esiste', 'elemento.elimina', 'elemento.clona',
+        'elemento.modifica',
 
         # Contenitore
         'contenitore.crea', 'contenitore.aggiunge', 'contenitore.rimuove',
@@ -13,9 +13,10 @@ Run: pytest benchmarks/test_performance.py --benchmark-autosave
 
 import pytest
 import sys
+from functools import partial
 sys.path.insert(0, '..')
 
-from tic_core.archetipi import elemento, contenitore, confronta, valore, flusso
+from tic_core.archetipi import elemento, contenitore, confronta, valore, flusso, ElementoTabella
 from tic_core.propagazione import Tessuto
 from tic_core.biocache import BiocCache
 
@@ -34,16 +35,74 @@ class TestElementoBenchmark:
             return elemento.crea({'x': 1, 'y': 2, 'z': 3})
         benchmark(create)
 
+    def test_pti_elemento_crea_senza_timbro(self, benchmark):
+        """PTI: Creazione elemento con metadata disattivati (META_VUOTO condiviso)"""
+        precedente = elemento.timbro('off')
+        try:
+            benchmark(lambda: elemento.crea({'x': 1, 'y': 2, 'z': 3}))
+        finally:
+            elemento.timbro(precedente)
+
     def test_pti_elemento_legge(self, benchmark):
         """PTI: Lettura attributo"""
         el = elemento.crea({'x': 1, 'y': 2, 'z': 3})
         benchmark(lambda: elemento.legge(el, 'x'))
 
+    def test_pti_elemento_legge_catena(self, benchmark):
+        """PTI: Lettura annidata con due chiamate a legge"""
+        el = elemento.crea({'prenotazione': elemento.crea({'nome': 'Mario'})})
+        benchmark(lambda: elemento.legge(elemento.legge(el, 'prenotazione'), 'nome'))
+
+    def test_pti_elemento_accessore(self, benchmark):
+        """PTI: Lettura annidata con accessore compilato ('prenotazione.nome')"""
+        el = elemento.crea({'prenotazione': elemento.crea({'nome': 'Mario'})})
+        nome = elemento.accessore('prenotazione.nome')
+        benchmark(lambda: nome(el))
+
+    def test_pti_catalogo_crea_per_riga_10k(self, benchmark):
+        """PTI: 10k prodotti schema con elemento.crea uno per uno"""
+        Prodotto = elemento.schema('prodotto_bench', ['sku', 'prezzo', 'quantita'])
+        righe = [{'sku': f'S{i}', 'prezzo': float(i), 'quantita': i} for i in range(10000)]
+        benchmark(lambda: [elemento.crea(r, schema=Prodotto) for r in righe])
+
+    def test_pti_catalogo_da_colonne_10k(self, benchmark):
+        """PTI: 10k prodotti schema con elemento.da_colonne"""
+        Prodotto = elemento.schema('prodotto_bench', ['sku', 'prezzo', 'quantita'])
+        colonne = {
+            'sku': [f'S{i}' for i in range(10000)],
+            'prezzo': [float(i) for i in range(10000)],
+            'quantita': list(range(10000)),
+        }
+        benchmark(lambda: elemento.da_colonne(colonne, schema=Prodotto))
+
     def test_pti_elemento_scrive(self, benchmark):
         """PTI: Scrittura attributo (immutabile)"""
         el = elemento.crea({'x': 1})
         benchmark(lambda: elemento.scrive(el, 'x', 2))
 
+    def test_pti_elemento_scrive_1k_campi(self, benchmark):
+        """PTI: Scrittura su elemento da 1k campi (HAMT, condivisione strutturale)"""
+        el = elemento.crea({f'campo{i}': i for i in range(1000)})
+        benchmark(lambda: elemento.scrive(el, 'campo500', -1))
+
+    def test_pti_elemento_scrive_catena_annidata(self, benchmark):
+        """PTI: 100 scritture su elemento con lista annidata da 1k item"""
+        el = elemento.crea({'items': list(range(1000)), 'contatore': 0})
+
+        def catena():
+            e = el
+            for i in range(100):
+                e = elemento.scrive(e, 'contatore', i)
+            return e
+
+        benchmark(catena)
+
+    def test_pti_elemento_uguale_internato(self, benchmark):
+        """PTI: confronto tra elementi internati con lista annidata da 1k item"""
+        a = elemento.interna(elemento.crea({'items': list(range(1000))}))
+        b = elemento.interna(elemento.crea({'items': list(range(1000))}))
+        benchmark(lambda: a == b)
+
     # --- Tradizionale (dict) ---
     def test_trad_dict_crea(self, benchmark):
         """Tradizionale: Creazione dict"""
@@ -61,6 +120,18 @@ class TestElementoBenchmark:
             d['x'] = 2
         benchmark(write)
 
+    def test_trad_deepcopy_scrive_1k_campi(self, benchmark):
+        """Tradizionale: deepcopy + scrittura su dict da 1k campi"""
+        from copy import deepcopy
+        d = {f'campo{i}': i for i in range(1000)}
+
+        def write():
+            nuovo = deepcopy(d)
+            nuovo['campo500'] = -1
+            return nuovo
+
+        benchmark(write)
+
 
 # =============================================================================
 # BENCHMARK 2: Operazioni su Collezioni
@@ -82,6 +153,15 @@ class TestContenitoreBenchmark:
         """PTI: map su 10k elementi"""
         benchmark(lambda: contenitore.mappa(lista_grande, lambda x: x * 2))
 
+    def test_pti_mappa_primitiva(self, benchmark, lista_grande):
+        """PTI: map su 10k con valore.moltiplica riconosciuta (kernel vettoriale)"""
+        doppio = partial(valore.moltiplica, fattore=2)
+        benchmark(lambda: contenitore.mappa(lista_grande, doppio))
+
+    def test_pti_riduce_primitiva(self, benchmark, lista_grande):
+        """PTI: reduce su 10k con valore.incrementa riconosciuta (somma)"""
+        benchmark(lambda: contenitore.riduce(lista_grande, valore.incrementa, 0))
+
     def test_pti_filtra(self, benchmark, lista_grande):
         """PTI: filter su 10k elementi"""
         benchmark(lambda: contenitore.filtra(lista_grande, lambda x: x % 2 == 0))
@@ -90,6 +170,25 @@ class TestContenitoreBenchmark:
         """PTI: reduce su 10k elementi"""
         benchmark(lambda: contenitore.riduce(lista_grande, lambda a, x: a + x, 0))
 
+    def test_pti_aggiunge_1k_uno_per_volta(self, benchmark, lista_elementi):
+        """PTI: carrello da 1k item con contenitore.aggiunge (vettore persistente)"""
+        def costruisci():
+            c = contenitore.crea()
+            for e in lista_elementi:
+                c = contenitore.aggiunge(c, e)
+            return c
+        benchmark(costruisci)
+
+    def test_pti_filtra_mappa_somma(self, benchmark, lista_grande):
+        """PTI: filtra → mappa → somma su 10k (due liste intermedie)"""
+        benchmark(lambda: valore.somma(contenitore.mappa(
+            contenitore.filtra(lista_grande, lambda x: x % 2 == 0), lambda x: x * 2)))
+
+    def test_pti_pipeline_filtra_mappa_somma(self, benchmark, lista_grande):
+        """PTI: stessa query con contenitore.pipeline (un solo passaggio)"""
+        benchmark(lambda: contenitore.pipeline(lista_grande)
+                  .filtra(lambda x: x % 2 == 0).mappa(lambda x: x * 2).somma())
+
     def test_pti_filtra_elementi(self, benchmark, lista_elementi):
         """PTI: filter su 1k elementi strutturati"""
         benchmark(lambda: contenitore.filtra(
@@ -97,6 +196,23 @@ class TestContenitoreBenchmark:
             lambda e: elemento.legge(e, 'val') > 500
         ))
 
+    def test_pti_valore_inventario_100k(self, benchmark):
+        """PTI: somma prezzo × quantità su 100k prodotti (una legge per campo)"""
+        prodotti = [elemento.crea({'prezzo': float(i % 100), 'quantita': i % 7})
+                    for i in range(100000)]
+        benchmark(lambda: valore.somma(contenitore.mappa(
+            prodotti,
+            lambda p: elemento.legge(p, 'prezzo') * elemento.legge(p, 'quantita')
+        )))
+
+    def test_pti_valore_inventario_100k_tabella(self, benchmark):
+        """PTI: somma prezzo × quantità su 100k prodotti in ElementoTabella"""
+        tabella = ElementoTabella({
+            'prezzo': [float(i % 100) for i in range(100000)],
+            'quantita': [i % 7 for i in range(100000)],
+        })
+        benchmark(lambda: tabella.somma_prodotto('prezzo', 'quantita'))
+
     # --- Tradizionale ---
     def test_trad_map(self, benchmark, lista_grande):
         """Tradizionale: list comprehension map"""
@@ -106,6 +222,18 @@ class TestContenitoreBenchmark:
         """Tradizionale: list comprehension filter"""
         benchmark(lambda: [x for x in lista_grande if x % 2 == 0])
 
+    def test_trad_deepcopy_aggiunge_1k(self, benchmark, lista_elementi):
+        """Tradizionale: deepcopy della lista a ogni aggiunta (1k item)"""
+        from copy import deepcopy
+
+        def costruisci():
+            c = []
+            for e in lista_elementi:
+                c = deepcopy(c)
+                c.append(e)
+            return c
+        benchmark(costruisci)
+
     def test_trad_reduce(self, benchmark, lista_grande):
         """Tradizionale: sum builtin"""
         benchmark(lambda: sum(lista_grande))
@@ -397,3 +525,371 @@ class TestScenarioEcommerce:
             return sorted(disponibili, key=lambda p: p['price'])
 
         benchmark(filtra_ordina)
+
+
+# =============================================================================
+# BENCHMARK 8: Serializzazione (payload ordini)
+# =============================================================================
+
+class TestSerializzazioneBenchmark:
+    """Codec binario vs pickle e json su 100 ordini da 20 item (forma di ordine_crea)."""
+
+    @pytest.fixture
+    def ordini(self):
+        return [
+            elemento.crea({
+                'id': f'{j:08x}',
+                'utente_id': f'user{j}',
+                'items': [
+                    elemento.crea({
+                        'prodotto_sku': f'SKU{i + j:04d}',
+                        'quantita': i % 5 + 1,
+                        'prezzo_unitario': 10.0 + i + j,
+                    })
+                    for i in range(20)
+                ],
+                'totale': 1234.5,
+                'stato': 'creato',
+                'storico_stati': ['creato'],
+            })
+            for j in range(100)
+        ]
+
+    @staticmethod
+    def _come_dict(ordine):
+        d = dict(ordine._dati)
+        d['items'] = [dict(i._dati) for i in d['items']]
+        d['storico_stati'] = list(d['storico_stati'])
+        return d
+
+    # --- PTI ---
+    def test_pti_binario_codifica(self, benchmark, ordini):
+        """PTI: codifica binaria (tabella degli schemi)"""
+        from tic_core.archivio import codifica
+        benchmark(lambda: codifica(ordini))
+
+    def test_pti_binario_decodifica(self, benchmark, ordini):
+        """PTI: decodifica binaria completa"""
+        from tic_core.archivio import codifica, decodifica
+        dati = codifica(ordini)
+        benchmark(lambda: decodifica(dati))
+
+    def test_pti_binario_decodifica_pigra_un_campo(self, benchmark, ordini):
+        """PTI: decodifica pigra da memoryview, lettura di un solo campo"""
+        from tic_core.archivio import codifica, decodifica
+        dati = codifica(ordini)
+        benchmark(lambda: elemento.legge(decodifica(dati, pigro=True)[50], 'stato'))
+
+    # --- Tradizionale ---
+    def test_trad_pickle_codifica(self, benchmark, ordini):
+        """Tradizionale: pickle.dumps"""
+        import pickle
+        benchmark(lambda: pickle.dumps(ordini, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def test_trad_pickle_decodifica(self, benchmark, ordini):
+        """Tradizionale: pickle.loads"""
+        import pickle
+        dati = pickle.dumps(ordini, protocol=pickle.HIGHEST_PROTOCOL)
+        benchmark(lambda: pickle.loads(dati))
+
+    def test_trad_json_codifica(self, benchmark, ordini):
+        """Tradizionale: json.dumps (ordini come dict)"""
+        import json
+        dicts = [self._come_dict(o) for o in ordini]
+        benchmark(lambda: json.dumps(dicts))
+
+    def test_trad_json_decodifica(self, benchmark, ordini):
+        """Tradizionale: json.loads"""
+        import json
+        dati = json.dumps([self._come_dict(o) for o in ordini])
+        benchmark(lambda: json.loads(dati))
+
+
+# =============================================================================
+# BENCHMARK 9: Dati di riferimento (catalogo 100k prodotti)
+# =============================================================================
+
+class TestCatalogoMappatoBenchmark:
+    """Apertura catalogo + lettura di un prodotto: file mappato vs caricamento completo."""
+
+    N = 100000
+
+    @pytest.fixture
+    def catalogo(self):
+        return [
+            {'sku': f'SKU{i:07d}', 'prezzo': 1.5 * i, 'quantita': i % 7}
+            for i in range(self.N)
+        ]
+
+    def test_pti_mappato_apri_e_leggi(self, benchmark, catalogo, tmp_path):
+        """PTI: ArchivioMappato (solo header, campo decodificato alla lettura)"""
+        from tic_core.archivio import ArchivioMappato, scrive_mappato
+        percorso = str(tmp_path / 'catalogo.tic')
+        scrive_mappato(percorso, catalogo)
+
+        def apri_e_leggi():
+            with ArchivioMappato(percorso) as archivio:
+                return elemento.legge(archivio[self.N // 2], 'prezzo')
+
+        benchmark(apri_e_leggi)
+
+    def test_trad_json_carica_e_leggi(self, benchmark, catalogo, tmp_path):
+        """Tradizionale: json.load dell'intero catalogo in dict"""
+        import json
+        percorso = tmp_path / 'catalogo.json'
+        percorso.write_text(json.dumps(catalogo))
+
+        def carica_e_leggi():
+            with open(percorso) as f:
+                return json.load(f)[self.N // 2]['prezzo']
+
+        benchmark(carica_e_leggi)
+
+
+# =============================================================================
+# BENCHMARK 10: Celle CPU-bound su più processi
+# =============================================================================
+
+def _cella_prezzo(i):
+    """Cella pura e costosa (~0.1ms): simula un calcolo di prezzo."""
+    totale = 0.0
+    for k in range(2000):
+        totale += (i * k) % 97 * 0.01
+    return totale
+
+
+class TestParalleloBenchmark:
+    """mappa seriale vs mappa_parallelo (guadagno ≈ numero di core)."""
+
+    DATI = list(range(5000))
+
+    def test_pti_mappa_seriale(self, benchmark):
+        """PTI: contenitore.mappa su 5k celle costose (un core)"""
+        benchmark(lambda: contenitore.mappa(self.DATI, _cella_prezzo))
+
+    def test_pti_mappa_parallelo(self, benchmark):
+        """PTI: contenitore.mappa_parallelo (pool persistente, blocchi adattivi)"""
+        benchmark(lambda: contenitore.mappa_parallelo(self.DATI, _cella_prezzo))
+
+
+# =============================================================================
+# BENCHMARK 11: Ricerca per chiave nel catalogo (carrello.aggiungi)
+# =============================================================================
+
+class TestIndicizzatoBenchmark:
+    """trova per sku: contenitore indicizzato vs scansione lineare."""
+
+    N = 10000
+    PRODOTTI = [elemento.crea({'sku': f'SKU{i:05d}', 'prezzo': 1.5 * i}) for i in range(N)]
+    CATALOGO = contenitore.indicizzato(PRODOTTI, chiavi=['sku'])
+    CERCA = partial(confronta.campo_uguale, campo='sku', valore=f'SKU{N - 1:05d}')
+
+    def test_pti_trova_indicizzato(self, benchmark):
+        """PTI: trova su contenitore indicizzato (lettura dall'indice)"""
+        benchmark(lambda: contenitore.trova(self.CATALOGO, self.CERCA))
+
+    def test_trad_trova_lineare(self, benchmark):
+        """Tradizionale: trova con lambda, scansione di tutto il catalogo"""
+        sku = f'SKU{self.N - 1:05d}'
+        benchmark(lambda: contenitore.trova(
+            self.PRODOTTI, lambda p: elemento.legge(p, 'sku') == sku))
+
+
+# =============================================================================
+# BENCHMARK 12: Ricerca per fascia di prezzo
+# =============================================================================
+
+class TestOrdinatoBenchmark:
+    """Prodotti in una fascia di prezzo: contenitore ordinato vs sort + scansione."""
+
+    PRODOTTI = [elemento.crea({'sku': f'SKU{i:06d}', 'prezzo': (i * 7919) % 100000 / 100})
+                for i in range(100000)]
+    PER_PREZZO = contenitore.ordinato(PRODOTTI, chiave='prezzo')
+
+    def test_pti_ordinato_tra(self, benchmark):
+        """PTI: contenitore.tra su ordinato (bisect + slice)"""
+        benchmark(lambda: contenitore.tra(self.PER_PREZZO, 100, 110))
+
+    def test_pti_ordinato_aggiunge(self, benchmark):
+        """PTI: inserimento in ordine su 100k (nuova versione)"""
+        nuovo = elemento.crea({'sku': 'NUOVO', 'prezzo': 500.0})
+        benchmark(lambda: contenitore.aggiunge(self.PER_PREZZO, nuovo))
+
+    def test_trad_ordina_e_filtra(self, benchmark):
+        """Tradizionale: ordina tutto il catalogo, poi filtra la fascia"""
+        def ordina_e_filtra():
+            ordinati = contenitore.ordina(self.PRODOTTI,
+                                          chiave=lambda p: elemento.legge(p, 'prezzo'))
+            return [p for p in ordinati if 100 <= elemento.legge(p, 'prezzo') <= 110]
+        benchmark(ordina_e_filtra)
+
+
+# =============================================================================
+# BENCHMARK 13: Top-k su 1M item
+# =============================================================================
+
+@pytest.fixture(scope='module')
+def prezzi():
+    import random
+    rnd = random.Random(42)
+    return [rnd.random() * 1000 for _ in range(1_000_000)]
+
+
+class TestPrimiKBenchmark:
+    """I 10 più grandi su 1M: heap di k vs ordina + slice."""
+
+    def test_pti_primi_k(self, benchmark, prezzi):
+        """PTI: contenitore.primi_k (O(n log k), memoria O(k))"""
+        benchmark(lambda: contenitore.primi_k(prezzi, 10, inverso=True))
+
+    def test_pti_topk_flusso(self, benchmark, prezzi):
+        """PTI: TopK su un generatore (nessuna lista intera)"""
+        from tic_core.archetipi import TopK
+        benchmark(lambda: TopK(10, inverso=True).estende(p for p in prezzi).risultato())
+
+    def test_trad_ordina_e_slice(self, benchmark, prezzi):
+        """Tradizionale: contenitore.ordina + [:10]"""
+        benchmark(lambda: contenitore.ordina(prezzi, inverso=True)[:10])
+
+
+# =============================================================================
+# BENCHMARK 14: Report per stato su 1M ordini
+# =============================================================================
+
+_STATI = ['creato', 'confermato', 'pagato', 'spedito', 'consegnato', 'annullato']
+
+
+@pytest.fixture(scope='module')
+def ordini_1m():
+    return [{'stato': _STATI[i % 6], 'totale': (i % 997) * 1.5} for i in range(1_000_000)]
+
+
+class TestAggregaBenchmark:
+    """Numero e incasso per stato: un passaggio vs una scansione per stato."""
+
+    def test_pti_aggrega(self, benchmark, ordini_1m):
+        """PTI: contenitore.aggrega (un passaggio per tutti i gruppi)"""
+        benchmark(lambda: contenitore.aggrega(
+            ordini_1m, 'stato', {'n': (None, 'conta'), 'incasso': ('totale', 'somma')}))
+
+    def test_pti_aggrega_colonnare(self, benchmark, ordini_1m):
+        """PTI: contenitore.aggrega su ElementoTabella (bincount con NumPy)"""
+        tabella = ElementoTabella.da_righe(ordini_1m)
+        benchmark(lambda: contenitore.aggrega(
+            tabella, 'stato', {'n': (None, 'conta'), 'incasso': ('totale', 'somma')}))
+
+    def test_trad_filtra_per_stato(self, benchmark, ordini_1m):
+        """Tradizionale: una query_ordini_per_stato (filtra) per ogni stato"""
+        def per_stato():
+            report = {}
+            for stato in _STATI:
+                gruppo = contenitore.filtra(ordini_1m,
+                                            lambda o: elemento.legge(o, 'stato') == stato)
+                totali = [elemento.legge(o, 'totale') for o in gruppo]
+                report[stato] = {'n': len(gruppo), 'incasso': valore.somma(totali)}
+            return report
+        benchmark(per_stato)
+
+
+# =============================================================================
+# BENCHMARK 15: Item di 1000 carrelli abbinati al catalogo
+# =============================================================================
+
+@pytest.fixture(scope='module')
+def dati():
+    prodotti = [{'sku': f'SKU{i}', 'prezzo': i * 0.5} for i in range(10_000)]
+    items = [{'prodotto_sku': f'SKU{(i * 7919) % 10_000}', 'quantita': 1 + i % 3}
+             for i in range(5_000)]
+    return items, prodotti
+
+
+class TestUnisciPerBenchmark:
+    """Abbinare 5000 item a 10k prodotti: hash join vs trova per item."""
+
+    def test_pti_unisci_per(self, benchmark, dati):
+        """PTI: contenitore.unisci_per (tabella hash, O(item + prodotti))"""
+        items, prodotti = dati
+        benchmark(lambda: contenitore.unisci_per(items, prodotti, 'prodotto_sku', 'sku'))
+
+    def test_pti_unisci_per_indicizzato(self, benchmark, dati):
+        """PTI: contenitore.unisci_per su un catalogo indicizzato (riusa l'indice)"""
+        items, prodotti = dati
+        catalogo = contenitore.indicizzato(prodotti, chiavi=['sku'])
+        benchmark(lambda: contenitore.unisci_per(items, catalogo, 'prodotto_sku', 'sku'))
+
+    def test_trad_trova_per_item(self, benchmark, dati):
+        """Tradizionale: un trova sul catalogo per ogni item (primi 500 item)"""
+        items, prodotti = dati
+
+        def abbina():
+            return [(item, contenitore.trova(prodotti, lambda p: p['sku'] == item['prodotto_sku']))
+                    for item in items[:500]]
+        benchmark(abbina)
+
+
+# =============================================================================
+# BENCHMARK 16: Incasso da uno storico ordini su file (200k righe)
+# =============================================================================
+
+@pytest.fixture(scope='module')
+def storico(tmp_path_factory):
+    from tic_core.archivio import scrive_righe
+    percorso = str(tmp_path_factory.mktemp('storico') / 'ordini.jsonl')
+    scrive_righe(percorso, ({'id': f'ORD{i}', 'stato': 'pagato' if i % 3 else 'creato',
+                             'totale': i * 1.5} for i in range(200_000)))
+    return percorso
+
+
+class TestSuFileBenchmark:
+    """Storico in JSON lines: a blocchi in memoria costante vs tutto in una lista."""
+
+    def test_pti_su_file(self, benchmark, storico):
+        """PTI: ContenitoreSuFile (blocchi da 10k, lettura anticipata)"""
+        from tic_core.archivio import ContenitoreSuFile
+
+        def incasso():
+            storico_su_file = ContenitoreSuFile(storico)
+            pagati = storico_su_file.filtra(lambda o: elemento.legge(o, 'stato') == 'pagato')
+            totali = pagati.mappa(lambda o: elemento.legge(o, 'totale'))
+            return totali.riduce(valore.incrementa, 0.0)
+        benchmark(incasso)
+
+    def test_trad_carica_tutto(self, benchmark, storico):
+        """Tradizionale: json.loads di tutto il file in una lista, poi filtra/mappa"""
+        import json
+
+        def incasso():
+            with open(storico, encoding='utf-8') as f:
+                ordini = elemento.crea_molti([json.loads(riga) for riga in f])
+            pagati = contenitore.filtra(ordini, lambda o: elemento.legge(o, 'stato') == 'pagato')
+            return valore.somma(contenitore.mappa(pagati, lambda o: elemento.legge(o, 'totale')))
+        benchmark(incasso)
+
+
+# =============================================================================
+# BENCHMARK 17: Incasso mobile su un giorno (finestra di 1440 minuti)
+# =============================================================================
+
+@pytest.fixture(scope='module')
+def incassi():
+    import random
+    rnd = random.Random(17)
+    return [round(rnd.random() * 200, 2) for _ in range(100_000)]
+
+
+class TestFinestraBenchmark:
+    """Somma e massimo scorrevoli su 100k minuti: incrementali vs risomma per finestra."""
+
+    AMPIEZZA = 1440
+
+    def test_pti_finestra(self, benchmark, incassi):
+        """PTI: contenitore.finestra (somma corrente e deque monotona)"""
+        benchmark(lambda: list(contenitore.finestra(incassi, self.AMPIEZZA,
+                                                    aggregato=('somma', 'massimo'))))
+
+    def test_trad_slice_per_finestra(self, benchmark, incassi):
+        """Tradizionale: somma e max di ogni slice (O(n x ampiezza))"""
+        w = self.AMPIEZZA
+        benchmark(lambda: [{'somma': valore.somma(incassi[i:i + w]),
+                            'massimo': max(incassi[i:i + w])}
+                           for i in range(len(incassi) - w + 1)])
@@ -6,12 +6,23 @@ Dimostra:
 - Composizione funzionale pura
 - Pattern matching con flusso.scegli
 - Operazioni su collezioni
+- Memoizzazione di celle pure (biocache.memo)
 """
 
 import sys
 sys.path.insert(0, '../../../')
+from functools import partial
 
 from tic_core.archetipi import elemento, contenitore, confronta, valore, flusso
+from tic_core import biocache
+
+
+# Items indicizzati per sku: ricerca e aggiornamento senza scorrere il carrello
+_CHIAVI_ITEMS = ['prodotto_sku']
+
+
+def _per_sku(sku: str):
+    return partial(confronta.campo_uguale, campo='prodotto_sku', valore=sku)
 
 
 # === FATTI ===
@@ -21,12 +32,12 @@ def carrello_crea(utente_id: str = None) -> dict:
     carrello.crea → crea nuovo carrello
 
     >>> c = carrello_crea('user123')
-    >>> elemento.legge(c, 'items')
+    >>> list(elemento.legge(c, 'items'))
     []
     """
     return elemento.crea({
         'utente_id': utente_id,
-        'items': [],
+        'items': contenitore.indicizzato([], chiavi=_CHIAVI_ITEMS),
         'stato': 'attivo'
     })
 
@@ -57,10 +68,7 @@ def carrello_contiene(carrello: dict, sku: str) -> bool:
     carrello.contiene → True se sku presente
     """
     items = elemento.legge(carrello, 'items')
-    trovato = contenitore.trova(
-        items,
-        lambda i: confronta.uguale(elemento.legge(i, 'prodotto_sku'), sku)
-    )
+    trovato = contenitore.trova(items, _per_sku(sku))
     return confronta.non_nullo(trovato)
 
 
@@ -88,11 +96,7 @@ def carrello_aggiungi(carrello: dict, sku: str, quantita: int, prezzo: float) ->
     items = elemento.legge(carrello, 'items')
 
     # Cerca item esistente
-    esistente_idx = None
-    for i, item in enumerate(items):
-        if elemento.legge(item, 'prodotto_sku') == sku:
-            esistente_idx = i
-            break
+    esistente_idx = contenitore.trova_indice(items, _per_sku(sku))
 
     if esistente_idx is not None:
         # Incrementa quantità esistente
@@ -102,7 +106,7 @@ def carrello_aggiungi(carrello: dict, sku: str, quantita: int, prezzo: float) ->
             quantita
         )
         nuovo_item = elemento.scrive(item, 'quantita', nuova_qty)
-        nuovi_items = items[:esistente_idx] + [nuovo_item] + items[esistente_idx + 1:]
+        nuovi_items = contenitore.sostituisce_a(items, esistente_idx, nuovo_item)
     else:
         # Aggiungi nuovo item
         nuovo_item = item_carrello_crea(sku, quantita, prezzo)
@@ -116,18 +120,17 @@ def carrello_rimuovi(carrello: dict, sku: str) -> dict:
     carrello.rimuovi → rimuove item per sku
     """
     items = elemento.legge(carrello, 'items')
-    nuovi_items = contenitore.filtra(
-        items,
-        lambda i: confronta.diverso(elemento.legge(i, 'prodotto_sku'), sku)
-    )
-    return elemento.scrive(carrello, 'items', nuovi_items)
+    idx = contenitore.trova_indice(items, _per_sku(sku))  # un item per sku
+    if idx is None:
+        return carrello
+    return elemento.scrive(carrello, 'items', contenitore.rimuove_a(items, idx))
 
 
 def carrello_svuota(carrello: dict) -> dict:
     """
     carrello.svuota → rimuove tutti gli items
     """
-    return elemento.scrive(carrello, 'items', [])
+    return elemento.scrive(carrello, 'items', contenitore.indicizzato([], chiavi=_CHIAVI_ITEMS))
 
 
 def carrello_checkout(carrello: dict) -> dict:
@@ -139,6 +142,7 @@ def carrello_checkout(carrello: dict) -> dict:
 
 # === QUERY ===
 
+@biocache.memo(chiave='carrello.totale')
 def query_carrello_totale(carrello: dict) -> float:
     """
     ?- carrello.totale
@@ -221,6 +225,9 @@ def cella_spedizione(soglia_gratis: float = 50.0, costo_spedizione: float = 5.0)
 def cella_totale_finale(soglia_gratis: float = 50.0, costo_spedizione: float = 5.0):
     """
     Cella composta: totale + spedizione
+
+    query_carrello_totale è memoizzata: il totale viene calcolato
+    una sola volta per carrello distinto.
     """
     calc_spedizione = cella_spedizione(soglia_gratis, costo_spedizione)
 
@@ -14,6 +14,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from tic_core.archetipi import elemento, contenitore, confronta, valore, flusso, effetto
+from tic_core.archivio import ContenitoreSuFile
 
 
 # === STATI ORDINE ===
@@ -108,8 +109,10 @@ def ordine_cambia_stato(ordine: dict, nuovo_stato: str) -> tuple:
     storico = elemento.legge(ordine, 'storico_stati')
     nuovo_storico = contenitore.aggiunge(storico, nuovo_stato)
 
-    nuovo = elemento.scrive(ordine, 'stato', nuovo_stato)
-    nuovo = elemento.scrive(nuovo, 'storico_stati', nuovo_storico)
+    nuovo = elemento.modifica(ordine, {
+        'stato': nuovo_stato,
+        'storico_stati': nuovo_storico
+    })
 
     return (True, nuovo)
 
@@ -239,6 +242,37 @@ def query_ordini_per_stato(ordini: list, stato: str) -> list:
     )
 
 
+def query_report_per_stato(ordini: list) -> dict:
+    """
+    ?- ordini.report_per_stato → numero, incasso e scontrino medio per stato
+
+    Un solo passaggio sugli ordini per tutti gli stati, invece di una
+    query_ordini_per_stato (e una scansione) per stato.
+
+    >>> os = [ordine_crea('u1', [], 10.0), ordine_crea('u2', [], 30.0)]
+    >>> query_report_per_stato(os)
+    {'creato': {'ordini': 2, 'incasso': 40.0, 'scontrino_medio': 20.0}}
+    """
+    return contenitore.aggrega(ordini, 'stato', {
+        'ordini': (None, 'conta'),
+        'incasso': ('totale', 'somma'),
+        'scontrino_medio': ('totale', 'media'),
+    })
+
+
+def query_incasso_mobile(incassi_minuto: list, ampiezza: int = 60) -> list:
+    """
+    ?- ordini.incasso_mobile → incasso degli ultimi `ampiezza` minuti, per minuto
+
+    Somma scorrevole: un'addizione e una sottrazione per minuto, non una
+    somma di tutta la finestra.
+
+    >>> query_incasso_mobile([10.0, 0.0, 5.0, 20.0], ampiezza=2)
+    [10.0, 5.0, 25.0]
+    """
+    return list(contenitore.finestra(incassi_minuto, ampiezza, aggregato='somma'))
+
+
 def query_ordini_utente(ordini: list, utente_id: str) -> list:
     """
     ?- ordini.utente
@@ -262,3 +296,29 @@ def query_totale_vendite(ordini: list) -> float:
     )
     totali = contenitore.mappa(completati, lambda o: elemento.legge(o, 'totale'))
     return valore.somma(totali)
+
+
+def query_totale_vendite_storico(percorso: str) -> float:
+    """
+    ?- ordini.totale_vendite su uno storico in file (JSON lines o binario)
+
+    Come query_totale_vendite, ma lo storico non viene caricato: si legge
+    un blocco alla volta, in memoria costante.
+
+    >>> import tempfile
+    >>> from tic_core.archivio.blocchi import scrive_righe
+    >>> percorso = os.path.join(tempfile.mkdtemp(), 'ordini.jsonl')
+    >>> o = ordine_crea('u1', [], 25.0)
+    >>> scrive_righe(percorso, [o, elemento.scrive(o, 'stato', 'pagato')])
+    2
+    >>> query_totale_vendite_storico(percorso)
+    25.0
+    """
+    storico = ContenitoreSuFile(percorso)
+    completati = storico.filtra(
+        lambda o: confronta.in_lista(
+            elemento.legge(o, 'stato'),
+            ['pagato', 'spedito', 'consegnato']
+        )
+    )
+    return completati.mappa(lambda o: elemento.legge(o, 'totale')).riduce(valore.incrementa, 0.0)
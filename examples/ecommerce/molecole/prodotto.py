@@ -8,7 +8,13 @@ Dimostra composizione pura di archetipi.
 import sys
 sys.path.insert(0, '../../../')
 
-from tic_core.archetipi import elemento, confronta, valore, contenitore, flusso
+from tic_core.archetipi import elemento, confronta, valore, contenitore, flusso, ElementoTabella
+
+
+# === SCHEMA ===
+
+# Record con __slots__: i cataloghi contengono milioni di prodotti
+PRODOTTO = elemento.schema('prodotto', ['sku', 'nome', 'prezzo', 'quantita', 'attivo'])
 
 
 # === FATTI (creazione) ===
@@ -27,7 +33,35 @@ def prodotto_crea(sku: str, nome: str, prezzo: float, quantita: int = 0) -> dict
         'prezzo': prezzo,
         'quantita': quantita,
         'attivo': True
-    })
+    }, schema=PRODOTTO)
+
+
+def prodotti_crea(righe) -> list:
+    """
+    prodotti.crea → crea un catalogo da righe {sku, nome, prezzo[, quantita]}
+
+    Un solo passo (elemento.crea_molti) invece di prodotto_crea per riga.
+
+    >>> ps = prodotti_crea([{'sku': 'A', 'nome': 'Widget', 'prezzo': 9.5}])
+    >>> elemento.legge(ps[0], 'quantita'), elemento.legge(ps[0], 'attivo')
+    (0, True)
+    """
+    return elemento.crea_molti(map(_con_default, righe), schema=PRODOTTO)
+
+
+def prodotti_crea_a_blocchi(righe, blocco: int = 10000):
+    """
+    prodotti.crea.blocchi → come prodotti_crea, un blocco alla volta (import da file)
+
+    >>> righe = ({'sku': str(i), 'nome': '', 'prezzo': 1} for i in range(3))
+    >>> [len(b) for b in prodotti_crea_a_blocchi(righe, 2)]
+    [2, 1]
+    """
+    return elemento.crea_a_blocchi(map(_con_default, righe), blocco, schema=PRODOTTO)
+
+
+def _con_default(riga: dict) -> dict:
+    return {'quantita': 0, 'attivo': True, **riga}
 
 
 # === REGOLE (predicati) ===
@@ -140,6 +174,36 @@ def query_prodotti_sotto_soglia(prodotti: list, soglia: int = 5) -> list:
     )
 
 
+def query_prodotti_fascia_prezzo(prodotti: list, minimo: float, massimo: float) -> list:
+    """
+    ?- prodotti.fascia_prezzo → prodotti con minimo <= prezzo <= massimo
+
+    Su un catalogo contenitore.ordinato(prodotti, chiave='prezzo') è una
+    ricerca bisect, senza riordinare né scorrere il catalogo.
+
+    >>> prezzi = [('A', 30), ('B', 10), ('C', 20)]
+    >>> ps = [prodotto_crea(sku, sku, prezzo, 1) for sku, prezzo in prezzi]
+    >>> [elemento.legge(p, 'sku') for p in query_prodotti_fascia_prezzo(ps, 15, 30)]
+    ['A', 'C']
+    >>> per_prezzo = contenitore.ordinato(ps, chiave='prezzo')
+    >>> [elemento.legge(p, 'sku') for p in query_prodotti_fascia_prezzo(per_prezzo, 15, 30)]
+    ['C', 'A']
+    """
+    return contenitore.tra(prodotti, minimo, massimo, chiave='prezzo')
+
+
+def query_prodotti_piu_cari(prodotti: list, n: int = 10) -> list:
+    """
+    ?- prodotti.piu_cari → i primi n per prezzo (heap, senza ordinare il catalogo)
+
+    >>> prezzi = [('A', 30), ('B', 10), ('C', 20)]
+    >>> ps = [prodotto_crea(sku, sku, prezzo, 1) for sku, prezzo in prezzi]
+    >>> [elemento.legge(p, 'sku') for p in query_prodotti_piu_cari(ps, 2)]
+    ['A', 'C']
+    """
+    return contenitore.primi_k(prodotti, n, chiave='prezzo', inverso=True)
+
+
 def query_valore_inventario(prodotti: list) -> float:
     """
     ?- inventario.valore_totale
@@ -147,7 +211,12 @@ def query_valore_inventario(prodotti: list) -> float:
     >>> ps = [prodotto_crea('A', 'A', 10, 5), prodotto_crea('B', 'B', 20, 3)]
     >>> query_valore_inventario(ps)
     110
+    >>> query_valore_inventario(elemento.tabella(ps))
+    110
     """
+    if isinstance(prodotti, ElementoTabella):
+        # Catalogo colonnare: una somma vettoriale invece di 2N letture
+        return prodotti.somma_prodotto('prezzo', 'quantita')
     valori = contenitore.mappa(
         prodotti,
         lambda p: valore.moltiplica(
@@ -10,6 +10,7 @@ Dimostra:
 
 import sys
 import os
+from functools import partial
 # Aggiungi path per imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../..'))
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
@@ -34,7 +35,7 @@ class Shop:
 
     def __init__(self, nome: str):
         self.nome = nome
-        self.prodotti = []
+        self.prodotti = contenitore.indicizzato([], chiavi=['sku'])
         self.carrelli = {}  # utente_id → carrello
         self.ordini = []
 
@@ -46,14 +47,22 @@ class Shop:
     def aggiungi_prodotto(self, sku: str, nome: str, prezzo: float, qty: int) -> dict:
         """shop.aggiungi_prodotto"""
         p = prodotto.prodotto_crea(sku, nome, prezzo, qty)
-        self.prodotti.append(p)
+        self.prodotti = contenitore.aggiunge(self.prodotti, p)
         return p
 
+    def importa_catalogo(self, righe) -> int:
+        """shop.importa_catalogo → aggiunge prodotti a blocchi da un iteratore di righe"""
+        n = 0
+        for blocco in prodotto.prodotti_crea_a_blocchi(righe):
+            self.prodotti = contenitore.unisce(self.prodotti, blocco)
+            n += len(blocco)
+        return n
+
     def trova_prodotto(self, sku: str) -> dict:
-        """shop.trova_prodotto"""
+        """shop.trova_prodotto → lettura dall'indice per sku, O(1)"""
         return contenitore.trova(
             self.prodotti,
-            lambda p: confronta.uguale(elemento.legge(p, 'sku'), sku)
+            partial(confronta.campo_uguale, campo='sku', valore=sku)
         )
 
     # === CARRELLO ===
@@ -99,6 +108,16 @@ class Shop:
         self.carrelli[utente_id] = c
         return c
 
+    def dettaglio_carrello(self, utente_id: str) -> list:
+        """
+        shop.dettaglio_carrello → [(item, prodotto | None)]
+
+        Un hash join sull'indice per sku del catalogo, invece di un
+        trova_prodotto per item.
+        """
+        items = elemento.legge(self.ottieni_carrello(utente_id), 'items')
+        return contenitore.unisci_per(items, self.prodotti, 'prodotto_sku', 'sku', tipo='left')
+
     # === CHECKOUT ===
 
     def checkout(self, utente_id: str, metodo_pagamento: str) -> tuple:
@@ -138,10 +157,13 @@ class Shop:
 
     def _decrementa_stock(self, sku: str, quantita: int) -> None:
         """Helper: decrementa stock prodotto"""
-        for i, p in enumerate(self.prodotti):
-            if elemento.legge(p, 'sku') == sku:
-                self.prodotti[i] = prodotto.prodotto_decrementa_quantita(p, quantita)
-                break
+        i = contenitore.trova_indice(
+            self.prodotti,
+            partial(confronta.campo_uguale, campo='sku', valore=sku)
+        )
+        if i is not None:
+            p = prodotto.prodotto_decrementa_quantita(self.prodotti[i], quantita)
+            self.prodotti = contenitore.sostituisce_a(self.prodotti, i, p)
 
     # === QUERY ===
 
@@ -102,9 +102,10 @@ def prenotazione_assegna_tavolo(prenotazione: dict, tavolo_id: str) -> dict:
     """
     prenotazione.assegna_tavolo → assegna tavolo a prenotazione
     """
-    nuovo = elemento.scrive(prenotazione, 'tavolo_id', tavolo_id)
-    nuovo = elemento.scrive(nuovo, 'stato', 'confermata')
-    return nuovo
+    return elemento.modifica(prenotazione, {
+        'tavolo_id': tavolo_id,
+        'stato': 'confermata'
+    })
 
 
 def prenotazione_annulla(prenotazione: dict) -> dict:
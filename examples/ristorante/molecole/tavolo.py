@@ -57,8 +57,10 @@ def tavolo_assegna(tavolo: dict, prenotazione: dict) -> dict:
     Ritorna nuovo tavolo con prenotazione assegnata.
     Propaga ai SALTI.
     """
-    nuovo = elemento.scrive(tavolo, 'prenotazione', prenotazione)
-    nuovo = elemento.scrive(nuovo, 'stato', 'occupato')
+    nuovo = elemento.modifica(tavolo, {
+        'prenotazione': prenotazione,
+        'stato': 'occupato'
+    })
 
     # Registra nel tessuto per propagazione
     id_tavolo = elemento.legge(tavolo, 'id')
@@ -77,8 +79,10 @@ def tavolo_libera(tavolo: dict) -> dict:
     >>> tavolo_libero(t)
     True
     """
-    nuovo = elemento.scrive(tavolo, 'prenotazione', None)
-    nuovo = elemento.scrive(nuovo, 'stato', 'libero')
+    nuovo = elemento.modifica(tavolo, {
+        'prenotazione': None,
+        'stato': 'libero'
+    })
 
     id_tavolo = elemento.legge(tavolo, 'id')
     tessuto.imposta(f'tavolo.{id_tavolo}.stato', 'libero')
@@ -120,14 +124,63 @@ def query_tavoli_occupati(tavoli: list) -> list:
     return contenitore.filtra(tavoli, lambda t: not tavolo_libero(t))
 
 
+def query_tavoli_liberi_occupati(tavoli: list) -> tuple:
+    """
+    ?- tavoli.liberi, tavoli.occupati (un solo passaggio)
+
+    >>> t = tavolo_assegna(tavolo_crea('T1'), elemento.crea({'nome': 'Mario'}))
+    >>> liberi, occupati = query_tavoli_liberi_occupati([t, tavolo_crea('T2')])
+    >>> len(liberi), len(occupati)
+    (1, 1)
+    """
+    from tic_core.archetipi import contenitore
+    return contenitore.partiziona(tavoli, tavolo_libero)
+
+
+_NOME_PRENOTAZIONE = elemento.accessore('prenotazione.nome')
+
+
+def query_nomi_prenotati(tavoli: list) -> list:
+    """
+    ?- tavoli.occupati.prenotazione.nome
+
+    >>> t = tavolo_assegna(tavolo_crea('T1'), elemento.crea({'nome': 'Mario'}))
+    >>> query_nomi_prenotati([t, tavolo_crea('T2')])
+    ['Mario']
+    """
+    from tic_core.archetipi import contenitore
+    return contenitore.mappa(query_tavoli_occupati(tavoli), _NOME_PRENOTAZIONE)
+
+
 def query_capienza_totale(tavoli: list) -> int:
-    """?- ristorante.capienza"""
-    from tic_core.archetipi import contenitore, valore
+    """
+    ?- ristorante.capienza
+
+    >>> tavoli = [tavolo_crea('T1', posti=4), tavolo_crea('T2', posti=6)]
+    >>> query_capienza_totale(tavoli)
+    10
+    >>> query_capienza_totale(elemento.tabella(tavoli))
+    10
+    """
+    from tic_core.archetipi import contenitore, valore, ElementoTabella
+    if isinstance(tavoli, ElementoTabella):
+        return tavoli.somma('posti')
     posti = contenitore.mappa(tavoli, lambda t: elemento.legge(t, 'posti'))
     return valore.somma(posti)
 
 
+_POSTI = elemento.accessore('posti')
+
+
 def query_capienza_disponibile(tavoli: list) -> int:
-    """?- ristorante.capienza.disponibile"""
-    liberi = query_tavoli_liberi(tavoli)
-    return query_capienza_totale(liberi)
+    """
+    ?- ristorante.capienza.disponibile
+
+    Un solo passaggio sui tavoli, senza liste intermedie.
+
+    >>> t = tavolo_assegna(tavolo_crea('T1', posti=4), elemento.crea({'nome': 'Mario'}))
+    >>> query_capienza_disponibile([t, tavolo_crea('T2', posti=6)])
+    6
+    """
+    from tic_core.archetipi import contenitore
+    return contenitore.pipeline(tavoli).filtra(tavolo_libero).mappa(_POSTI).somma()
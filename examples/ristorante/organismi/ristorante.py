@@ -10,6 +10,7 @@ ristorante.stato        → stato attuale
 
 import sys
 sys.path.insert(0, '../../../')
+from functools import partial
 
 from tic_core.archetipi import elemento, contenitore, confronta
 from tic_core.propagazione import Tessuto
@@ -40,15 +41,15 @@ class Ristorante:
         5
         """
         self.nome = nome
-        self.tavoli = []
         self.prenotazioni = []
         self.tessuto = Tessuto()
 
-        # Crea tavoli iniziali
+        # Crea tavoli iniziali, indicizzati per id
+        tavoli = []
         for i in range(1, num_tavoli + 1):
             posti = 4 if i % 3 != 0 else 6  # ogni 3° tavolo ha 6 posti
-            t = tavolo.tavolo_crea(f'T{i}', posti=posti)
-            self.tavoli.append(t)
+            tavoli.append(tavolo.tavolo_crea(f'T{i}', posti=posti))
+        self.tavoli = contenitore.indicizzato(tavoli, chiavi=['id'])
 
         # Registra derivati nel tessuto
         self._setup_derivati()
@@ -109,7 +110,7 @@ class Ristorante:
 
         # 6. Assegna
         idx = self._trova_indice_tavolo(tavolo_id)
-        self.tavoli[idx] = tavolo.tavolo_assegna(t, p)
+        self.tavoli = contenitore.sostituisce_a(self.tavoli, idx, tavolo.tavolo_assegna(t, p))
         p = prenotazione.prenotazione_assegna_tavolo(p, tavolo_id)
         self.prenotazioni.append(p)
 
@@ -148,7 +149,8 @@ class Ristorante:
         # Libera tavolo
         idx = self._trova_indice_tavolo(tavolo_id)
         if idx is not None:
-            self.tavoli[idx] = tavolo.tavolo_libera(self.tavoli[idx])
+            libero = tavolo.tavolo_libera(self.tavoli[idx])
+            self.tavoli = contenitore.sostituisce_a(self.tavoli, idx, libero)
             self.tessuto.imposta(f'tavolo.{tavolo_id}.stato', 'libero')
 
         # Aggiorna prenotazione
@@ -166,8 +168,7 @@ class Ristorante:
         >>> s['tavoli_totali']
         5
         """
-        liberi = tavolo.query_tavoli_liberi(self.tavoli)
-        occupati = tavolo.query_tavoli_occupati(self.tavoli)
+        liberi, occupati = tavolo.query_tavoli_liberi_occupati(self.tavoli)
 
         return {
             'nome': self.nome,
@@ -183,11 +184,11 @@ class Ristorante:
         }
 
     def _trova_indice_tavolo(self, tavolo_id: str) -> int:
-        """Helper: trova indice tavolo per id."""
-        for i, t in enumerate(self.tavoli):
-            if elemento.legge(t, 'id') == tavolo_id:
-                return i
-        return None
+        """Helper: trova indice tavolo per id (dall'indice, O(1))."""
+        return contenitore.trova_indice(
+            self.tavoli,
+            partial(confronta.campo_uguale, campo='id', valore=tavolo_id)
+        )
 
 
 # === Funzioni stateless per uso funzionale ===
@@ -2,11 +2,18 @@
 Test per gli Archetipi PTI (Livello 1)
 """
 
+import itertools
+import operator
 import pytest
+from functools import partial
 import sys
 sys.path.insert(0, '..')
 
-from tic_core.archetipi import elemento, contenitore, confronta, valore, testo
+from tic_core.archetipi import (
+    elemento, contenitore, confronta, valore, testo, ElementoTabella, Storia,
+)
+from tic_core.archetipi.elemento import Elemento
+from tic_core.archetipi.persistente import MappaPersistente, congela
 
 
 class TestElemento:
@@ -42,6 +49,407 @@ class TestElemento:
         assert elemento.esiste(e) is True
         assert elemento.esiste(e2) is False
 
+    def test_modifica(self):
+        e1 = elemento.crea({'x': 1, 'y': 2})
+        e2 = elemento.modifica(e1, {'x': 10, 'z': 30})
+        assert elemento.legge(e1, 'x') == 1
+        assert elemento.legge(e2, 'x') == 10
+        assert elemento.legge(e2, 'y') == 2
+        assert elemento.legge(e2, 'z') == 30
+
+    def test_sessione(self):
+        e1 = elemento.crea({'x': 1})
+        with elemento.sessione(e1) as s:
+            s.scrive('x', 2)
+            s.scrive('y', s.legge('x') + 1)
+            assert elemento.legge(e1, 'x') == 1
+        assert elemento.legge(s.risultato, 'x') == 2
+        assert elemento.legge(s.risultato, 'y') == 3
+        with pytest.raises(RuntimeError):
+            s.scrive('x', 3)
+
+    def test_schema_record(self):
+        Prodotto = elemento.schema('prodotto_test', ['sku', 'prezzo'])
+        p = elemento.crea({'sku': 'A1', 'prezzo': 10.0}, schema=Prodotto)
+        assert isinstance(p, Prodotto)
+        assert not hasattr(p, '__dict__')
+        assert elemento.legge(p, 'sku') == 'A1'
+        assert elemento.legge(p, 'colore', 'nd') == 'nd'
+
+        p2 = elemento.scrive(p, 'prezzo', 12.0)
+        assert isinstance(p2, Prodotto)
+        assert elemento.legge(p, 'prezzo') == 10.0
+        assert elemento.legge(p2, 'prezzo') == 12.0
+        assert elemento.esiste(elemento.elimina(p2)) is False
+
+    def test_schema_fallback_dict(self):
+        Prodotto = elemento.schema('prodotto_test', ['sku', 'prezzo'])
+        p = elemento.crea({'sku': 'A1', 'prezzo': 10.0}, schema=Prodotto)
+        p2 = elemento.scrive(p, 'colore', 'rosso')
+        assert type(p2).__name__ == 'Elemento'
+        assert elemento.legge(p2, 'sku') == 'A1'
+        assert elemento.legge(p2, 'colore') == 'rosso'
+        assert elemento.schema('prodotto_test', ['sku', 'prezzo']) is Prodotto
+
+    def test_schema_immutabile(self):
+        Punto = elemento.schema('punto_test', ['x', 'y'])
+        p = Punto(x=1, y=2)
+        with pytest.raises(TypeError):
+            p.x = 5
+        with pytest.raises(ValueError):
+            Punto(z=1)
+        q = Punto(x=[1, 2], y={'a': [3]})
+        with pytest.raises(TypeError):
+            elemento.legge(q, 'x').append(3)
+        with pytest.raises(TypeError):
+            elemento.legge(q, 'y')['a'].append(4)
+
+    def test_valori_annidati_congelati(self):
+        e = elemento.crea({'items': [{'sku': 'A'}]})
+        items = elemento.legge(e, 'items')
+        with pytest.raises(TypeError):
+            items.append({'sku': 'B'})
+        with pytest.raises(TypeError):
+            items[0]['sku'] = 'B'
+        assert items == [{'sku': 'A'}]
+
+    def test_crea_non_condivide_input(self):
+        dati = {'items': [1, 2]}
+        e = elemento.crea(dati)
+        dati['items'].append(3)
+        assert elemento.legge(e, 'items') == [1, 2]
+
+    def test_scrive_condivide_struttura(self):
+        items = list(range(100))
+        e1 = elemento.crea({'items': items, 'stato': 'attivo'})
+        e2 = elemento.scrive(e1, 'stato', 'chiuso')
+        assert elemento.legge(e2, 'items') is elemento.legge(e1, 'items')
+
+    def test_elemento_grande_usa_trie(self):
+        e = elemento.crea({f'f{i}': i for i in range(1000)})
+        assert isinstance(e._dati, MappaPersistente)
+        e2 = elemento.scrive(e, 'f500', -1)
+        assert elemento.legge(e, 'f500') == 500
+        assert elemento.legge(e2, 'f500') == -1
+        assert len(elemento.campi(e2)) == 1000
+
+    def test_timbro_off_condivide_meta(self):
+        precedente = elemento.timbro('off')
+        try:
+            a = elemento.crea({'x': 1})
+            b = elemento.scrive(elemento.crea({'y': 2}), 'y', 3)
+            assert a._meta is b._meta
+            assert elemento.esiste(a)
+            assert not elemento.esiste(elemento.elimina(a))
+        finally:
+            assert elemento.timbro(precedente) == 'off'
+
+    def test_timbro_tick_monotono(self):
+        precedente = elemento.timbro('tick')
+        try:
+            a = elemento.crea({'x': 1})
+            b = elemento.scrive(a, 'x', 2)
+            assert isinstance(a._meta.creato, int)
+            assert b._meta.modificato > a._meta.modificato
+            assert b._meta.creato == a._meta.creato
+        finally:
+            elemento.timbro(precedente)
+
+    def test_timbro_orologio_datetime_in_lettura(self):
+        from datetime import datetime
+        e = elemento.crea({'x': 1})
+        assert isinstance(e._meta.get('creato'), datetime)
+        assert e._meta.get('sconosciuto', 0) == 0
+        with pytest.raises(ValueError):
+            elemento.timbro('meridiana')
+
+    def test_impronta_in_cache(self):
+        e = elemento.crea({'items': list(range(100))})
+        h = elemento.impronta(e)
+        assert e._hash == h
+        e['items'] = [1]
+        assert elemento.impronta(e) != h
+        assert elemento.crea({'x': 1}) != elemento.elimina(elemento.crea({'x': 1}))
+
+    def test_interna(self):
+        import gc
+        from tic_core.archetipi.elemento import _INTERNATI
+        a = elemento.interna(elemento.crea({'sku': 'Z', 'qta': 2}))
+        b = elemento.interna(elemento.crea({'sku': 'Z', 'qta': 2}))
+        c = elemento.interna(elemento.crea({'sku': 'Z', 'qta': 3}))
+        assert a is b
+        assert a is not c
+        assert elemento.interna({'sku': 'Z'}) == {'sku': 'Z'}
+        h = elemento.impronta(a)
+        del a, b
+        gc.collect()
+        assert h not in _INTERNATI
+
+    def test_meta_formato_dict(self):
+        e = Elemento(_dati={'x': 1}, _meta={'eliminato': True})
+        assert not elemento.esiste(e)
+
+    def test_legge_percorso(self):
+        e = elemento.crea({
+            'prenotazione': elemento.crea({'nome': 'Mario'}),
+            'righe': [{'sku': 'A1'}, {'sku': 'B2'}],
+            'a.b': 'chiave letterale',
+        })
+        assert elemento.legge(e, 'prenotazione.nome') == 'Mario'
+        assert elemento.legge(e, 'righe.1.sku') == 'B2'
+        assert elemento.legge(e, 'righe.5.sku', 'nessuno') == 'nessuno'
+        assert elemento.legge(e, 'prenotazione.telefono', '-') == '-'
+        assert elemento.legge(e, 'a.b') == 'chiave letterale'
+
+    def test_accessore_in_cache(self):
+        nome = elemento.accessore('prenotazione.nome')
+        assert elemento.accessore('prenotazione.nome') is nome
+        tavoli = [
+            elemento.crea({'prenotazione': {'nome': 'Anna'}}),
+            elemento.crea({'prenotazione': None}),
+        ]
+        assert contenitore.mappa(tavoli, nome) == ['Anna', None]
+        with pytest.raises(ValueError):
+            elemento.accessore('a..b')
+
+    def test_crea_molti_meta_condivisi(self):
+        righe = [{'sku': 'A', 'tag': ['x']}, {'sku': 'B', 'tag': []}]
+        els = elemento.crea_molti(righe)
+        assert [elemento.legge(e, 'sku') for e in els] == ['A', 'B']
+        assert els[0]._meta is els[1]._meta
+        with pytest.raises(TypeError):
+            elemento.legge(els[0], 'tag').append('y')
+        righe[0]['sku'] = 'Z'
+        assert elemento.legge(els[0], 'sku') == 'A'
+
+    def test_crea_molti_colonnare_campi_diversi(self):
+        t = elemento.crea_molti([{'a': 1, 'b': 2}, {'b': 3, 'a': 4}], colonnare=True)
+        assert t.somma('b') == 5
+        with pytest.raises(ValueError):
+            elemento.crea_molti([{'a': 1}, {'a': 2, 'b': 3}], colonnare=True)
+        with pytest.raises(ValueError):
+            elemento.crea_molti([{'a': 1, 'b': 3}, {'a': 2}], colonnare=True)
+
+    def test_da_colonne(self):
+        Prodotto = elemento.schema('prodotto_col', ['sku', 'prezzo'])
+        colonne = {'sku': ['A', 'B'], 'prezzo': [1.5, 2.5]}
+        assert [e._dati for e in elemento.da_colonne(colonne)] == [
+            {'sku': 'A', 'prezzo': 1.5}, {'sku': 'B', 'prezzo': 2.5}]
+        record = elemento.da_colonne(colonne, schema=Prodotto)
+        assert all(isinstance(r, Prodotto) for r in record)
+        assert elemento.da_colonne(colonne, colonnare=True).somma('prezzo') == 4.0
+        with pytest.raises(ValueError):
+            elemento.da_colonne({'a': [1, 2], 'b': [1]})
+
+    def test_crea_a_blocchi(self):
+        righe = iter({'n': i} for i in range(7))
+        blocchi = elemento.crea_a_blocchi(righe, blocco=3)
+        primo = next(blocchi)
+        assert len(primo) == 3
+        assert next(righe) == {'n': 3}  # letto solo il primo blocco
+        assert [len(b) for b in blocchi] == [3]
+
+
+class TestMappaPersistente:
+    """Test HAMT persistente."""
+
+    def test_associa_dissocia(self):
+        m = MappaPersistente({'a': 1})
+        m2 = m.associa('b', 2)
+        m3 = m2.dissocia('a')
+        assert dict(m.items()) == {'a': 1}
+        assert dict(m2.items()) == {'a': 1, 'b': 2}
+        assert dict(m3.items()) == {'b': 2}
+        assert m3.dissocia('zzz') is m3
+
+    def test_collisioni(self):
+        class Chiave:
+            def __init__(self, v):
+                self.v = v
+
+            def __hash__(self):
+                return 7
+
+            def __eq__(self, altro):
+                return isinstance(altro, Chiave) and altro.v == self.v
+
+        m = MappaPersistente()
+        for i in range(10):
+            m = m.associa(Chiave(i), i)
+        assert len(m) == 10
+        assert m[Chiave(3)] == 3
+        m = m.dissocia(Chiave(3))
+        assert Chiave(3) not in m
+        assert len(m) == 9
+
+    def test_confronto_con_dict(self):
+        import random
+        rng = random.Random(42)
+        modello = {}
+        m = MappaPersistente()
+        for _ in range(5000):
+            k = rng.randrange(500)
+            if rng.random() < 0.6:
+                modello[k] = k * 2
+                m = m.associa(k, k * 2)
+            else:
+                modello.pop(k, None)
+                m = m.dissocia(k)
+        assert len(m) == len(modello)
+        assert m == modello
+
+    def test_congela(self):
+        v = congela({'a': [1, {2}]})
+        assert v == {'a': [1, frozenset({2})]}
+        with pytest.raises(TypeError):
+            v['b'] = 1
+
+
+class TestElementoTabella:
+    """Test tabella colonnare."""
+
+    def _tabella(self):
+        return elemento.tabella([
+            elemento.crea({'sku': 'A', 'prezzo': 10.0, 'quantita': 5}),
+            elemento.crea({'sku': 'B', 'prezzo': 20.0, 'quantita': 0}),
+            elemento.crea({'sku': 'C', 'prezzo': 5.0, 'quantita': 2}),
+        ])
+
+    def test_colonne_e_aggregazioni(self):
+        t = self._tabella()
+        assert list(t.legge_colonna('quantita')) == [5, 0, 2]
+        assert t.somma('quantita') == 7
+        assert t.somma_prodotto('prezzo', 'quantita') == 60.0
+        assert (t.minimo('prezzo'), t.massimo('prezzo')) == (5.0, 20.0)
+        assert ElementoTabella({'x': []}).minimo('x') is None
+
+    def test_filtra_maschera(self):
+        t = self._tabella()
+        disponibili = t.filtra(t.maschera('quantita', lambda q: q > 0))
+        assert len(disponibili) == 2
+        assert list(disponibili.legge_colonna('sku')) == ['A', 'C']
+        with pytest.raises(ValueError):
+            t.filtra([True])
+
+    def test_righe_come_elemento(self):
+        t = self._tabella()
+        riga = t[-1]
+        assert elemento.legge(riga, 'sku') == 'C'
+        assert elemento.legge(riga, 'assente', 0) == 0
+        assert elemento.esiste(riga)
+        assert sorted(elemento.campi(riga)) == ['prezzo', 'quantita', 'sku']
+        nuova = elemento.scrive(riga, 'quantita', 9)
+        assert type(nuova) is Elemento
+        assert elemento.legge(nuova, 'quantita') == 9
+        assert list(t.legge_colonna('quantita')) == [5, 0, 2]
+        assert not elemento.esiste(elemento.elimina(riga))
+        con_stock = contenitore.filtra(t, lambda p: elemento.legge(p, 'quantita') > 0)
+        assert [elemento.legge(p, 'sku') for p in con_stock] == ['A', 'C']
+
+    def test_colonne_di_lunghezza_diversa(self):
+        with pytest.raises(ValueError):
+            ElementoTabella({'a': [1, 2], 'b': [1]})
+
+    def test_colonne_in_sola_lettura(self):
+        from array import array
+        sorgente = array('q', [1, 2, 3])
+        t = ElementoTabella({'x': sorgente, 'y': [4, 5, 6]})
+        sorgente[0] = 100  # la tabella ha la sua copia
+        assert t.somma('x') == 6
+        for campo in ('x', 'y'):
+            with pytest.raises((ValueError, TypeError)):
+                t.legge_colonna(campo)[0] = 0
+        assert list(t.legge_colonna('y')) == [4, 5, 6]
+
+    def test_colonne_ndarray_copiate(self):
+        np = pytest.importorskip('numpy')
+        sorgente = np.array([1, 2, 3])
+        t = ElementoTabella({'x': sorgente})
+        sorgente[0] = 100
+        assert t.somma('x') == 6
+        colonna = t.legge_colonna('x')
+        with pytest.raises(ValueError):
+            colonna.flags.writeable = True
+
+    def test_somme_oltre_int64(self):
+        grande = 2 ** 62
+        t = ElementoTabella({'a': [grande, grande, 1], 'b': [3, 3, 3]})
+        assert t.somma('a') == 2 * grande + 1
+        assert t.somma_prodotto('a', 'b') == (2 * grande + 1) * 3
+
+
+class TestStoria:
+    """Test cronologia con delta."""
+
+    def test_undo_redo(self):
+        s = Storia(elemento.crea({'x': 0}))
+        for i in range(1, 5):
+            s.registra(elemento.scrive(s.corrente, 'x', i))
+        assert elemento.legge(s.annulla(), 'x') == 3
+        assert elemento.legge(s.annulla(), 'x') == 2
+        assert elemento.legge(s.ripristina(), 'x') == 3
+        s.registra(elemento.scrive(s.corrente, 'x', 30))
+        assert not s.puo_ripristinare()
+        assert [elemento.legge(s.versione(i), 'x') for i in range(len(s))] == [0, 1, 2, 3, 30]
+
+    def test_versioni_ricostruite(self):
+        import random
+        rng = random.Random(7)
+        e = elemento.crea({f'f{i}': i for i in range(20)})
+        s = Storia(e, checkpoint_ogni=4)
+        versioni = [e]
+        for n in range(25):
+            if rng.random() < 0.8:
+                e = elemento.scrive(e, f'f{rng.randrange(25)}', n)
+            else:
+                e = elemento.elimina(e)
+            s.registra(e)
+            versioni.append(e)
+        assert all(s.versione(i) == v for i, v in enumerate(versioni))
+
+    def test_delta_contenitore_piccolo(self):
+        c = [elemento.crea({'n': i}) for i in range(1000)]
+        s = Storia(c)
+        s.registra(c + [elemento.crea({'n': 1000})])
+        s.registra(s.corrente[:10] + s.corrente[11:])
+        # Solo il tratto cambiato è salvato, non 1000 item
+        assert [len(voce[1][3]) for voce in s._voci[1:]] == [1, 0]
+        assert s.versione(0) == c
+        assert len(s.versione(1)) == 1001
+        assert s.versione(2)[10] == c[11]
+
+    def test_catena_di_delta(self):
+        import random
+        rng = random.Random(3)
+        for iniziale in (list(range(50)), elemento.crea({f'f{i}': i for i in range(300)})):
+            s = Storia(iniziale, checkpoint_ogni=16)
+            v = iniziale
+            versioni = [v]
+            for n in range(40):
+                if isinstance(v, list):
+                    i = rng.randrange(len(v))
+                    v = v[:i] + [n] * rng.randrange(3) + v[i + rng.randrange(3):]
+                elif rng.random() < 0.3:
+                    # Nessuna API rimuove campi: si toglie dal trie direttamente
+                    campo = rng.choice(elemento.campi(v))
+                    v = Elemento(_dati=v._dati.dissocia(campo), _meta=v._meta)
+                else:
+                    v = elemento.scrive(v, f'f{rng.randrange(320)}', n)
+                s.registra(v)
+                versioni.append(v)
+            assert all(s.versione(i) == atteso for i, atteso in enumerate(versioni))
+            # I delta del trie contengono solo i campi cambiati
+            if not isinstance(v, list):
+                assert all(len(voce[1][1]) <= 1 for voce in s._voci[1:] if not voce[0])
+
+    def test_vettore_condivide_struttura(self):
+        c = contenitore.crea(elemento.crea({'n': i}) for i in range(1000))
+        s = Storia(c)
+        s.registra(contenitore.aggiunge(c, elemento.crea({'n': 1000})))
+        # Versione intera, ma le foglie dell'albero sono le stesse
+        assert s.versione(1)._radice is c._radice
+        assert s.annulla() is c
+
 
 class TestContenitore:
     """Test archetipo contenitore."""
@@ -91,6 +499,347 @@ class TestContenitore:
         assert contenitore.vuoto([]) is True
         assert contenitore.vuoto([1]) is False
 
+    def test_vettore_da_list(self):
+        lista = [{'sku': 'A'}]
+        c = contenitore.aggiunge(lista, {'sku': 'B'})
+        assert lista == [{'sku': 'A'}]
+        assert c == [{'sku': 'A'}, {'sku': 'B'}]
+        with pytest.raises(TypeError):
+            c[1]['sku'] = 'Z'  # item congelati
+        assert contenitore.unisce([0], c)[1:] == c
+        assert contenitore.sostituisce_a(c, -1, 'x')[-1] == 'x'
+        assert contenitore.rimuove_a(c, 5) == c
+
+    def test_vettore_al_confine(self):
+        import json
+        import pickle
+        c = contenitore.crea([1, 2, 3])
+        assert c == [1, 2, 3] and c == (1, 2, 3) and (1, 2, 3) == c and c != (1, 2)
+        assert not isinstance(c, list)
+        assert json.dumps(c, default=list) == '[1, 2, 3]'
+        assert pickle.loads(pickle.dumps(c)) == c
+        vettore = contenitore.crea(range(50))
+        assert contenitore.mappa_parallelo(vettore, abs, processi=2, blocco=8) == list(range(50))
+        assert contenitore.filtra_parallelo(c, lambda x: x > 1, processi=1) == [2, 3]
+
+    def test_pipeline_pigra_e_fusa(self):
+        letti = []
+
+        def sorgente():
+            for i in itertools.count():
+                letti.append(i)
+                yield i
+
+        p = contenitore.pipeline(sorgente()).filtra(lambda x: x % 3 == 0).mappa(lambda x: x * 2)
+        assert letti == []  # niente eseguito prima del terminale
+        assert p.trova(lambda x: x > 10) == 12
+        assert letti == list(range(7))  # si ferma al primo risultato
+        # Sorgente iteratore: un secondo terminale non vede solo gli item rimasti
+        with pytest.raises(RuntimeError):
+            p.conta()
+        with pytest.raises(RuntimeError):
+            p.mappa(str).primo()
+        assert contenitore.pipeline(list(x for x in range(4))).filtra(bool).conta() == 3
+
+        c = contenitore.pipeline(range(10)).filtra(lambda x: x % 2 == 0)
+        assert c.conta() == 5
+        assert c.mappa(lambda x: [x, x]).piatto().prendi(3).lista() == [0, 0, 2]
+        assert c.salta(1).riduce(lambda a, x: a + x, 0) == 20
+        assert c.ultimo() == 8 and c.primo() == 0
+        assert contenitore.pipeline([]).minimo() is None
+        assert c.scarta(lambda x: x > 4).vettore() == [0, 2, 4]
+
+    def test_kernel_come_funzione_opaca(self):
+        interi = list(range(-500, 500))
+        reali = [x / 7 for x in interi]
+        primitive = [
+            valore.assoluto, valore.incrementa, valore.positivo, valore.zero,
+            confronta.vero, partial(valore.moltiplica, fattore=3),
+            partial(valore.decrementa, delta=2.5), partial(valore.divide, divisore=4),
+            partial(confronta.almeno, b=10), partial(confronta.tra, minimo=-3, massimo=3),
+        ]
+        for dati in (interi, reali, contenitore.crea(interi)):
+            for f in primitive:
+                opaca = lambda x, f=f: f(x)
+                assert contenitore.mappa(dati, f) == contenitore.mappa(dati, opaca)
+                assert contenitore.filtra(dati, f) == contenitore.filtra(dati, opaca)
+        assert contenitore.riduce(interi, valore.incrementa, 10) == sum(interi) + 10
+        assert contenitore.riduce([2, 3, 4], valore.moltiplica, 1) == 24
+        assert contenitore.riduce(interi, min, 0) == -500
+
+    def test_kernel_limiti(self):
+        grandi = [2 ** 62] * 100
+        assert contenitore.mappa(grandi, partial(valore.moltiplica, fattore=4)) == [2 ** 64] * 100
+        assert contenitore.mappa([1] * 100, partial(valore.divide, divisore=0)) == [None] * 100
+        assert contenitore.riduce(['a', 'b'], operator.add, '') == 'ab'
+
+    def test_kernel_ndarray(self):
+        np = pytest.importorskip('numpy')
+        a = np.arange(10)
+        doppi = contenitore.mappa(a, partial(valore.moltiplica, fattore=2))
+        assert doppi.tolist() == list(range(0, 20, 2))
+        assert contenitore.filtra(a, valore.positivo).tolist() == list(range(1, 10))
+        assert valore.somma(a) == 45 and valore.media(a) == 4.5
+        assert valore.somma(np.array([2 ** 62, 2 ** 62])) == 2 ** 63
+        assert valore.somma(np.array([], dtype=np.int64)) == 0
+
+    def test_mappa_filtra_parallelo(self):
+        from tic_core.archetipi import parallelo
+        dati = [elemento.crea({'n': i}) for i in range(100)]
+
+        def doppio(e):
+            return elemento.legge(e, 'n') * 2
+
+        def pari(e):
+            return elemento.legge(e, 'n') % 2 == 0
+
+        parallelo.registra_cella(doppio, 'test.doppio')
+        parallelo.registra_cella(pari, 'test.pari')
+        doppi = contenitore.mappa_parallelo(dati, doppio, processi=2, blocco=7)
+        assert doppi == list(range(0, 200, 2))
+        assert parallelo._pool is not None
+        filtrati = contenitore.filtra_parallelo(dati, pari, processi=2, blocco=7)
+        assert filtrati == dati[::2] and filtrati[1] is dati[2]
+        # Funzione a livello di modulo: nessuna registrazione, stesso pool
+        pool = parallelo._pool
+        assert contenitore.mappa_parallelo(range(50), abs, processi=2, blocco=8) == list(range(50))
+        assert parallelo._pool is pool
+        parallelo.chiudi_pool()
+
+    def test_parallelo_lambda_non_registrata_in_serie(self):
+        from tic_core.archetipi import parallelo
+        parallelo.chiudi_pool()
+        celle = len(parallelo._CELLE)
+        for k in range(3):
+            risultato = contenitore.mappa_parallelo(range(50), lambda x: x + k,
+                                                    processi=2, blocco=8)
+            assert risultato == list(range(k, 50 + k))
+        assert len(parallelo._CELLE) == celle  # nessun riferimento trattenuto
+        assert parallelo._pool is None
+
+    def test_parallelo_piccolo_in_serie(self):
+        from tic_core.archetipi import parallelo
+        parallelo.chiudi_pool()
+        assert contenitore.mappa_parallelo(list(range(1000)), abs, processi=4) == list(range(1000))
+        assert parallelo._pool is None
+
+    def test_vettore_molte_versioni(self):
+        versioni = [contenitore.crea()]
+        for i in range(2000):
+            versioni.append(contenitore.aggiunge(versioni[-1], i))
+        assert all(list(v) == list(range(len(v))) for v in versioni[::97])
+        v = versioni[-1]
+        for _ in range(1500):
+            v = v.rimuove_ultimo()
+        assert v == list(range(500))
+        assert contenitore.sostituisce_a(v, 0, -1)[:2] == [-1, 1]
+        assert versioni[1000][999] == 999
+
+    def test_indicizzato_coerente(self):
+        import random
+        rnd = random.Random(7)
+        c = contenitore.indicizzato([{'sku': f'S{i % 5}', 'n': i} for i in range(40)],
+                                    chiavi=['sku'])
+        for passo in range(300):
+            scelta = rnd.random()
+            if scelta < 0.4 or not c:
+                c = contenitore.aggiunge(c, {'sku': f'S{rnd.randrange(8)}', 'n': passo})
+            elif scelta < 0.7:
+                nuovo = {'sku': f'S{rnd.randrange(8)}', 'n': -passo}
+                c = contenitore.sostituisce_a(c, rnd.randrange(len(c)), nuovo)
+            else:
+                c = contenitore.rimuove_a(c, rnd.randrange(len(c)))
+            for k in range(8):
+                predicato = partial(confronta.campo_uguale, campo='sku', valore=f'S{k}')
+                atteso = [i for i, e in enumerate(c) if e['sku'] == f'S{k}']
+                assert c.posizioni('sku', f'S{k}') == tuple(atteso)
+                assert contenitore.trova_indice(c, predicato) == (atteso[0] if atteso else None)
+        assert type(c).__name__ == 'ContenitoreIndicizzato'
+
+    def test_indicizzato_trova(self):
+        prodotti = [elemento.crea({'sku': f'S{i}', 'prezzo': i}) for i in range(100)]
+        c = contenitore.indicizzato(prodotti, chiavi=['sku'])
+        cerca = partial(confronta.campo_uguale, campo='sku', valore='S42')
+        assert contenitore.trova(c, cerca) is prodotti[42]
+        assert contenitore.trova(prodotti, cerca) is prodotti[42]  # list: scansione
+        assert contenitore.trova(
+            c, partial(confronta.campo_uguale, campo='sku', valore='X')) is None
+        # Campo non indicizzato: scansione
+        assert contenitore.trova(
+            c, partial(confronta.campo_uguale, campo='prezzo', valore=7)) is prodotti[7]
+        assert contenitore.filtra(c, lambda p: elemento.legge(p, 'prezzo') < 2) == prodotti[:2]
+        unito = contenitore.unisce(c, [elemento.crea({'sku': 'Z'})])
+        assert unito.trova_per('sku', 'Z') is not None
+        with pytest.raises(TypeError):
+            contenitore.aggiunge(c, {'sku': ['non', 'hashable']})
+
+    def test_ordinato_coerente(self, monkeypatch):
+        import random
+        from tic_core.archetipi import ordinato
+        monkeypatch.setattr(ordinato, 'BLOCCO', 4)  # molti blocchi anche con pochi item
+        rnd = random.Random(3)
+        c, atteso = contenitore.ordinato(chiave='p'), []
+        for passo in range(600):
+            if rnd.random() < 0.6 or not atteso:
+                item = {'p': rnd.randrange(40), 'n': passo}
+                c = contenitore.aggiunge(c, item)
+                atteso.append(item)
+                atteso.sort(key=lambda x: x['p'])  # stabile, come il contenitore
+            else:
+                i = rnd.randrange(len(atteso))
+                c = contenitore.rimuove_a(c, i)
+                del atteso[i]
+            lo, hi = sorted((rnd.randrange(45), rnd.randrange(45)))
+            assert list(c) == atteso
+            assert contenitore.tra(c, lo, hi) == [x for x in atteso if lo <= x['p'] <= hi]
+            assert c.rango(lo) == sum(x['p'] < lo for x in atteso)
+            assert c.conta_tra(lo, hi) == len(c.tra(lo, hi))
+            # Pari merito in ordine di arrivo anche al contrario, come sorted(reverse=True)
+            decrescenti = sorted(atteso, key=lambda x: x['p'], reverse=True)
+            assert contenitore.ordina(c, inverso=True) == decrescenti
+
+    def test_ordinato_operazioni(self):
+        prezzi = [elemento.crea({'sku': f'S{i}', 'prezzo': (i * 37) % 100}) for i in range(100)]
+        c = contenitore.ordinato(prezzi, chiave='prezzo')
+        assert [elemento.legge(p, 'prezzo') for p in c] == list(range(100))
+        assert contenitore.ordina(c) == list(c)
+        assert contenitore.ordina(c, inverso=True)[0] is c.massimo()
+        assert elemento.legge(c.percentile(90), 'prezzo') == 89
+        assert elemento.legge(c[10], 'prezzo') == 10 and c[-1] is c.massimo()
+        c2 = contenitore.sostituisce_a(c, 0, elemento.scrive(c[0], 'prezzo', 500))
+        assert c2.massimo() is not c.massimo() and len(c2) == 100
+        assert contenitore.rimuove(c2, c2[5]) == list(c2)[:5] + list(c2)[6:]
+        assert len(contenitore.unisce(c, prezzi)) == 200
+        # Senza ordinato: scansione con la stessa semantica
+        assert contenitore.tra(prezzi, 10, 12, chiave='prezzo') == \
+            [p for p in prezzi if 10 <= elemento.legge(p, 'prezzo') <= 12]
+        assert contenitore.ordinato(c, chiave='prezzo') is c
+
+    def test_primi_k_come_ordina(self):
+        import random
+        from tic_core.archetipi import TopK
+        rnd = random.Random(5)
+        dati = [{'p': rnd.randrange(50), 'n': i} for i in range(3000)]  # molti pari merito
+        for k in (0, 1, 7, 3000, 5000):
+            for inverso in (False, True):
+                atteso = contenitore.ordina(dati, chiave=lambda x: x['p'], inverso=inverso)[:k]
+                assert contenitore.primi_k(dati, k, chiave='p', inverso=inverso) == atteso
+                assert contenitore.primi_k(iter(dati), k, chiave='p', inverso=inverso) == atteso
+                top = TopK(k, chiave='p', inverso=inverso)
+                for x in dati[:1500]:
+                    top.aggiunge(x)
+                assert top.estende(dati[1500:]).risultato() == atteso
+        ordinato = contenitore.ordinato(dati, chiave='p')
+        for inverso in (False, True):
+            # Stessi pari merito anche dalle estremità del contenitore ordinato
+            assert contenitore.primi_k(ordinato, 200, inverso=inverso) == \
+                contenitore.primi_k(dati, 200, chiave='p', inverso=inverso)
+        prezzi = contenitore.pipeline(dati).mappa(lambda x: x['p'])
+        assert prezzi.primi_k(3, inverso=True) == [49, 49, 49]
+
+    def test_aggrega_un_passaggio(self):
+        import random
+        rnd = random.Random(11)
+        stati = ['nuovo', 'pagato', 'spedito', 'annullato']
+        righe = [{'stato': rnd.choice(stati), 'totale': rnd.randrange(1, 500), 'peso': rnd.random()}
+                 for _ in range(2000)]
+        aggregati = {
+            'n': (None, 'conta'), 'tot': ('totale', 'somma'), 'medio': ('totale', valore.media),
+            'min': ('totale', 'minimo'), 'max_peso': ('peso', 'massimo'), 'peso': ('peso', 'somma'),
+        }
+        atteso = {}
+        for stato, gruppo in contenitore.raggruppa(righe, 'stato').items():
+            totali = [r['totale'] for r in gruppo]
+            pesi = [r['peso'] for r in gruppo]
+            atteso[stato] = {'n': len(gruppo), 'tot': sum(totali),
+                             'medio': sum(totali) / len(totali), 'min': min(totali),
+                             'max_peso': max(pesi), 'peso': sum(pesi)}
+        assert list(atteso) == list(dict.fromkeys(r['stato'] for r in righe))
+
+        da_righe = contenitore.aggrega(righe, 'stato', aggregati)
+        da_colonne = contenitore.aggrega(ElementoTabella.da_righe(righe), 'stato', aggregati)
+        for risultato in (da_righe, da_colonne):
+            assert list(risultato) == list(atteso)
+            for stato, riga in atteso.items():
+                assert risultato[stato]['peso'] == pytest.approx(riga.pop('peso'))
+                assert {k: v for k, v in risultato[stato].items() if k != 'peso'} == riga
+                riga['peso'] = risultato[stato]['peso']
+        per_soglia = contenitore.aggrega(righe, lambda r: r['totale'] > 250, {'n': (None, len)})
+        assert per_soglia.keys() == {True, False}
+        with pytest.raises(ValueError):
+            contenitore.aggrega(righe, 'stato', {'x': ('totale', 'mediana')})
+        with pytest.raises(ValueError):
+            contenitore.aggrega(righe, 'stato', {'x': (None, 'somma')})  # non è un conteggio
+        # Gruppi numerici da colonne: chiavi int Python, come da righe
+        conta = {'n': (None, 'conta')}
+        fasce = ElementoTabella({'f': [r['totale'] // 100 for r in righe]})
+        per_fascia = contenitore.aggrega(fasce, 'f', conta)
+        assert {type(g) for g in per_fascia} == {int}
+        assert per_fascia == contenitore.aggrega(righe, lambda r: r['totale'] // 100, conta)
+
+    def test_unisci_per(self):
+        items = [{'sku': s, 'n': i} for i, s in enumerate(['B', 'A', 'Z', None, 'B'])]
+        prodotti = [{'sku': 'A', 'p': 1}, {'sku': 'B', 'p': 2}, {'sku': 'B', 'p': 3},
+                    {'sku': None, 'p': 4}]
+        nidificato = [(s, d) for s in items for d in prodotti
+                      if s['sku'] is not None and s['sku'] == d['sku']]
+
+        assert contenitore.unisci_per(items, prodotti, 'sku') == nidificato
+        # Tabella sul lato più piccolo: stesso risultato, stesso ordine
+        assert contenitore.unisci_per(items[:2], prodotti, 'sku') == nidificato[:3]
+        indicizzati = contenitore.indicizzato(prodotti, chiavi=['sku'])
+        assert contenitore.unisci_per(items, indicizzati, 'sku') == nidificato
+        # Lato sinistro piccolo: sonda l'indice
+        assert contenitore.unisci_per(items[:1], indicizzati, 'sku') == nidificato[:2]
+
+        sinistra = contenitore.unisci_per(items, indicizzati, 'sku', tipo='left')
+        assert [s['n'] for s, _ in sinistra] == [0, 0, 1, 2, 3, 4, 4]
+        assert [d and d['p'] for _, d in sinistra] == [2, 3, 1, None, None, 2, 3]
+
+        flusso = contenitore.unisci_per(iter(items), prodotti, lambda x: x['sku'],
+                                        tipo='left', flusso=True)
+        assert list(flusso) == sinistra
+        with pytest.raises(ValueError):
+            contenitore.unisci_per(items, prodotti, 'sku', tipo='outer')
+
+    def test_finestra_come_slice(self):
+        import random
+        rnd = random.Random(5)
+        for _ in range(200):
+            xs = [rnd.randrange(-50, 50) for _ in range(rnd.randrange(0, 40))]
+            ampiezza, passo = rnd.randrange(1, 8), rnd.randrange(1, 10)
+            attese = [tuple(xs[i:i + ampiezza]) for i in range(0, len(xs) - ampiezza + 1, passo)]
+            assert list(contenitore.finestra(xs, ampiezza, passo)) == attese
+            aggregati = contenitore.finestra(iter(xs), ampiezza, passo,
+                                             aggregato=('somma', 'media', 'minimo', 'massimo'))
+            assert list(aggregati) == [{'somma': sum(f), 'media': sum(f) / ampiezza,
+                                        'minimo': min(f), 'massimo': max(f)} for f in attese]
+        # Somme di float: nessun errore accumulato sulle finestre lontane
+        fs = [rnd.random() * 1e6 for _ in range(5000)]
+        somme = list(contenitore.finestra(fs, 50, aggregato='somma'))
+        assert somme[-1] == pytest.approx(sum(fs[-50:]), rel=1e-12)
+        massimi = contenitore.finestra([{'v': 2}, {'v': 7}], 1, aggregato='massimo', chiave='v')
+        assert list(massimi) == [2, 7]
+        with pytest.raises(ValueError):
+            contenitore.finestra(xs, 0)
+        with pytest.raises(ValueError):
+            contenitore.finestra(xs, 3, aggregato='mediana')
+
+    def test_partiziona(self):
+        chiamate = []
+
+        def grande(x):
+            chiamate.append(x)
+            return x > 2
+        assert contenitore.partiziona([3, 1, 4, 1, 5], grande) == ([3, 4, 5], [1, 1])
+        assert chiamate == [3, 1, 4, 1, 5]
+        maggiore_di_1 = partial(confronta.maggiore, b=1)
+        assert contenitore.partiziona(contenitore.crea([1, 2, 3]), maggiore_di_1) == ([2, 3], [1])
+
+        veri, falsi = contenitore.partiziona(itertools.count(), lambda x: x % 3 == 0)
+        assert list(itertools.islice(falsi, 4)) == [1, 2, 4, 5]
+        assert list(itertools.islice(veri, 3)) == [0, 3, 6]
+
 
 class TestConfronta:
     """Test archetipo confronta."""
@@ -0,0 +1,243 @@
+"""
+Test per l'Archivio (codec binario)
+"""
+
+import io
+import pytest
+import sys
+import threading
+sys.path.insert(0, '..')
+
+from tic_core.archetipi import elemento
+from tic_core.archetipi.persistente import ListaCongelata
+from tic_core.archivio import (
+    codifica, decodifica, Codificatore, Decodificatore,
+    ElementoBinario, ListaBinaria, ErroreCodifica,
+    ArchivioMappato, ElementoMappato, scrive_mappato, deduce_layout,
+    ContenitoreSuFile, scrive_righe,
+)
+
+
+def _ordine(n):
+    return elemento.crea({
+        'id': f'ORD{n}',
+        'items': [elemento.crea({'sku': f'S{i}', 'qty': i, 'prezzo': 1.5 * i}) for i in range(3)],
+        'totale': 10.0 * n,
+        'stato': 'creato',
+        'note': None,
+    })
+
+
+class TestBinario:
+    """Test codifica/decodifica."""
+
+    def test_valori_scalari_e_contenitori(self):
+        valori = [
+            0, -1, 2 ** 40, -(2 ** 80), 3.25, 'àèì', b'\x00\xff', None, True, False,
+            (1, 'a'), frozenset({1, 2}), {'a': {'b': [1, 2]}}, {1: 'x', (2, 3): 'y'}, [],
+        ]
+        assert decodifica(codifica(valori)) == valori
+
+    def test_elementi(self):
+        ordini = [_ordine(n) for n in range(5)]
+        ordini.append(elemento.elimina(ordini[0]))
+        decodificati = decodifica(codifica(ordini))
+        assert decodificati == ordini
+        assert not elemento.esiste(decodificati[-1])
+        assert isinstance(elemento.legge(decodificati[0], 'items'), ListaCongelata)
+
+    def test_record_da_schema(self):
+        Punto = elemento.schema('punto_bin', ['x', 'y'])
+        p = elemento.crea({'x': 1}, schema=Punto)
+        q = decodifica(codifica(p))
+        assert type(q) is Punto
+        assert elemento.legge(q, 'x') == 1
+        assert elemento.legge(q, 'y', 'assente') == 'assente'
+
+    def test_schemi_compressi(self):
+        dati = codifica([_ordine(n) for n in range(10)])
+        # Le chiavi viaggiano una volta sola
+        assert dati.count(b'prezzo') == 1
+        assert dati.count(b'stato') == 1
+
+    def test_decodifica_pigra(self):
+        ordini = [_ordine(n) for n in range(10)]
+        dati = bytearray(codifica(ordini))
+        vista = decodifica(memoryview(dati), pigro=True)
+        assert isinstance(vista, ListaBinaria)
+        assert len(vista) == 10
+        o = vista[7]
+        assert isinstance(o, ElementoBinario)
+        assert elemento.legge(o, 'id') == 'ORD7'
+        assert elemento.legge(o, 'manca', 0) == 0
+        assert o == ordini[7]
+        assert vista == ordini
+        o2 = elemento.scrive(o, 'stato', 'pagato')
+        assert type(o2) is type(ordini[0])
+        assert elemento.legge(o2, 'totale') == 70.0
+        assert elemento.legge(o, 'stato') == 'creato'
+
+    def test_flusso(self):
+        ordini = [_ordine(n) for n in range(5)]
+        f = io.BytesIO()
+        codificatore = Codificatore(f)
+        for ordine in ordini:
+            codificatore.scrive(ordine)
+        codificatore.scrive('fine')
+        f.seek(0)
+        letti = list(Decodificatore(f))
+        assert letti[:5] == ordini
+        assert letti[5] == 'fine'
+        f.seek(0)
+        pigri = list(Decodificatore(f, pigro=True))
+        assert elemento.legge(pigri[3], 'id') == 'ORD3'
+
+    def test_errori(self):
+        with pytest.raises(ErroreCodifica):
+            codifica(object())
+        with pytest.raises(ErroreCodifica):
+            decodifica(b'XX')
+        f = io.BytesIO()
+        Codificatore(f).scrive([1, 2, 3])
+        f = io.BytesIO(f.getvalue()[:-2])
+        with pytest.raises(ErroreCodifica):
+            list(Decodificatore(f))
+
+
+class TestMappato:
+    """Test viste su file mappato."""
+
+    def _catalogo(self, n=1000):
+        return [
+            elemento.crea({'sku': f'SKU{i:05d}', 'nome': f'Prodotto {i}', 'prezzo': 1.5 * i,
+                           'quantita': i % 7, 'attivo': i % 3 != 0})
+            for i in range(n)
+        ]
+
+    def test_scrive_e_legge(self, tmp_path):
+        catalogo = self._catalogo()
+        percorso = str(tmp_path / 'catalogo.tic')
+        assert scrive_mappato(percorso, catalogo) == 1000
+        with ArchivioMappato(percorso) as archivio:
+            assert len(archivio) == 1000
+            p = archivio[-1]
+            assert isinstance(p, ElementoMappato)
+            assert elemento.legge(p, 'sku') == 'SKU00999'
+            assert elemento.legge(p, 'attivo') is False
+            assert elemento.legge(p, 'assente', 0) == 0
+            assert elemento.impronta(p) == elemento.impronta(catalogo[-1])
+            assert archivio.legge_colonna('quantita') == [i % 7 for i in range(1000)]
+            assert [elemento.legge(x, 'prezzo') for x in archivio[:3]] == [0.0, 1.5, 3.0]
+
+    def test_scrive_copy_on_write(self, tmp_path):
+        percorso = str(tmp_path / 'catalogo.tic')
+        scrive_mappato(percorso, self._catalogo(10))
+        with ArchivioMappato(percorso) as archivio:
+            p = archivio[3]
+            p2 = elemento.scrive(p, 'prezzo', 99.0)
+            assert type(p2) is type(elemento.crea())
+            assert elemento.legge(p2, 'prezzo') == 99.0
+            assert elemento.legge(p2, 'nome') == 'Prodotto 3'
+            assert elemento.legge(p, 'prezzo') == 4.5
+            assert not elemento.esiste(elemento.elimina(p))
+            with pytest.raises(TypeError):
+                p['prezzo'] = 1.0
+
+    def test_layout_esplicito_e_errori(self, tmp_path):
+        percorso = str(tmp_path / 'tavoli.tic')
+        tavoli = [elemento.crea({'id': 'T1', 'posti': 4}), elemento.crea({'id': 'T2', 'posti': 6})]
+        scrive_mappato(percorso, tavoli, layout=[('id', 's8'), ('posti', 'i')])
+        with ArchivioMappato(percorso) as archivio:
+            assert archivio.layout == [('id', 's8'), ('posti', 'i')]
+            assert elemento.legge(archivio[1], 'id') == 'T2'
+        with pytest.raises(ValueError):
+            scrive_mappato(percorso, tavoli, layout=[('id', 's1'), ('posti', 'i')])
+        with pytest.raises(ValueError):
+            deduce_layout([elemento.crea({'note': None})])
+        # '\x00' finali e interi oltre 64 bit: rifiutati, non persi o struct.error
+        with pytest.raises(ValueError):
+            scrive_mappato(percorso, [elemento.crea({'id': 'T1\x00', 'posti': 4})])
+        with pytest.raises(ValueError):
+            scrive_mappato(percorso, [elemento.crea({'id': 'T1', 'posti': 2 ** 63})])
+        scrive_mappato(percorso, [elemento.crea({'id': 'a\x00b', 'posti': -2 ** 63})])
+        with ArchivioMappato(percorso) as archivio:
+            assert elemento.legge(archivio[0], 'id') == 'a\x00b'
+            assert elemento.legge(archivio[0], 'posti') == -2 ** 63
+        (tmp_path / 'vuoto.tic').write_bytes(b'')
+        with pytest.raises(ValueError):
+            ArchivioMappato(str(tmp_path / 'vuoto.tic'))
+
+
+class TestSuFile:
+    """Test contenitore su file letto a blocchi."""
+
+    @pytest.mark.parametrize('nome', ['ordini.jsonl', 'ordini.tic'])
+    def test_come_in_memoria(self, tmp_path, nome):
+        ordini = [_ordine(n) for n in range(57)]
+        percorso = str(tmp_path / nome)
+        assert scrive_righe(percorso, ordini) == 57
+        storico = ContenitoreSuFile(percorso, blocco=10)
+        assert storico.formato == ('json' if nome.endswith('.jsonl') else 'binario')
+        if storico.formato == 'binario':
+            assert storico.lista() == ordini
+        else:  # JSON: solo i dati
+            ids = [elemento.legge(o, 'id') for o in ordini]
+            assert [elemento.legge(o, 'id') for o in storico] == ids
+        assert [len(b) for b in storico.blocchi()] == [10] * 5 + [7]
+
+        pari = storico.filtra(lambda o: elemento.legge(o, 'totale') % 20 == 0)
+        totali = pari.mappa(lambda o: elemento.legge(o, 'totale'))
+        assert totali.lista() == [10.0 * n for n in range(0, 57, 2)]
+        assert totali.riduce(lambda acc, t: acc + t, 0.0) == sum(10.0 * n for n in range(0, 57, 2))
+        assert pari.conta() == 29
+        assert ContenitoreSuFile(percorso, blocco=10, anticipo=0).filtra(
+            lambda o: elemento.legge(o, 'totale') % 20 == 0).conta() == 29
+
+        # Riversato su disco, in un altro formato
+        copia = pari.scrive(str(tmp_path / 'pari.jsonl'))
+        assert copia.formato == 'json'
+        assert [elemento.legge(o, 'id') for o in copia] == [f'ORD{n}' for n in range(0, 57, 2)]
+        assert elemento.legge(copia.lista()[1], 'items')[2]['prezzo'] == 3.0
+
+    def test_json_di_valori(self, tmp_path):
+        percorso = str(tmp_path / 'n.jsonl')
+        scrive_righe(percorso, [{'n': i} for i in range(5)])
+        # Il risultato di un mappa non è un oggetto: torna così com'è
+        valori = ContenitoreSuFile(percorso, blocco=2).mappa(lambda r: elemento.legge(r, 'n'))
+        assert valori.scrive(str(tmp_path / 'x.jsonl')).lista() == [0, 1, 2, 3, 4]
+        scrive_righe(percorso, [[1, 2], 'a', {'n': 1}, None])
+        misti = ContenitoreSuFile(percorso).lista()
+        assert misti[:2] == [[1, 2], 'a'] and misti[3] is None
+        assert elemento.legge(misti[2], 'n') == 1
+
+    def test_memoria_limitata_e_interruzione(self, tmp_path, monkeypatch):
+        letti = []
+
+        def grezzi(self):
+            for i in range(100):
+                letti.append(i)
+                yield [i]
+        monkeypatch.setattr(ContenitoreSuFile, '_grezzi', grezzi)
+        monkeypatch.setattr(ContenitoreSuFile, '_decodifica', lambda self: list)
+        c = ContenitoreSuFile(str(tmp_path / 'x.tic'), blocco=1, anticipo=2)
+        blocchi = c.blocchi()
+        assert next(blocchi) == [0]
+        for _ in range(50):
+            if len(letti) >= 4:
+                break
+            threading.Event().wait(0.01)
+        assert len(letti) <= 4  # in lavorazione + coda di 2 + uno in attesa di posto
+        blocchi.close()
+        assert len(letti) <= 5
+        assert not any(t.name == 'tic-blocchi' for t in threading.enumerate())
+
+    def test_errori(self, tmp_path):
+        percorso = tmp_path / 'troncato.tic'
+        scrive_righe(str(percorso), [_ordine(n) for n in range(5)])
+        percorso.write_bytes(percorso.read_bytes()[:-3])
+        with pytest.raises(ErroreCodifica):
+            ContenitoreSuFile(str(percorso), blocco=2).conta()
+        with pytest.raises(ValueError):
+            ContenitoreSuFile(str(percorso), formato='csv')
+        with pytest.raises(ValueError):
+            ContenitoreSuFile(str(percorso), blocco=0)
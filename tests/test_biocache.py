@@ -6,7 +6,8 @@ import pytest
 import sys
 sys.path.insert(0, '..')
 
-from tic_core.biocache import BiocCache, LTM, MTM, STM
+from tic_core.archetipi import elemento, contenitore
+from tic_core.biocache import BiocCache, LTM, MTM, STM, memo, MemoriaDisco, impronta_canonica
 
 
 class TestBiocCache:
@@ -156,5 +157,156 @@ class TestLivelli:
         # a e b dovrebbero rimanere
 
 
+class TestMemo:
+    """Test memoizzazione di celle pure."""
+
+    def test_calcola_una_volta(self):
+        cache = BiocCache()
+        chiamate = [0]
+
+        @memo(chiave='test.doppio', cache=cache)
+        def doppio(x):
+            chiamate[0] += 1
+            return x * 2
+
+        assert doppio(3) == 6
+        assert doppio(3) == 6
+        assert doppio(4) == 8
+        assert chiamate[0] == 2
+
+    def test_elemento_hash_strutturale(self):
+        cache = BiocCache()
+        chiamate = [0]
+
+        @memo(chiave='test.totale', cache=cache)
+        def totale(el):
+            chiamate[0] += 1
+            return sum(elemento.legge(el, 'prezzi'))
+
+        a = elemento.crea({'prezzi': [1, 2, 3]})
+        b = elemento.crea({'prezzi': [1, 2, 3]})
+        c = elemento.crea({'prezzi': [1, 2, 4]})
+
+        assert totale(a) == 6
+        assert totale(b) == 6  # stessa struttura → hit
+        assert totale(c) == 7
+        assert chiamate[0] == 2
+
+    def test_collisioni_impronta(self):
+        cache = BiocCache()
+
+        @memo(chiave='test.doppio', cache=cache)
+        def doppio(x):
+            return x * 2
+
+        # hash(-1) == hash(-2): stessa chiave in cache, argomenti diversi
+        assert doppio(-1) == -2
+        assert doppio(-2) == -4
+        assert doppio(-1) == -2
+        # 1 == 1.0 == True con lo stesso hash: tipi diversi, risultati diversi
+        assert doppio(1) == 2
+        assert type(doppio(1.0)) is float
+        assert doppio(True) == 2 and doppio([1]) == [1, 1]
+        assert doppio((1,)) == (1, 1)
+
+    def test_livello(self):
+        cache = BiocCache()
+
+        @memo(livello=LTM, chiave='test.costante', cache=cache)
+        def costante():
+            return 42
+
+        costante()
+        assert cache.statistiche()['ltm_count'] == 1
+
+
+class TestMemoriaDisco:
+    """Test archivio persistente content-addressed."""
+
+    @pytest.fixture(params=['cartella', 'cache.sqlite'])
+    def percorso(self, request, tmp_path):
+        return str(tmp_path / request.param)
+
+    def test_persistenza_tra_istanze(self, percorso):
+        chiamate = [0]
+
+        def cella(x):
+            chiamate[0] += 1
+            return {'x': x, 'doppio': x * 2}
+
+        disco = MemoriaDisco(percorso)
+        assert disco.memo(chiave='test.cella')(cella)(3) == {'x': 3, 'doppio': 6}
+        disco.chiudi()
+
+        # Nuova istanza (nuovo "run"): il risultato è già su disco
+        disco = MemoriaDisco(percorso)
+        assert disco.memo(chiave='test.cella')(cella)(3) == {'x': 3, 'doppio': 6}
+        assert chiamate[0] == 1
+        assert disco.statistiche()['test.cella'] == {'hit': 1, 'miss': 0, 'tasso_hit': 1.0}
+        disco.chiudi()
+
+    def test_pulizia_lru(self, percorso):
+        disco = MemoriaDisco(percorso, max_bytes=2500)
+        for i in range(10):
+            disco.scrivi('test.blob', impronta_canonica((i,)), b'x' * 1000)
+        assert disco.dimensione() <= 2500
+        # Gli ultimi scritti restano
+        trovato, _ = disco.leggi('test.blob', impronta_canonica((9,)))
+        assert trovato
+        trovato, _ = disco.leggi('test.blob', impronta_canonica((0,)))
+        assert not trovato
+        disco.chiudi()
+
+    def test_pulizia_fino_alla_soglia(self, percorso):
+        disco = MemoriaDisco(percorso, max_bytes=10_000)
+        pulizie = []
+        pulisci = disco._archivio.pulisci
+        disco._archivio.pulisci = lambda n: (pulizie.append(n), pulisci(n))
+        for i in range(100):
+            disco.scrivi('test.blob', impronta_canonica((i,)), b'x' * 1000)
+            assert disco.dimensione() <= 10_000
+        # Ogni pulizia libera ~20%: una ogni due scritture circa, non a ogni scrittura
+        assert len(pulizie) <= 50
+        assert set(pulizie) == {8000}
+        disco.chiudi()
+
+    def test_celle_con_nomi_simili(self, tmp_path):
+        disco = MemoriaDisco(str(tmp_path / 'cartella'))
+        disco.scrivi('modulo.a/b', 'ff00', 1)
+        disco.scrivi('modulo.a_b', 'ff00', 2)
+        assert disco.leggi('modulo.a/b', 'ff00') == (True, 1)
+        assert disco.leggi('modulo.a_b', 'ff00') == (True, 2)
+
+    def test_memo_su_contenitori_persistenti(self, percorso):
+        from tic_core.archetipi.indicizzato import ContenitoreIndicizzato
+        from tic_core.archetipi.ordinato import ContenitoreOrdinato
+        chiamate = [0]
+
+        def conta_item(c):
+            chiamate[0] += 1
+            return len(c)
+
+        items = [elemento.crea({'id': i, 'n': -i}) for i in range(5)]
+        argomenti = [contenitore.crea(items), ContenitoreIndicizzato(items, ('id',)),
+                     ContenitoreOrdinato(items, 'n'), ContenitoreOrdinato(items, 'id')]
+        disco = MemoriaDisco(percorso)
+        conta = disco.memo(chiave='test.conta')(conta_item)
+        assert [conta(c) for c in argomenti] == [5] * 4
+        assert chiamate[0] == 4  # tipi e chiavi diverse: impronte diverse
+        assert [conta(c) for c in argomenti] == [5] * 4
+        assert chiamate[0] == 4
+        assert conta(contenitore.aggiunge(argomenti[0], items[0])) == 6
+        with pytest.raises(TypeError):
+            conta(ContenitoreOrdinato(items, lambda e: 0))
+        disco.chiudi()
+
+    def test_impronta_canonica(self):
+        a = elemento.crea({'b': [1, 2.5], 'a': {'y': None, 'x': 'z'}})
+        b = elemento.crea({'a': {'x': 'z', 'y': None}, 'b': [1, 2.5]})
+        assert impronta_canonica((a,)) == impronta_canonica((b,))
+        assert impronta_canonica((1,)) != impronta_canonica((1.0,))
+        assert impronta_canonica(([1],)) != impronta_canonica(((1,),))
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
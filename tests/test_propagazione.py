@@ -7,6 +7,7 @@ import sys
 sys.path.insert(0, '..')
 
 from tic_core.propagazione import Tessuto
+from tic_core.biocache import BiocCache
 
 
 class TestTessuto:
@@ -152,5 +153,89 @@ class TestTessuto:
         assert 'b' in grafo['a']
 
 
+class TestTessutoCache:
+    """Test derivati in BiocCache."""
+
+    def test_derivato_in_cache(self):
+        cache = BiocCache()
+        tessuto = Tessuto(cache=cache)
+        tessuto.imposta('base', 10)
+
+        @tessuto.derivato('cliente.1.totale.doppio', dipende_da=['base'])
+        def _():
+            return tessuto.legge('base') * 2
+
+        assert tessuto.legge('cliente.1.totale.doppio') == 20
+        assert cache.esiste('cliente.1.totale.doppio')
+        assert tessuto._nodi['cliente.1.totale.doppio'].valore is None
+
+    def test_invalidazione_elimina_voce(self):
+        cache = BiocCache()
+        tessuto = Tessuto(cache=cache)
+        tessuto.imposta('base', 1)
+
+        @tessuto.derivato('a.b.c.d', dipende_da=['base'])
+        def _():
+            return tessuto.legge('base') + 1
+
+        assert tessuto.legge('a.b.c.d') == 2
+        tessuto.imposta('base', 5)
+        assert not cache.esiste('a.b.c.d')
+        assert tessuto.legge('a.b.c.d') == 6
+
+    def test_evicted_si_ricalcola(self):
+        cache = BiocCache(stm_size=2)
+        tessuto = Tessuto(cache=cache)
+        calcoli = []
+
+        for i in range(5):
+            @tessuto.derivato(f'cliente.{i}.ordini.totale.mese', dipende_da=[])
+            def _(i=i):
+                calcoli.append(i)
+                return i * 10
+
+        for i in range(5):
+            assert tessuto.legge(f'cliente.{i}.ordini.totale.mese') == i * 10
+
+        assert cache.statistiche()['stm_count'] <= 2
+        # cliente.0 è stato evicted: rilettura → ricalcolo
+        assert tessuto.legge('cliente.0.ordini.totale.mese') == 0
+        assert calcoli.count(0) == 2
+
+    def test_nomi_brevi_evicted(self):
+        cache = BiocCache(stm_size=10, mtm_size=10)
+        tessuto = Tessuto(cache=cache)
+
+        for i in range(1000):
+            @tessuto.derivato(f'totale.{i}', dipende_da=[])
+            def _(i=i):
+                return i
+
+        for i in range(1000):
+            assert tessuto.legge(f'totale.{i}') == i
+
+        @tessuto.derivato('tavoli.liberi', dipende_da=[])
+        def _():
+            return ['t1']
+
+        assert tessuto.legge('tavoli.liberi') == ['t1']
+        stats = cache.statistiche()
+        assert stats['ltm_count'] == 0
+        assert stats['stm_count'] <= 10
+
+    def test_derivato_none_non_ricalcolato(self):
+        tessuto = Tessuto(cache=BiocCache())
+        calcoli = []
+
+        @tessuto.derivato('cliente.1.sconto', dipende_da=[])
+        def _():
+            calcoli.append(1)
+            return None
+
+        for _i in range(5):
+            assert tessuto.legge('cliente.1.sconto') is None
+        assert len(calcoli) == 1
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -13,10 +13,14 @@ from .confronta import confronta
 from .valore import valore
 from .testo import testo
 from .flusso import flusso
+from .tabella import ElementoTabella
+from .storia import Storia
+from .pipeline import Pipeline
+from .classifica import TopK
 from .effetto import effetto, Effetto, TipoEffetto, RuntimeEffetti, RuntimeEffettiMock
 
 __all__ = [
     'elemento', 'contenitore', 'confronta', 'valore', 'testo',
-    'flusso',
+    'flusso', 'ElementoTabella', 'Storia', 'Pipeline', 'TopK',
     'effetto', 'Effetto', 'TipoEffetto', 'RuntimeEffetti', 'RuntimeEffettiMock'
 ]
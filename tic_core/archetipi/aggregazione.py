@@ -0,0 +1,213 @@
+"""
+AGGREGAZIONE — Raggruppa e aggrega in un solo passaggio
+
+Un report per stato che chiama query_ordini_per_stato per ogni stato
+scorre tutti gli ordini una volta per gruppo. aggrega legge ogni item
+una volta sola e calcola tutti gli aggregati di tutti i gruppi:
+
+    contenitore.aggrega(ordini, 'stato', {
+        'ordini': (None, 'conta'),
+        'incasso': ('totale', 'somma'),
+        'scontrino_medio': ('totale', 'media'),
+    })
+    → {'pagato': {'ordini': 120, 'incasso': 5400.0, 'scontrino_medio': 45.0}, ...}
+
+Riduttori: 'somma', 'conta', 'minimo', 'massimo', 'media' (anche come
+valore.somma, valore.minimo, ...) o una funzione sulla lista dei valori
+del gruppo. I gruppi sono nell'ordine di prima apparizione.
+
+Sorgenti colonnari (ElementoTabella, ArchivioMappato: hanno
+legge_colonna) si leggono per colonna invece che per item; con NumPy le
+colonne numeriche si riducono con bincount / ufunc.at. Come in
+vettoriale.py, le somme di float possono differire nell'ultima cifra.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Tuple, Union
+from collections import Counter
+
+from .ordinato import _funzione_chiave
+from .valore import valore
+from . import vettoriale
+from .vettoriale import np
+
+Riduttore = Union[str, Callable[[List[Any]], Any]]
+
+_NOMI: Dict[Callable, str] = {
+    valore.somma: 'somma',
+    valore.minimo: 'minimo',
+    valore.massimo: 'massimo',
+    valore.media: 'media',
+    len: 'conta',
+}
+
+_RIDUTTORI: Dict[str, Callable[[List[Any]], Any]] = {
+    'somma': valore.somma,
+    'conta': len,
+    'minimo': valore.minimo,
+    'massimo': valore.massimo,
+    'media': valore.media,
+}
+
+
+def raggruppa(cont: Iterable[Any],
+              chiave: Union[str, Callable[[Any], Any]]) -> Dict[Any, List[Any]]:
+    """
+    Item per valore di chiave (campo o funzione), in un passaggio.
+
+    >>> raggruppa([{'s': 'a', 'n': 1}, {'s': 'b', 'n': 2}, {'s': 'a', 'n': 3}], 's')
+    {'a': [{'s': 'a', 'n': 1}, {'s': 'a', 'n': 3}], 'b': [{'s': 'b', 'n': 2}]}
+    """
+    funzione = _funzione_chiave(chiave)
+    gruppi: Dict[Any, List[Any]] = {}
+    for item in cont:
+        g = funzione(item)
+        lista = gruppi.get(g)
+        if lista is None:
+            gruppi[g] = [item]
+        else:
+            lista.append(item)
+    return gruppi
+
+
+def _piano(aggregati: Mapping[str, Tuple[Any, Riduttore]]) -> List[Tuple[str, Any, str, Callable]]:
+    """(nome, campo, nome del riduttore o '', funzione) per ogni aggregato."""
+    piano = []
+    for nome, (campo, riduttore) in aggregati.items():
+        if isinstance(riduttore, str):
+            if riduttore not in _RIDUTTORI:
+                raise ValueError(
+                    f"Riduttore sconosciuto '{riduttore}' (ammessi: {', '.join(_RIDUTTORI)})")
+            noto, riduttore = riduttore, _RIDUTTORI[riduttore]
+        else:
+            try:
+                noto = _NOMI.get(riduttore, '')
+            except TypeError:  # callable non hashable
+                noto = ''
+        if campo is None and noto != 'conta':
+            raise ValueError(f"Aggregato '{nome}': campo None solo con il riduttore 'conta'")
+        piano.append((nome, campo, noto, riduttore))
+    return piano
+
+
+def aggrega(cont: Iterable[Any], chiave: Union[str, Callable[[Any], Any]],
+            aggregati: Mapping[str, Tuple[Any, Riduttore]]) -> Dict[Any, Dict[str, Any]]:
+    """
+    {gruppo: {nome: valore}} per ogni aggregato {nome: (campo, riduttore)}.
+    Il campo può essere None solo per 'conta' (ValueError altrimenti).
+
+    >>> ordini = [{'s': 'a', 't': 10}, {'s': 'b', 't': 5}, {'s': 'a', 't': 20}]
+    >>> aggrega(ordini, 's', {'n': (None, 'conta'), 'tot': ('t', 'somma'), 'max': ('t', max)})
+    {'a': {'n': 2, 'tot': 30, 'max': 20}, 'b': {'n': 1, 'tot': 5, 'max': 5}}
+    """
+    piano = _piano(aggregati)
+    campi = list(dict.fromkeys(campo for _, campo, _, _ in piano if campo is not None))
+
+    if isinstance(chiave, str) and hasattr(cont, 'legge_colonna'):
+        # Sorgente colonnare: niente viste per riga
+        chiavi = _valori_python(cont.legge_colonna(chiave))  # gruppi int, non np.int64
+        colonne = [cont.legge_colonna(campo) for campo in campi]
+        risultato = _aggrega_vettoriale(chiavi, dict(zip(campi, colonne)), piano)
+        if risultato is not None:
+            return risultato
+        colonne = [_valori_python(colonna) for colonna in colonne]
+        righe = zip(chiavi, *colonne) if colonne else chiavi
+    else:
+        righe = _righe(cont, [_funzione_chiave(chiave)] + [_funzione_chiave(c) for c in campi])
+
+    posizione = {campo: i for i, campo in enumerate(campi, 1)}
+    risultato = {}
+    for g, (n, valori) in _valori_per_gruppo(righe, len(campi)).items():
+        riga = {}
+        for nome, campo, _, riduci in piano:
+            riga[nome] = n if campo is None else riduci(valori[posizione[campo]])
+        risultato[g] = riga
+    return risultato
+
+
+def _valori_python(colonna: Any) -> Any:
+    """Colonna ndarray / array / memoryview → lista di valori Python."""
+    return colonna.tolist() if hasattr(colonna, 'tolist') else colonna
+
+
+def _righe(cont: Iterable[Any], lettori: List[Callable[[Any], Any]]) -> Iterable[Tuple[Any, ...]]:
+    """(gruppo, valori...) per item; senza campi solo i gruppi."""
+    if len(lettori) == 1:
+        return map(lettori[0], cont)
+    if len(lettori) == 2:
+        leggi_gruppo, leggi_valore = lettori
+        return ((leggi_gruppo(item), leggi_valore(item)) for item in cont)
+    return ([leggi(item) for leggi in lettori] for item in cont)
+
+
+def _valori_per_gruppo(righe: Iterable[Tuple[Any, ...]],
+                       n_campi: int) -> Dict[Any, Tuple[int, List[List[Any]]]]:
+    """
+    Un passaggio su righe (gruppo, valore1, valore2, ...), o sui soli
+    gruppi se n_campi è 0: gruppo → (numero di righe, [None, valori1, ...]).
+    """
+    gruppi: Dict[Any, List[List[Any]]] = {}
+    if n_campi == 0:
+        conteggi = Counter(righe)
+        return {g: (n, [None]) for g, n in conteggi.items()}
+    if n_campi == 1:
+        for g, v in righe:
+            liste = gruppi.get(g)
+            if liste is None:
+                liste = gruppi[g] = [None, []]
+            liste[1].append(v)
+    else:
+        for riga in righe:
+            liste = gruppi.get(riga[0])
+            if liste is None:
+                liste = gruppi[riga[0]] = [None] + [[] for _ in range(n_campi)]
+            for j in range(1, n_campi + 1):
+                liste[j].append(riga[j])
+    return {g: (len(liste[1]), liste) for g, liste in gruppi.items()}
+
+
+# === Percorso vettoriale (sorgenti colonnari con NumPy) ===
+
+def _aggrega_vettoriale(chiavi: Any, colonne: Mapping[str, Any],
+                        piano: List[Tuple[str, Any, str, Callable]]) -> Any:
+    """Come aggrega con bincount / ufunc.at; None se non applicabile."""
+    if np is None or len(chiavi) < vettoriale.SOGLIA_VETTORIALE:
+        return None
+    if any(not noto for _, _, noto, _ in piano):
+        return None  # riduttore arbitrario: serve la lista dei valori
+    array = {}
+    for campo, colonna in colonne.items():
+        arr = vettoriale._come_array(colonna)
+        if arr is None:
+            return None
+        array[campo] = arr
+
+    # Codici di gruppo nell'ordine di prima apparizione
+    indice: Dict[Any, int] = {}
+    codici = np.fromiter((indice.setdefault(g, len(indice)) for g in chiavi),
+                         dtype=np.intp, count=len(chiavi))
+    n_gruppi = len(indice)
+    conteggi = np.bincount(codici, minlength=n_gruppi)
+
+    colonne_risultato = {}
+    for nome, campo, noto, _ in piano:
+        if noto == 'conta':
+            colonne_risultato[nome] = conteggi.tolist()
+            continue
+        arr = array[campo]
+        if noto in ('somma', 'media'):
+            if arr.dtype.kind in 'iu':
+                if not vettoriale._somma_entro_int64(arr):
+                    return None
+                somme = np.zeros(n_gruppi, dtype=np.int64)
+                np.add.at(somme, codici, arr)
+            else:
+                somme = np.bincount(codici, weights=arr, minlength=n_gruppi)
+            colonne_risultato[nome] = (somme if noto == 'somma' else somme / conteggi).tolist()
+        else:
+            ufunc = np.minimum if noto == 'minimo' else np.maximum
+            estremi = np.full(n_gruppi, arr[0], dtype=arr.dtype)
+            ufunc.at(estremi, codici, arr)
+            colonne_risultato[nome] = estremi.tolist()
+
+    return {g: {nome: colonne_risultato[nome][i] for nome, _, _, _ in piano}
+            for g, i in indice.items()}
@@ -0,0 +1,108 @@
+"""
+CLASSIFICA — I primi k item senza ordinare tutto
+
+"I 10 prodotti più cari" come contenitore.ordina + slice costa
+O(n log n) e alloca una copia ordinata di tutto il catalogo.
+primi_k tiene solo un heap di k item: O(n log k) tempo, O(k) memoria,
+e accetta anche iteratori (righe lette da file, una Pipeline).
+
+    contenitore.primi_k(prodotti, 10, chiave='prezzo', inverso=True)
+
+TopK è lo stesso calcolo come accumulatore, per flussi che arrivano
+un item alla volta:
+
+    top = TopK(10, chiave='prezzo', inverso=True)
+    for evento in flusso_ordini:
+        top.aggiunge(evento)
+    top.risultato()
+
+Il risultato è identico a ordina(...)[:k], anche a parità di chiave
+(a pari merito vince l'item arrivato prima). Su un contenitore ordinato
+per la stessa chiave si leggono i k item dalle estremità, come fa
+contenitore.ordina.
+"""
+
+from typing import Any, Callable, Iterable, List, Union
+from heapq import nlargest, nsmallest
+from itertools import chain, islice
+
+from .ordinato import ContenitoreOrdinato, _funzione_chiave
+
+# Item accumulati da TopK prima di ridurre il buffer ai primi k
+_BUFFER_MINIMO = 1024
+
+
+def primi_k(cont: Iterable[Any], k: int, chiave: Union[str, Callable[[Any], Any]] = None,
+            inverso: bool = False) -> List[Any]:
+    """
+    I primi k item secondo chiave (campo o funzione), in ordine.
+    inverso=True: i k più grandi.
+
+    >>> primi_k([5, 1, 4, 2, 3], 2)
+    [1, 2]
+    >>> primi_k([{'p': 5}, {'p': 9}, {'p': 7}], 2, chiave='p', inverso=True)
+    [{'p': 9}, {'p': 7}]
+    """
+    if k <= 0:
+        return []
+    if type(cont) is ContenitoreOrdinato and chiave in (None, cont.chiave):
+        # Già in ordine: k letture dalle estremità
+        return list(islice(cont.decrescente() if inverso else iter(cont), k))
+    funzione = None if chiave is None else _funzione_chiave(chiave)
+    if inverso:
+        return nlargest(k, cont, key=funzione)
+    return nsmallest(k, cont, key=funzione)
+
+
+class TopK:
+    """
+    Accumulatore dei primi k item di un flusso.
+
+    Gli item entrano in un buffer; quando supera max(2k, 1024) item
+    viene ridotto ai primi k (heap). La memoria resta O(k) e il costo
+    per item O(log k) ammortizzato.
+
+    >>> top = TopK(3, inverso=True)
+    >>> for x in [4, 8, 1, 9, 3, 7]:
+    ...     top.aggiunge(x)
+    >>> top.risultato()
+    [9, 8, 7]
+    """
+
+    __slots__ = ('k', 'chiave', 'inverso', '_funzione', '_buffer', '_soglia')
+
+    def __init__(self, k: int, chiave: Union[str, Callable[[Any], Any]] = None,
+                 inverso: bool = False):
+        if k < 0:
+            raise ValueError('k deve essere >= 0')
+        self.k = k
+        self.chiave = chiave
+        self.inverso = inverso
+        self._funzione = None if chiave is None else _funzione_chiave(chiave)
+        self._buffer: List[Any] = []
+        self._soglia = max(2 * k, _BUFFER_MINIMO)
+
+    def _riduce(self, items: Iterable[Any]) -> List[Any]:
+        if self.inverso:
+            return nlargest(self.k, items, key=self._funzione)
+        return nsmallest(self.k, items, key=self._funzione)
+
+    def aggiunge(self, item: Any) -> None:
+        """Considera un item."""
+        self._buffer.append(item)
+        if len(self._buffer) >= self._soglia:
+            self._buffer = self._riduce(self._buffer)
+
+    def estende(self, items: Iterable[Any]) -> 'TopK':
+        """Considera tutti gli item di un iterabile (un solo passaggio, heap di k)."""
+        self._buffer = self._riduce(chain(self._buffer, items))
+        return self
+
+    def risultato(self) -> List[Any]:
+        """I primi k item visti finora, in ordine."""
+        self._buffer = self._riduce(self._buffer)
+        return list(self._buffer)
+
+    def __repr__(self) -> str:
+        return f'TopK(k={self.k}, chiave={self.chiave!r}, inverso={self.inverso})'
+
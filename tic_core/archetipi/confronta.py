@@ -9,6 +9,7 @@ confronta.minore    → a < b
 confronta.almeno    → a >= b
 confronta.alpiù     → a <= b
 confronta.tra       → min <= a <= max
+confronta.campo_uguale → elemento.legge(el, campo) == valore
 confronta.nullo     → a is None
 confronta.vero      → bool(a) is True
 confronta.falso     → bool(a) is False
@@ -16,6 +17,8 @@ confronta.falso     → bool(a) is False
 
 from typing import Any, Callable
 
+from .elemento import elemento
+
 
 class _ConfrontaArchetipo:
     """
@@ -107,6 +110,20 @@ class _ConfrontaArchetipo:
         """
         return minimo <= valore <= massimo
 
+    @staticmethod
+    def campo_uguale(el: Any, campo: str, valore: Any) -> bool:
+        """
+        confronta.campo_uguale → elemento.legge(el, campo) == valore
+
+        Come partial(confronta.campo_uguale, campo=..., valore=...) è un
+        predicato che contenitore.trova risolve con l'indice di un
+        contenitore indicizzato su campo, invece di scorrere tutti gli item.
+
+        >>> confronta.campo_uguale({'sku': 'A1'}, 'sku', 'A1')
+        True
+        """
+        return elemento.legge(el, campo) == valore
+
     @staticmethod
     def nullo(a: Any) -> bool:
         """
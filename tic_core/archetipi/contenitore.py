@@ -2,20 +2,63 @@
 ARCHETIPO: contenitore
 Operazioni su collezioni/liste/insiemi.
 
-contenitore.crea     → crea un contenitore vuoto
+contenitore.crea     → crea un contenitore (VettorePersistente)
 contenitore.aggiunge → aggiunge elemento
 contenitore.rimuove  → rimuove elemento
+contenitore.rimuove_a → rimuove a indice
+contenitore.sostituisce_a → sostituisce a indice
 contenitore.filtra   → filtra con predicato
 contenitore.mappa    → trasforma ogni elemento
 contenitore.riduce   → riduce a singolo valore
+contenitore.trova    → primo che soddisfa predicato
+contenitore.trova_indice → posizione del primo che soddisfa predicato
+contenitore.indicizzato → contenitore con indici hash sui campi (indicizzato.py)
+contenitore.ordinato → contenitore sempre ordinato per chiave (ordinato.py)
+contenitore.tra      → item con chiave tra minimo e massimo
+contenitore.primi_k  → i primi k per chiave, heap invece di sort (classifica.py)
+contenitore.raggruppa → item per gruppo, in un passaggio (aggregazione.py)
+contenitore.aggrega  → somme/conteggi/min/max/medie per gruppo, in un passaggio
+contenitore.unisci_per → hash join tra due contenitori (unione.py)
+contenitore.finestra → finestre scorrevoli con somma/min/max incrementali (finestra.py)
+contenitore.partiziona → (veri, falsi) in un passaggio
 contenitore.conta    → conta elementi
 contenitore.primo    → primo elemento
 contenitore.ultimo   → ultimo elemento
 contenitore.vuoto    → verifica se vuoto
+contenitore.pipeline → passaggi pigri fusi in un solo ciclo (Pipeline)
+contenitore.mappa_parallelo  → mappa su più processi (parallelo.py)
+contenitore.filtra_parallelo → filtra su più processi
+
+I contenitori sono VettorePersistente: aggiungere, sostituire e togliere
+l'ultimo costano O(log32 n) e condividono il resto della struttura,
+invece di una deepcopy di tutta la lista. Le list normali sono accettate
+in ingresso; gli item inseriti sono congelati come nei campi di un elemento.
+crea, aggiunge, rimuove, rimuove_a e sostituisce_a ritornano quindi un
+VettorePersistente, non una list (filtra, mappa e ordina ritornano list):
+è uguale a list e tuple con gli stessi item, ma isinstance(c, list) è
+falso e json.dumps vuole default=list. list(c) dà una copia come list.
+
+mappa/filtra/riduce con una primitiva pura (valore.*, confronta.*, anche
+via functools.partial) su dati numerici usano un kernel vettoriale
+(NumPy se installato, altrimenti operator in C): vedi vettoriale.py.
+
+trova/trova_indice con partial(confronta.campo_uguale, campo=..., valore=...)
+su un contenitore indicizzato su quel campo leggono l'indice in O(1).
+Su un contenitore ordinato tra usa bisect e ordina non riordina;
+aggiunge/rimuove lo mantengono ordinato.
 """
 
-from typing import Any, Callable, Iterable, List, Optional, TypeVar
-from copy import deepcopy
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar
+
+from .persistente import VettorePersistente, VETTORE_VUOTO, congela
+from .indicizzato import ContenitoreIndicizzato, posizioni_per
+from .ordinato import ContenitoreOrdinato, _funzione_chiave
+from .classifica import primi_k
+from .aggregazione import aggrega, raggruppa
+from .unione import unisci_per
+from .finestra import finestra, partiziona
+from .pipeline import Pipeline
+from . import parallelo, vettoriale
 
 T = TypeVar('T')
 R = TypeVar('R')
@@ -28,59 +71,119 @@ class _ContenitoreArchetipo:
     """
 
     @staticmethod
-    def crea(elementi: Iterable[T] = None) -> List[T]:
+    def crea(elementi: Iterable[T] = None) -> VettorePersistente:
         """
         contenitore.crea → crea un contenitore
 
         >>> c = contenitore.crea([1, 2, 3])
         >>> contenitore.conta(c)
         3
+        >>> c == [1, 2, 3]
+        True
         """
         if elementi is None:
-            return []
-        return list(elementi)
+            return VETTORE_VUOTO
+        return VettorePersistente(map(congela, elementi))
 
     @staticmethod
-    def aggiunge(cont: List[T], elem: T) -> List[T]:
+    def indicizzato(elementi: Iterable[T] = None,
+                    chiavi: Sequence[str] = ('id',)) -> ContenitoreIndicizzato:
         """
-        contenitore.aggiunge → aggiunge elemento (immutabile)
+        contenitore.indicizzato → contenitore con indici hash su chiavi
+
+        aggiunge/rimuove/sostituisce_a mantengono gli indici; trova con
+        campo_uguale su una chiave diventa una lettura O(1).
+
+        >>> from functools import partial
+        >>> from tic_core.archetipi import confronta
+        >>> c = contenitore.indicizzato([{'sku': 'A', 'qty': 1}, {'sku': 'B', 'qty': 2}],
+        ...                             chiavi=['sku'])
+        >>> c = contenitore.aggiunge(c, {'sku': 'C', 'qty': 3})
+        >>> contenitore.trova(c, partial(confronta.campo_uguale, campo='sku', valore='C'))
+        {'sku': 'C', 'qty': 3}
+        """
+        if isinstance(elementi, ContenitoreIndicizzato) and elementi.chiavi == tuple(chiavi):
+            return elementi
+        return ContenitoreIndicizzato(map(congela, elementi or ()), chiavi)
+
+    @staticmethod
+    def ordinato(elementi: Iterable[T] = None, chiave: Any = None) -> ContenitoreOrdinato:
+        """
+        contenitore.ordinato → contenitore ordinato per chiave (campo o funzione)
+
+        Inserire e togliere costano O(log n) ricerche più la copia di
+        un blocco; tra, rango e percentile usano bisect.
+
+        >>> c = contenitore.ordinato([{'p': 30}, {'p': 10}, {'p': 20}], chiave='p')
+        >>> c = contenitore.aggiunge(c, {'p': 15})
+        >>> contenitore.tra(c, 12, 25)
+        [{'p': 15}, {'p': 20}]
+        >>> c.rango(20), c.percentile(50)
+        (2, {'p': 15})
+        """
+        if isinstance(elementi, ContenitoreOrdinato) and elementi.chiave == chiave:
+            return elementi
+        return ContenitoreOrdinato(map(congela, elementi or ()), chiave)
+
+    @staticmethod
+    def aggiunge(cont: Sequence[T], elem: T) -> VettorePersistente:
+        """
+        contenitore.aggiunge → aggiunge elemento (immutabile, O(log32 n))
 
         >>> c = contenitore.crea([1, 2])
         >>> c2 = contenitore.aggiunge(c, 3)
         >>> c2
-        [1, 2, 3]
+        VettorePersistente([1, 2, 3])
         """
-        nuovo = deepcopy(cont)
-        nuovo.append(elem)
-        return nuovo
+        if type(cont) is ContenitoreOrdinato:
+            return cont.aggiunge(congela(elem))
+        return _vettore(cont).aggiunge(congela(elem))
 
     @staticmethod
-    def rimuove(cont: List[T], elem: T) -> List[T]:
+    def rimuove(cont: Sequence[T], elem: T) -> VettorePersistente:
         """
         contenitore.rimuove → rimuove prima occorrenza (immutabile)
 
         >>> c = contenitore.crea([1, 2, 3])
-        >>> contenitore.rimuove(c, 2)
+        >>> list(contenitore.rimuove(c, 2))
         [1, 3]
         """
-        nuovo = deepcopy(cont)
-        if elem in nuovo:
-            nuovo.remove(elem)
-        return nuovo
+        if type(cont) is ContenitoreOrdinato:
+            return cont.rimuove(elem)
+        vettore = _vettore(cont)
+        for i, e in enumerate(vettore):
+            if e is elem or e == elem:
+                return vettore.rimuove_a(i)
+        return vettore
 
     @staticmethod
-    def rimuove_a(cont: List[T], indice: int) -> List[T]:
+    def rimuove_a(cont: Sequence[T], indice: int) -> VettorePersistente:
         """
-        contenitore.rimuove_a → rimuove a indice (immutabile)
+        contenitore.rimuove_a → rimuove a indice (immutabile, O(log32 n) per l'ultimo)
 
         >>> c = contenitore.crea(['a', 'b', 'c'])
-        >>> contenitore.rimuove_a(c, 1)
+        >>> list(contenitore.rimuove_a(c, 1))
         ['a', 'c']
         """
-        nuovo = deepcopy(cont)
-        if 0 <= indice < len(nuovo):
-            nuovo.pop(indice)
-        return nuovo
+        vettore = cont if type(cont) is ContenitoreOrdinato else _vettore(cont)
+        if 0 <= indice < len(vettore):
+            return vettore.rimuove_a(indice)
+        return vettore
+
+    @staticmethod
+    def sostituisce_a(cont: Sequence[T], indice: int, elem: T) -> VettorePersistente:
+        """
+        contenitore.sostituisce_a → sostituisce a indice (immutabile, O(log32 n))
+
+        >>> c = contenitore.crea(['a', 'b', 'c'])
+        >>> list(contenitore.sostituisce_a(c, 1, 'B'))
+        ['a', 'B', 'c']
+
+        Su un contenitore ordinato il nuovo item va al posto della sua chiave.
+        """
+        if type(cont) is ContenitoreOrdinato:
+            return cont.rimuove_a(indice).aggiunge(congela(elem))
+        return _vettore(cont).imposta(indice, congela(elem))
 
     @staticmethod
     def filtra(cont: List[T], predicato: Callable[[T], bool]) -> List[T]:
@@ -90,7 +193,14 @@ class _ContenitoreArchetipo:
         >>> c = contenitore.crea([1, 2, 3, 4, 5])
         >>> contenitore.filtra(c, lambda x: x > 2)
         [3, 4, 5]
+        >>> from functools import partial
+        >>> from tic_core.archetipi import confronta
+        >>> contenitore.filtra(c, partial(confronta.maggiore, b=2))
+        [3, 4, 5]
         """
+        risultato = vettoriale.filtra(cont, predicato)
+        if risultato is not None:
+            return risultato
         return [e for e in cont if predicato(e)]
 
     @staticmethod
@@ -101,9 +211,43 @@ class _ContenitoreArchetipo:
         >>> c = contenitore.crea([1, 2, 3])
         >>> contenitore.mappa(c, lambda x: x * 2)
         [2, 4, 6]
+        >>> from functools import partial
+        >>> from tic_core.archetipi import valore
+        >>> contenitore.mappa(c, partial(valore.moltiplica, fattore=2))
+        [2, 4, 6]
         """
+        risultato = vettoriale.mappa(cont, funzione)
+        if risultato is not None:
+            return risultato
         return [funzione(e) for e in cont]
 
+    @staticmethod
+    def mappa_parallelo(cont: Sequence[T], funzione: Callable[[T], R],
+                        processi: int = None, blocco: int = None) -> List[R]:
+        """
+        contenitore.mappa_parallelo → mappa su un pool di processi, stesso ordine
+
+        Per celle pure e CPU-bound, a livello di modulo (lambda e funzioni
+        locali solo se registrate con parallelo.registra_cella). Input
+        piccoli o funzioni economiche restano in serie (stima del costo
+        sui primi item).
+
+        >>> contenitore.mappa_parallelo([1, 2, 3], abs)
+        [1, 2, 3]
+        """
+        return parallelo.mappa_parallelo(cont, funzione, processi, blocco)
+
+    @staticmethod
+    def filtra_parallelo(cont: Sequence[T], predicato: Callable[[T], bool],
+                         processi: int = None, blocco: int = None) -> List[T]:
+        """
+        contenitore.filtra_parallelo → filtra su un pool di processi, stesso ordine
+
+        >>> contenitore.filtra_parallelo([1, -2, 3], lambda x: x > 0)
+        [1, 3]
+        """
+        return parallelo.filtra_parallelo(cont, predicato, processi, blocco)
+
     @staticmethod
     def riduce(cont: List[T], funzione: Callable[[R, T], R], iniziale: R) -> R:
         """
@@ -112,7 +256,13 @@ class _ContenitoreArchetipo:
         >>> c = contenitore.crea([1, 2, 3, 4])
         >>> contenitore.riduce(c, lambda acc, x: acc + x, 0)
         10
+        >>> from tic_core.archetipi import valore
+        >>> contenitore.riduce(c, valore.incrementa, 0)
+        10
         """
+        risultato = vettoriale.riduce(cont, funzione, iniziale)
+        if risultato is not None:
+            return risultato
         acc = iniziale
         for e in cont:
             acc = funzione(acc, e)
@@ -168,11 +318,30 @@ class _ContenitoreArchetipo:
         >>> contenitore.trova(c, lambda x: x > 2)
         3
         """
+        posizioni = posizioni_per(cont, predicato)
+        if posizioni is not None:
+            return cont[posizioni[0]] if posizioni else None
         for e in cont:
             if predicato(e):
                 return e
         return None
 
+    @staticmethod
+    def trova_indice(cont: List[T], predicato: Callable[[T], bool]) -> Optional[int]:
+        """
+        contenitore.trova_indice → posizione del primo che soddisfa predicato, o None
+
+        >>> contenitore.trova_indice(['a', 'b', 'c'], lambda x: x == 'b')
+        1
+        """
+        posizioni = posizioni_per(cont, predicato)
+        if posizioni is not None:
+            return posizioni[0] if posizioni else None
+        for i, e in enumerate(cont):
+            if predicato(e):
+                return i
+        return None
+
     @staticmethod
     def contiene(cont: List[T], elem: T) -> bool:
         """
@@ -184,9 +353,116 @@ class _ContenitoreArchetipo:
     def ordina(cont: List[T], chiave: Callable[[T], Any] = None, inverso: bool = False) -> List[T]:
         """
         contenitore.ordina → ordina (immutabile)
+
+        Un contenitore ordinato senza chiave diversa è già in ordine: nessun sort.
         """
+        if type(cont) is ContenitoreOrdinato and chiave is None:
+            return list(cont.decrescente()) if inverso else list(cont)
         return sorted(cont, key=chiave, reverse=inverso)
 
+    @staticmethod
+    def primi_k(cont: Iterable[T], k: int, chiave: Any = None, inverso: bool = False) -> List[T]:
+        """
+        contenitore.primi_k → come ordina(cont, chiave, inverso)[:k], in O(n log k)
+
+        chiave: campo o funzione. Memoria O(k): cont può essere un iteratore.
+
+        >>> contenitore.primi_k([{'p': 5}, {'p': 9}, {'p': 7}], 2, chiave='p', inverso=True)
+        [{'p': 9}, {'p': 7}]
+        """
+        return primi_k(cont, k, chiave, inverso)
+
+    @staticmethod
+    def raggruppa(cont: Iterable[T], chiave: Any) -> Dict[Any, List[T]]:
+        """
+        contenitore.raggruppa → {valore di chiave: [item]} (chiave: campo o funzione)
+
+        >>> contenitore.raggruppa([1, 2, 3, 4], lambda x: x % 2)
+        {1: [1, 3], 0: [2, 4]}
+        """
+        return raggruppa(cont, chiave)
+
+    @staticmethod
+    def aggrega(cont: Iterable[T], chiave: Any,
+                aggregati: Dict[str, tuple]) -> Dict[Any, Dict[str, Any]]:
+        """
+        contenitore.aggrega → {gruppo: {nome: valore}} per {nome: (campo, riduttore)}
+
+        Un solo passaggio per tutti i gruppi e gli aggregati. Riduttori:
+        'somma', 'conta', 'minimo', 'massimo', 'media' o una funzione sulla
+        lista dei valori. Su sorgenti colonnari con NumPy: bincount.
+
+        >>> ordini = [{'stato': 'pagato', 'totale': 10}, {'stato': 'nuovo', 'totale': 4},
+        ...           {'stato': 'pagato', 'totale': 30}]
+        >>> contenitore.aggrega(ordini, 'stato',
+        ...                     {'n': (None, 'conta'), 'medio': ('totale', 'media')})
+        {'pagato': {'n': 2, 'medio': 20.0}, 'nuovo': {'n': 1, 'medio': 4.0}}
+        """
+        return aggrega(cont, chiave, aggregati)
+
+    @staticmethod
+    def unisci_per(sx: Iterable[T], dx: Iterable[R], chiave_sx: Any, chiave_dx: Any = None,
+                   tipo: str = 'inner', flusso: bool = False) -> List[tuple]:
+        """
+        contenitore.unisci_per → coppie (sx, dx) con chiavi uguali, hash join O(sx + dx)
+
+        tipo: 'inner' (solo abbinati) o 'left' (tutti gli sx, dx None se manca).
+        flusso=True: generatore che sonda con sx un item alla volta.
+        Un dx indicizzato sulla chiave usa il proprio indice.
+
+        >>> items = [{'prodotto_sku': 'A', 'qty': 2}]
+        >>> prodotti = contenitore.indicizzato([{'sku': 'A', 'prezzo': 5}], chiavi=['sku'])
+        >>> contenitore.unisci_per(items, prodotti, 'prodotto_sku', 'sku')
+        [({'prodotto_sku': 'A', 'qty': 2}, {'sku': 'A', 'prezzo': 5})]
+        """
+        return unisci_per(sx, dx, chiave_sx, chiave_dx, tipo, flusso)
+
+    @staticmethod
+    def finestra(cont: Iterable[T], ampiezza: int, passo: int = 1, aggregato: Any = None,
+                 chiave: Any = None) -> Iterator[Any]:
+        """
+        contenitore.finestra → finestre scorrevoli (iteratore pigro)
+
+        aggregato: 'somma', 'media', 'minimo', 'massimo' (o una sequenza:
+        un dict per finestra), aggiornato in O(1) ammortizzato per item.
+        Senza aggregato, le finestre come tuple.
+
+        >>> list(contenitore.finestra([3, 1, 4, 1, 5], 3, aggregato='somma'))
+        [8, 6, 10]
+        """
+        return finestra(cont, ampiezza, passo, aggregato, chiave)
+
+    @staticmethod
+    def partiziona(cont: Iterable[T], predicato: Callable[[T], bool]) -> Tuple[Any, Any]:
+        """
+        contenitore.partiziona → (veri, falsi), predicato chiamato una volta per item
+
+        Liste per le sequenze, iteratori pigri per gli iteratori.
+
+        >>> contenitore.partiziona([1, 5, 2, 8], lambda x: x > 3)
+        ([5, 8], [1, 2])
+        """
+        return partiziona(cont, predicato)
+
+    @staticmethod
+    def tra(cont: List[T], minimo: Any, massimo: Any, chiave: Any = None) -> List[T]:
+        """
+        contenitore.tra → item con minimo <= chiave <= massimo
+
+        chiave: campo o funzione (default: la chiave del contenitore
+        ordinato, o l'item stesso). Su un contenitore ordinato con la
+        stessa chiave è una ricerca bisect, altrimenti una scansione.
+
+        >>> contenitore.tra([5, 1, 3], 2, 5)
+        [5, 3]
+        """
+        if type(cont) is ContenitoreOrdinato and chiave in (None, cont.chiave):
+            return cont.tra(minimo, massimo)
+        if chiave is None:
+            return [e for e in cont if minimo <= e <= massimo]
+        chiave = _funzione_chiave(chiave)
+        return [e for e in cont if minimo <= chiave(e) <= massimo]
+
     @staticmethod
     def unisce(cont1: List[T], cont2: List[T]) -> List[T]:
         """
@@ -194,6 +470,23 @@ class _ContenitoreArchetipo:
         """
         return cont1 + cont2
 
+    @staticmethod
+    def pipeline(cont: Iterable[T]) -> Pipeline:
+        """
+        contenitore.pipeline → passaggi pigri, eseguiti in un solo ciclo al terminale
+
+        Nessuna lista intermedia tra filtra/mappa/...: la sorgente può
+        essere anche un generatore (es. righe lette da file).
+
+        >>> c = contenitore.crea([1, 2, 3, 4, 5])
+        >>> p = contenitore.pipeline(c).filtra(lambda x: x > 2).mappa(lambda x: x * 2)
+        >>> p.riduce(lambda a, x: a + x, 0)
+        24
+        >>> contenitore.pipeline(c).filtra(lambda x: x > 2).conta()
+        3
+        """
+        return Pipeline(cont)
+
     @staticmethod
     def piatto(cont: List[List[T]]) -> List[T]:
         """
@@ -205,6 +498,13 @@ class _ContenitoreArchetipo:
         return [e for lista in cont for e in lista]
 
 
+def _vettore(cont: Sequence[T]) -> VettorePersistente:
+    """Le list in ingresso diventano vettori (una copia, poi condivisione)."""
+    if isinstance(cont, VettorePersistente):  # anche indicizzati: mantengono gli indici
+        return cont
+    return VettorePersistente(map(congela, cont))
+
+
 # Istanza singleton per uso come namespace
 contenitore = _ContenitoreArchetipo()
 
@@ -3,32 +3,265 @@ ARCHETIPO: elemento
 Operazioni su singoli elementi/entità.
 
 elemento.crea     → crea un nuovo elemento
-elemento.legge    → legge un attributo
+elemento.crea_molti → crea molti elementi da righe (metadata condivisi)
+elemento.da_colonne → crea molti elementi da colonne {campo: valori}
+elemento.crea_a_blocchi → come crea_molti, a blocchi da un iteratore
+elemento.legge    → legge un attributo (anche percorsi: 'prenotazione.nome')
+elemento.accessore → getter compilato e in cache per un percorso puntato
 elemento.scrive   → scrive un attributo
+elemento.modifica → scrive più attributi (una copia, un timestamp)
+elemento.sessione → sessione di modifica transiente
 elemento.esiste   → verifica esistenza
 elemento.elimina  → marca come eliminato
+elemento.impronta → hash strutturale (calcolato una volta, poi in cache)
+elemento.interna  → istanza canonica (hash-consing)
+elemento.schema   → tipo record compilato (__slots__)
+elemento.tabella  → elementi in forma colonnare (ElementoTabella)
+
+Immutabilità strutturale:
+  - i valori annidati (list, dict, set) sono congelati alla scrittura
+  - scrive/elimina non fanno deepcopy: i dati non modificati sono condivisi
+  - fino a SOGLIA_TRIE campi i dati sono un dict (copia in C, velocissima),
+    oltre diventano una MappaPersistente (HAMT, scrittura O(log32 n))
+
+Metadata (elemento.timbro):
+  - 'orologio' (default): time.time(), convertito in datetime solo in lettura
+  - 'tick': contatore intero monotono
+  - 'off': nessun timbro, tutti gli elementi condividono META_VUOTO
 """
 
-from typing import Any, Dict, Optional
-from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence,
+)
+from collections.abc import Mapping as _MappingABC
 from copy import deepcopy
+from itertools import count, islice
+from operator import itemgetter
+import time
+import weakref
+
+from .persistente import (
+    DizionarioCongelato, MappaPersistente, VettorePersistente, congela, _IMMUTABILI,
+)
+
+if TYPE_CHECKING:  # tabella importa elemento: solo per le annotazioni
+    from .tabella import ElementoTabella
+
+# Numero di campi oltre il quale _dati passa da dict a HAMT
+SOGLIA_TRIE = 256
+
+
+class Meta(tuple):
+    """
+    Metadata compatti e immutabili di un elemento: (creato, modificato, eliminato).
+
+    I timbri sono salvati grezzi (float, int o None): creato/modificato
+    convertono in datetime solo quando letti.
+    Supporta la lettura stile dict: meta.get('creato').
+    """
+
+    __slots__ = ()
+
+    _CHIAVI = ('creato', 'modificato', 'eliminato')
+
+    def __new__(cls, creato: Any = None, modificato: Any = None, eliminato: bool = False):
+        return _NUOVA_META(cls, (creato, modificato, eliminato))
+
+    _creato = property(itemgetter(0))
+    _modificato = property(itemgetter(1))
+    eliminato = property(itemgetter(2))
+
+    @property
+    def creato(self) -> Any:
+        return _leggi_timbro(self[0])
+
+    @property
+    def modificato(self) -> Any:
+        return _leggi_timbro(self[1])
+
+    def get(self, chiave: str, default: Any = None) -> Any:
+        if chiave in Meta._CHIAVI:
+            return getattr(self, chiave)
+        return default
+
+    def __repr__(self) -> str:
+        return (f'Meta(creato={self.creato!r}, modificato={self.modificato!r}, '
+                f'eliminato={self.eliminato!r})')
+
+    def __reduce__(self):
+        return (Meta, tuple(self))
+
+
+# Costruzione in C, senza passare da __new__
+_NUOVA_META = tuple.__new__
+
+# Default condivisi (nessun timbro)
+META_VUOTO = Meta()
+META_ELIMINATO = Meta(eliminato=True)
+
+
+def _leggi_timbro(timbro: Any) -> Any:
+    if type(timbro) is float:
+        from datetime import datetime
+        return datetime.fromtimestamp(timbro)
+    return timbro
+
+
+_TIMBRI: Dict[str, Optional[Callable[[], Any]]] = {
+    'orologio': time.time,
+    'tick': count(1).__next__,
+    'off': None,
+}
+_modo_timbro = 'orologio'
+_timbra: Optional[Callable[[], Any]] = time.time
+
+
+def _meta_nuovo() -> Meta:
+    if _timbra is None:
+        return META_VUOTO
+    t = _timbra()
+    return _NUOVA_META(Meta, (t, t, False))
+
+
+def _meta_modificato(meta: Meta) -> Meta:
+    if _timbra is None:
+        return meta
+    return _NUOVA_META(Meta, (meta[0], _timbra(), meta[2]))
+
+
+def _meta_eliminato(meta: Meta) -> Meta:
+    if _timbra is None:
+        return META_ELIMINATO if meta is META_VUOTO else _NUOVA_META(Meta, (meta[0], meta[1], True))
+    return _NUOVA_META(Meta, (meta[0], _timbra(), True))
+
+
+def _come_meta(meta: Any) -> Meta:
+    """Accetta anche il vecchio formato dict."""
+    if meta is None:
+        return META_VUOTO
+    if isinstance(meta, Meta):
+        return meta
+    return Meta(meta.get('creato'), meta.get('modificato'), meta.get('eliminato', False))
 
 
-@dataclass
 class Elemento:
-    """Wrapper per entità PTI con metadata."""
-    _dati: Dict[str, Any] = field(default_factory=dict)
-    _meta: Dict[str, Any] = field(default_factory=lambda: {
-        'creato': None,
-        'modificato': None,
-        'eliminato': False
-    })
+    """
+    Wrapper per entità PTI con metadata.
+
+    I sottotipi (record da schema, viste) ridefiniscono _legge,
+    _con_modifiche, _con_meta e _campi; _dati resta sempre un Mapping.
+    """
+
+    # _hash: impronta strutturale in cache (assente finché non calcolata)
+    __slots__ = ('_dati', '_meta', '_hash', '__weakref__')
+
+    def __init__(self, _dati: Mapping[str, Any] = None, _meta: Meta = None):
+        self._dati = {} if _dati is None else _dati
+        self._meta = _meta if type(_meta) is Meta else _come_meta(_meta)
 
     def __getitem__(self, key: str) -> Any:
-        return self._dati.get(key)
+        return self._legge(key, None)
 
     def __setitem__(self, key: str, value: Any) -> None:
-        self._dati[key] = value
+        # Copy-on-write: _dati può essere condiviso con altri elementi
+        _dimentica_impronta(self)
+        self._dati = _con_campo(self._dati, key, congela(value))
+
+    def __eq__(self, altro: Any) -> bool:
+        if self is altro:
+            return True
+        if not isinstance(altro, Elemento):
+            return NotImplemented
+        try:
+            if self._hash != altro._hash:
+                return False
+        except AttributeError:  # impronta non ancora calcolata
+            pass
+        return self._dati == altro._dati and self._meta == altro._meta
+
+    __hash__ = None  # mutabile via __setitem__: usa elemento.impronta
+
+    def __repr__(self) -> str:
+        return f'Elemento(_dati={dict(self._dati.items())!r}, _meta={self._meta!r})'
+
+    def __reduce__(self):
+        # Senza _hash: hash() delle stringhe cambia tra processi
+        return (Elemento, (self._dati, self._meta))
+
+    # --- Interfaccia per i sottotipi ---
+
+    def _legge(self, campo: str, default: Any) -> Any:
+        return self._dati.get(campo, default)
+
+    def _con_modifiche(self, modifiche: Mapping[str, Any], meta: Meta) -> 'Elemento':
+        """Nuovo elemento con modifiche (valori già congelati) e meta."""
+        return Elemento(_dati=_con_campi(self._dati, modifiche), _meta=meta)
+
+    def _con_meta(self, meta: Meta) -> 'Elemento':
+        """Nuovo elemento con gli stessi dati e meta diversi."""
+        return Elemento(_dati=self._dati, _meta=meta)
+
+    def _campi(self) -> list:
+        return list(self._dati.keys())
+
+
+def _prepara_dati(dati: Mapping[str, Any]) -> Mapping[str, Any]:
+    """Congela i valori e sceglie la rappresentazione (dict o HAMT)."""
+    if type(dati) is MappaPersistente:
+        return dati
+    if _IMMUTABILI.issuperset(map(type, dati.values())):
+        congelati = dict(dati)  # fast path: niente da congelare
+    else:
+        congelati = {k: congela(v) for k, v in dati.items()}
+    if len(congelati) > SOGLIA_TRIE:
+        return MappaPersistente(congelati)
+    return congelati
+
+
+def _con_campo(dati: Mapping[str, Any], campo: str, valore: Any) -> Mapping[str, Any]:
+    """Ritorna nuovi dati con campo → valore, condividendo il resto."""
+    if type(dati) is MappaPersistente:
+        return dati.associa(campo, valore)
+    nuovi = dict(dati)
+    nuovi[campo] = valore
+    if len(nuovi) > SOGLIA_TRIE:
+        return MappaPersistente(nuovi)
+    return nuovi
+
+
+def _con_campi(dati: Mapping[str, Any], modifiche: Mapping[str, Any]) -> Mapping[str, Any]:
+    """Come _con_campo, per più campi con una sola copia."""
+    if type(dati) is MappaPersistente:
+        return dati.aggiorna(modifiche)
+    nuovi = dict(dati)
+    nuovi.update(modifiche)
+    if len(nuovi) > SOGLIA_TRIE:
+        return MappaPersistente(nuovi)
+    return nuovi
+
+
+# === Impronta in cache e hash-consing ===
+
+_IMPOSTA_HASH = Elemento._hash.__set__
+_DIMENTICA_HASH = Elemento._hash.__delete__
+
+# Tabella degli interni: impronta → istanza canonica (riferimenti deboli)
+_INTERNATI: 'weakref.WeakValueDictionary[int, Elemento]' = weakref.WeakValueDictionary()
+
+
+def _dimentica_impronta(el: Elemento) -> None:
+    """Invalida l'impronta in cache (e l'eventuale interno) prima di una mutazione."""
+    try:
+        h = el._hash
+    except AttributeError:
+        return
+    if _INTERNATI.get(h) is el:
+        del _INTERNATI[h]
+    _DIMENTICA_HASH(el)
+
+
+def _strutturalmente_uguali(a: Elemento, b: Elemento) -> bool:
+    return a._meta.eliminato == b._meta.eliminato and a._dati == b._dati
 
 
 class _ElementoArchetipo:
@@ -38,59 +271,200 @@ class _ElementoArchetipo:
     """
 
     @staticmethod
-    def crea(dati: Dict[str, Any] = None) -> Elemento:
+    def crea(dati: Dict[str, Any] = None, schema: type = None) -> Elemento:
         """
         elemento.crea → crea un nuovo elemento
 
+        schema: tipo da elemento.schema (record con __slots__).
+                Campi fuori schema → elemento in forma dict.
+
         >>> e = elemento.crea({'nome': 'Mario', 'eta': 30})
         >>> elemento.legge(e, 'nome')
         'Mario'
         """
-        from datetime import datetime
-        el = Elemento(_dati=dati or {})
-        el._meta['creato'] = datetime.now()
-        el._meta['modificato'] = datetime.now()
-        return el
+        if schema is not None:
+            return schema.da_dati({k: congela(v) for k, v in (dati or {}).items()}, _meta_nuovo())
+        return Elemento(_prepara_dati(dati or {}), _meta_nuovo())
+
+    @staticmethod
+    def crea_molti(righe: Iterable[Mapping[str, Any]], schema: type = None,
+                   colonnare: bool = False) -> Any:
+        """
+        elemento.crea_molti → crea molti elementi in un passo
+
+        Tutti gli elementi condividono gli stessi metadata (un solo timbro).
+        colonnare=True ritorna un ElementoTabella invece di una lista
+        (le righe devono avere gli stessi campi, altrimenti ValueError).
+
+        >>> ps = elemento.crea_molti([{'sku': 'A', 'prezzo': 10}, {'sku': 'B', 'prezzo': 20}])
+        >>> [elemento.legge(p, 'sku') for p in ps]
+        ['A', 'B']
+        >>> elemento.crea_molti([{'x': 1}, {'x': 2}], colonnare=True).somma('x')
+        3
+        """
+        meta = _meta_nuovo()
+        if colonnare:
+            return _tabella(_colonne_da_righe(righe), meta)
+        return _crea_molti(righe, schema, meta)
+
+    @staticmethod
+    def da_colonne(colonne: Mapping[str, Sequence[Any]], schema: type = None,
+                   colonnare: bool = False) -> Any:
+        """
+        elemento.da_colonne → crea molti elementi da {campo: valori}
+
+        I valori si controllano (e congelano) una colonna alla volta.
+        Accetta liste, tuple, array.array e array NumPy.
+
+        >>> ps = elemento.da_colonne({'sku': ['A', 'B'], 'prezzo': [10, 20]})
+        >>> elemento.legge(ps[1], 'prezzo')
+        20
+        """
+        meta = _meta_nuovo()
+        if colonnare:
+            return _tabella(colonne, meta)
+        campi = list(colonne)
+        valori = [_congela_colonna(colonne[c]) for c in campi]
+        lunghezze = set(map(len, valori))
+        if len(lunghezze) > 1:
+            raise ValueError(f"Colonne di lunghezza diversa: {sorted(lunghezze)}")
+        if schema is not None and all(c in schema._setter for c in campi):
+            return _record(schema, [schema._setter[c] for c in campi], zip(*valori), meta)
+        return _elementi((dict(zip(campi, riga)) for riga in zip(*valori)), meta)
+
+    @staticmethod
+    def crea_a_blocchi(righe: Iterable[Mapping[str, Any]], blocco: int = 10000,
+                       schema: type = None, colonnare: bool = False) -> Iterator[Any]:
+        """
+        elemento.crea_a_blocchi → crea_molti su un iteratore, un blocco alla volta
+
+        Per import da file (CSV, JSON lines): in memoria resta al più
+        un blocco di righe grezze.
+
+        >>> blocchi = elemento.crea_a_blocchi(({'n': i} for i in range(5)), blocco=2)
+        >>> [len(b) for b in blocchi]
+        [2, 2, 1]
+        """
+        if blocco < 1:
+            raise ValueError("blocco deve essere almeno 1")
+        righe = iter(righe)
+        while True:
+            parte = list(islice(righe, blocco))
+            if not parte:
+                return
+            yield elemento.crea_molti(parte, schema=schema, colonnare=colonnare)
 
     @staticmethod
     def legge(el: Elemento, campo: str, default: Any = None) -> Any:
         """
         elemento.legge → legge un attributo
 
+        Un campo con '.' assente come chiave diretta è un percorso:
+        elemento.legge(tavolo, 'prenotazione.nome').
+
         >>> e = elemento.crea({'x': 10})
         >>> elemento.legge(e, 'x')
         10
         >>> elemento.legge(e, 'y', 0)
         0
+        >>> elemento.legge(elemento.crea({'p': {'nome': 'Mario'}}), 'p.nome')
+        'Mario'
         """
-        if isinstance(el, Elemento):
-            return el._dati.get(campo, default)
+        if type(el) is Elemento:
+            v = el._dati.get(campo, _MANCANTE)
+        elif isinstance(el, Elemento):
+            v = el._legge(campo, _MANCANTE)
         elif isinstance(el, dict):
-            return el.get(campo, default)
+            v = el.get(campo, _MANCANTE)
         else:
-            return getattr(el, campo, default)
+            v = getattr(el, campo, _MANCANTE)
+        if v is _MANCANTE:
+            if type(campo) is str and '.' in campo:
+                return _accessore(campo)(el, default)
+            return default
+        return v
+
+    @staticmethod
+    def accessore(percorso: str) -> Callable[..., Any]:
+        """
+        elemento.accessore → getter compilato per un percorso puntato
+
+        Il percorso è analizzato una volta sola e l'accessore è in cache:
+        usabile direttamente in contenitore.mappa/filtra/ordina.
+        Segmenti numerici indicizzano liste e tuple ('items.0.sku').
+
+        >>> nome = elemento.accessore('prenotazione.nome')
+        >>> nome(elemento.crea({'prenotazione': {'nome': 'Mario'}}))
+        'Mario'
+        >>> nome(elemento.crea({'prenotazione': None}), '-')
+        '-'
+        """
+        return _accessore(percorso)
 
     @staticmethod
     def scrive(el: Elemento, campo: str, valore: Any) -> Elemento:
         """
         elemento.scrive → scrive un attributo (immutabile, ritorna copia)
 
+        Per Elemento non copia i dati: condivide tutto tranne il campo scritto.
+
         >>> e = elemento.crea({'x': 10})
         >>> e2 = elemento.scrive(e, 'x', 20)
         >>> elemento.legge(e2, 'x')
         20
         """
-        from datetime import datetime
+        if type(el) is Elemento:
+            return Elemento(_con_campo(el._dati, campo, congela(valore)),
+                            _meta_modificato(el._meta))
+        if isinstance(el, Elemento):
+            return el._con_modifiche({campo: congela(valore)}, _meta_modificato(el._meta))
         nuovo = deepcopy(el)
-        if isinstance(nuovo, Elemento):
-            nuovo._dati[campo] = valore
-            nuovo._meta['modificato'] = datetime.now()
-        elif isinstance(nuovo, dict):
+        if isinstance(nuovo, dict):
             nuovo[campo] = valore
         else:
             setattr(nuovo, campo, valore)
         return nuovo
 
+    @staticmethod
+    def modifica(el: Elemento, modifiche: Dict[str, Any]) -> Elemento:
+        """
+        elemento.modifica → scrive più attributi (immutabile, ritorna copia)
+
+        Una sola copia dei dati e un solo timestamp per tutte le modifiche.
+
+        >>> e = elemento.crea({'x': 1, 'y': 2})
+        >>> e2 = elemento.modifica(e, {'x': 10, 'y': 20})
+        >>> (elemento.legge(e2, 'x'), elemento.legge(e2, 'y'))
+        (10, 20)
+        """
+        if isinstance(el, Elemento):
+            congelate = {k: congela(v) for k, v in modifiche.items()}
+            return el._con_modifiche(congelate, _meta_modificato(el._meta))
+        nuovo = deepcopy(el)
+        if isinstance(nuovo, dict):
+            nuovo.update(modifiche)
+        else:
+            for campo, valore in modifiche.items():
+                setattr(nuovo, campo, valore)
+        return nuovo
+
+    @staticmethod
+    def sessione(el: Elemento) -> 'SessioneModifica':
+        """
+        elemento.sessione → sessione di modifica transiente
+
+        Accumula scritture e produce un nuovo elemento immutabile
+        all'uscita dal blocco (una copia, un timestamp).
+
+        >>> e = elemento.crea({'x': 1})
+        >>> with elemento.sessione(e) as s:
+        ...     s.scrive('x', 2)
+        ...     s.scrive('y', s.legge('x') * 10)
+        >>> elemento.legge(s.risultato, 'y')
+        20
+        """
+        return SessioneModifica(el)
+
     @staticmethod
     def esiste(el: Elemento) -> bool:
         """
@@ -103,7 +477,7 @@ class _ElementoArchetipo:
         if el is None:
             return False
         if isinstance(el, Elemento):
-            return not el._meta.get('eliminato', False)
+            return not el._meta.eliminato
         return True
 
     @staticmethod
@@ -116,18 +490,19 @@ class _ElementoArchetipo:
         >>> elemento.esiste(e2)
         False
         """
-        from datetime import datetime
-        nuovo = deepcopy(el)
-        if isinstance(nuovo, Elemento):
-            nuovo._meta['eliminato'] = True
-            nuovo._meta['modificato'] = datetime.now()
-        return nuovo
+        if isinstance(el, Elemento):
+            return el._con_meta(_meta_eliminato(el._meta))
+        return deepcopy(el)
 
     @staticmethod
     def clona(el: Elemento) -> Elemento:
         """
-        elemento.clona → crea copia profonda
+        elemento.clona → crea copia
+
+        Per Elemento i dati sono immutabili: la copia li condivide.
         """
+        if isinstance(el, Elemento):
+            return el._con_meta(el._meta)
         return deepcopy(el)
 
     @staticmethod
@@ -136,11 +511,320 @@ class _ElementoArchetipo:
         elemento.campi → lista dei campi
         """
         if isinstance(el, Elemento):
-            return list(el._dati.keys())
+            return el._campi()
         elif isinstance(el, dict):
             return list(el.keys())
         return []
 
+    @staticmethod
+    def timbro(modo: str = None) -> str:
+        """
+        elemento.timbro → imposta il modo dei metadata, ritorna il precedente
+
+        'orologio' → wall-clock (datetime calcolato in lettura)
+        'tick'     → contatore intero monotono
+        'off'      → nessun timbro (metadata condivisi)
+
+        >>> precedente = elemento.timbro('off')
+        >>> elemento.crea({'x': 1})._meta is elemento.crea({'y': 2})._meta
+        True
+        >>> _ = elemento.timbro(precedente)
+        """
+        global _modo_timbro, _timbra
+        precedente = _modo_timbro
+        if modo is not None:
+            if modo not in _TIMBRI:
+                raise ValueError(f"Modo timbro sconosciuto: {modo} (ammessi: {list(_TIMBRI)})")
+            _modo_timbro = modo
+            _timbra = _TIMBRI[modo]
+        return precedente
+
+    @staticmethod
+    def schema(nome: str, campi: list) -> type:
+        """
+        elemento.schema → genera un tipo record immutabile con __slots__
+
+        >>> Prodotto = elemento.schema('prodotto', ['sku', 'nome', 'prezzo'])
+        >>> p = elemento.crea({'sku': 'A1', 'nome': 'Widget', 'prezzo': 9.9}, schema=Prodotto)
+        >>> elemento.legge(p, 'prezzo')
+        9.9
+        """
+        from .schema import schema
+        return schema(nome, campi)
+
+    @staticmethod
+    def tabella(righe: list, campi: list = None) -> 'ElementoTabella':
+        """
+        elemento.tabella → elementi con gli stessi campi in forma colonnare
+
+        Una colonna (array) per campo: le aggregazioni diventano
+        operazioni vettoriali invece di una legge per elemento.
+
+        >>> t = elemento.tabella([elemento.crea({'x': 1}), elemento.crea({'x': 2})])
+        >>> t.somma('x')
+        3
+        >>> elemento.legge(t[1], 'x')
+        2
+        """
+        from .tabella import ElementoTabella
+        return ElementoTabella.da_righe(righe, campi)
+
+    @staticmethod
+    def impronta(el: Any) -> int:
+        """
+        elemento.impronta → hash strutturale (ignora i timestamp)
+
+        Funziona anche su valori non hashable (Elemento, dict, list):
+        due elementi con stessi dati hanno la stessa impronta.
+
+        >>> a = elemento.crea({'x': [1, 2]})
+        >>> b = elemento.crea({'x': [1, 2]})
+        >>> elemento.impronta(a) == elemento.impronta(b)
+        True
+        """
+        return _impronta(el)
+
+    @staticmethod
+    def interna(el: Elemento) -> Elemento:
+        """
+        elemento.interna → istanza canonica per elementi strutturalmente uguali
+
+        Stessi dati (e stesso stato eliminato) → stessa istanza:
+        memoria condivisa e confronto per identità. La tabella tiene
+        riferimenti deboli: un interno non più usato viene liberato.
+        L'istanza canonica mantiene i metadata del primo elemento internato.
+
+        >>> a = elemento.interna(elemento.crea({'sku': 'A', 'qta': 1}))
+        >>> b = elemento.interna(elemento.crea({'sku': 'A', 'qta': 1}))
+        >>> a is b
+        True
+        """
+        if not isinstance(el, Elemento):
+            return el
+        h = _impronta(el)
+        canonico = _INTERNATI.get(h)
+        if canonico is None:
+            _INTERNATI[h] = el
+            return el
+        if canonico is el or _strutturalmente_uguali(canonico, el):
+            return canonico
+        return el  # collisione di hash: l'elemento resta non internato
+
+
+# === Costruzione in blocco ===
+
+_NUOVO_ELEMENTO = object.__new__
+_IMPOSTA_DATI = Elemento._dati.__set__
+_IMPOSTA_META = Elemento._meta.__set__
+
+
+def _elementi(dati: Iterable[Mapping[str, Any]], meta: Meta) -> List[Elemento]:
+    """Elementi da dati già congelati, tutti con lo stesso meta (senza __init__)."""
+    risultato = []
+    aggiungi = risultato.append
+    for d in dati:
+        el = _NUOVO_ELEMENTO(Elemento)
+        _IMPOSTA_DATI(el, MappaPersistente(d) if len(d) > SOGLIA_TRIE else d)
+        _IMPOSTA_META(el, meta)
+        aggiungi(el)
+    return risultato
+
+
+def _record(schema: type, setter: List[Callable[[Any, Any], None]],
+            righe: Iterable[Sequence[Any]], meta: Meta) -> List[Elemento]:
+    """Record di uno schema da tuple di valori (ordine di setter)."""
+    risultato = []
+    aggiungi = risultato.append
+    for riga in righe:
+        nuovo = _NUOVO_ELEMENTO(schema)
+        for imposta, v in zip(setter, riga):
+            imposta(nuovo, v)
+        _IMPOSTA_META(nuovo, meta)
+        aggiungi(nuovo)
+    return risultato
+
+
+def _crea_molti(righe: Iterable[Mapping[str, Any]], schema: Optional[type],
+                meta: Meta) -> List[Elemento]:
+    if schema is not None:
+        da_dati = schema.da_dati
+        return [da_dati({k: congela(v) for k, v in r.items()}, meta) for r in righe]
+    return _elementi(map(_prepara_dati, righe), meta)
+
+
+def _congela_colonna(valori: Any) -> Sequence[Any]:
+    """Colonna come lista di valori Python congelati (un controllo per colonna)."""
+    if type(valori) is not list and type(valori) is not tuple:
+        tolist = getattr(valori, 'tolist', None)  # array.array, ndarray → scalari Python
+        valori = tolist() if tolist is not None else list(valori)
+    if _IMMUTABILI.issuperset(map(type, valori)):
+        return valori
+    return [congela(v) for v in valori]
+
+
+def _colonne_da_righe(righe: Iterable[Mapping[str, Any]]) -> Dict[str, List[Any]]:
+    righe = list(righe)
+    if not righe:
+        return {}
+    campi = elemento.campi(righe[0])
+    insieme = set(campi)
+    for i, r in enumerate(righe):
+        if set(elemento.campi(r)) != insieme:
+            raise ValueError(f'crea_molti colonnare: la riga {i} ha campi diversi dalla prima '
+                             f'({sorted(elemento.campi(r))} invece di {sorted(insieme)})')
+    if all(type(r) is dict for r in righe):
+        return {campo: [r.get(campo) for r in righe] for campo in campi}
+    return {campo: [elemento.legge(r, campo) for r in righe] for campo in campi}
+
+
+def _tabella(colonne: Mapping[str, Any], meta: Meta) -> 'ElementoTabella':
+    from .tabella import ElementoTabella
+    # array.array e ndarray restano tali: solo le colonne di oggetti vanno congelate
+    return ElementoTabella(
+        {c: v if hasattr(v, 'tolist') else _congela_colonna(v) for c, v in colonne.items()},
+        meta,
+    )
+
+
+_MANCANTE = object()
+
+# Cache degli accessori compilati (i percorsi sono letterali nel codice)
+_ACCESSORI: Dict[str, Callable[..., Any]] = {}
+_MAX_ACCESSORI = 4096
+
+
+def _accessore(percorso: str) -> Callable[..., Any]:
+    accessore = _ACCESSORI.get(percorso)
+    if accessore is None:
+        if len(_ACCESSORI) >= _MAX_ACCESSORI:
+            _ACCESSORI.clear()
+        accessore = _ACCESSORI[percorso] = _compila_percorso(percorso)
+    return accessore
+
+
+def _compila_percorso(percorso: str) -> Callable[..., Any]:
+    """
+    Compila 'a.b.c' in una catena di getter, uno per segmento.
+
+    Ogni passo legge inline i contenitori comuni (Elemento, dict,
+    DizionarioCongelato); gli altri (sottotipi di Elemento, liste con
+    segmenti numerici, oggetti) passano da _passo.
+    """
+    parti = percorso.split('.')
+    if not all(parti):
+        raise ValueError(f"Percorso non valido: '{percorso}'")
+    leggi = None
+    for parte in reversed(parti):
+        leggi = _compila_passo(parte, _come_indice(parte), leggi)
+    leggi.percorso = percorso
+    return leggi
+
+
+def _compila_passo(chiave: str, indice: Optional[int],
+                   resto: Optional[Callable[..., Any]]) -> Callable[..., Any]:
+    def leggi(v: Any, default: Any = None) -> Any:
+        t = type(v)
+        if t is Elemento:
+            v = v._dati.get(chiave, _MANCANTE)
+        elif t is dict or t is DizionarioCongelato:
+            v = v.get(chiave, _MANCANTE)
+        elif v is None:
+            return default
+        else:
+            v = _passo(v, chiave, indice)
+        if v is _MANCANTE:
+            return default
+        return v if resto is None else resto(v, default)
+    return leggi
+
+
+def _come_indice(parte: str) -> Optional[int]:
+    try:
+        return int(parte)
+    except ValueError:
+        return None
+
+
+def _passo(v: Any, chiave: str, indice: Optional[int]) -> Any:
+    """Passo generico (tipi meno comuni)."""
+    if isinstance(v, Elemento):
+        return v._legge(chiave, _MANCANTE)
+    if isinstance(v, _MappingABC):
+        return v.get(chiave, _MANCANTE)
+    if isinstance(v, (list, tuple, VettorePersistente)):
+        if indice is None:
+            return _MANCANTE
+        try:
+            return v[indice]
+        except IndexError:
+            return _MANCANTE
+    return getattr(v, chiave, _MANCANTE)
+
+
+class SessioneModifica:
+    """
+    Sessione transiente: le scritture restano pendenti fino a conclude().
+    L'elemento originale non viene mai toccato.
+    """
+
+    def __init__(self, el: Elemento):
+        self._originale = el
+        self._modifiche: Dict[str, Any] = {}
+        self.risultato: Optional[Elemento] = None
+
+    def scrive(self, campo: str, valore: Any) -> None:
+        """Registra una scrittura pendente."""
+        if self.risultato is not None:
+            raise RuntimeError("Sessione già conclusa")
+        self._modifiche[campo] = valore
+
+    def legge(self, campo: str, default: Any = None) -> Any:
+        """Legge vedendo anche le scritture pendenti."""
+        if campo in self._modifiche:
+            return self._modifiche[campo]
+        return elemento.legge(self._originale, campo, default)
+
+    def conclude(self) -> Elemento:
+        """Applica le scritture pendenti e ritorna il nuovo elemento."""
+        if self.risultato is None:
+            if self._modifiche:
+                self.risultato = elemento.modifica(self._originale, self._modifiche)
+            else:
+                self.risultato = self._originale
+        return self.risultato
+
+    def __enter__(self) -> 'SessioneModifica':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            self.conclude()
+
+
+def _impronta(valore: Any) -> int:
+    """Hash strutturale ricorsivo, con tag di tipo per i contenitori."""
+    if isinstance(valore, Elemento):
+        try:
+            return valore._hash
+        except AttributeError:
+            pass
+        h = hash((
+            'Elemento',
+            _impronta(valore._dati),
+            bool(valore._meta.eliminato),
+        ))
+        _IMPOSTA_HASH(valore, h)
+        return h
+    if isinstance(valore, _MappingABC):
+        return hash(('dict', frozenset((k, _impronta(v)) for k, v in valore.items())))
+    if isinstance(valore, (list, VettorePersistente)):
+        return hash(('list', tuple(_impronta(v) for v in valore)))
+    if isinstance(valore, tuple):
+        return hash(('tuple', tuple(_impronta(v) for v in valore)))
+    if isinstance(valore, (set, frozenset)):
+        return hash(('set', frozenset(_impronta(v) for v in valore)))
+    return hash(valore)
+
 
 # Istanza singleton per uso come namespace
 elemento = _ElementoArchetipo()
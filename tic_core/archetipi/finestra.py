@@ -0,0 +1,173 @@
+"""
+FINESTRA — Finestre scorrevoli e partizioni in un passaggio
+
+Una media mobile fatta con mappa/riduce risomma ogni finestra:
+O(n × ampiezza). finestra aggiorna l'aggregato quando un item entra e
+uno esce:
+
+    contenitore.finestra(vendite_minuto, 60, aggregato='somma')      # incasso dell'ultima ora
+    contenitore.finestra(occupazione, 4, passo=4, aggregato='massimo')
+
+    somma, media   somma corrente: + entrante, - uscente
+    minimo, massimo deque monotona (indice, valore): ogni item entra ed
+                    esce una volta, O(1) ammortizzato per item
+
+Senza aggregato si ottengono le finestre come tuple (O(ampiezza) per
+finestra). Con una sequenza di aggregati, un dict per finestra.
+Finestre solo complete: [0, ampiezza), [passo, passo + ampiezza), ...
+
+partiziona divide con un predicato in (veri, falsi) chiamandolo una
+volta per item, invece di un filtra e uno scarta.
+
+Entrambe sono pigre sugli iteratori (flussi, ContenitoreSuFile, una
+Pipeline): finestra tiene in memoria una finestra, partiziona solo gli
+item che un lato ha letto e l'altro non ancora (come itertools.tee).
+"""
+
+from typing import Any, Callable, Iterable, Iterator, Sequence, Tuple, Union
+from collections import deque
+from itertools import compress, islice
+from math import fsum
+import operator
+
+from .ordinato import _funzione_chiave
+from . import vettoriale
+
+Aggregato = Union[str, Sequence[str]]
+
+_AGGREGATI = ('somma', 'media', 'minimo', 'massimo')
+
+_MANCANTE = object()
+
+
+def finestra(cont: Iterable[Any], ampiezza: int, passo: int = 1, aggregato: Aggregato = None,
+             chiave: Union[str, Callable[[Any], Any]] = None) -> Iterator[Any]:
+    """
+    Finestre di ampiezza item ogni passo item (iteratore).
+
+    aggregato: None (tuple), 'somma', 'media', 'minimo', 'massimo' o una
+    sequenza di questi (dict per finestra). chiave: campo o funzione
+    del valore da aggregare (default l'item).
+
+    >>> list(finestra([1, 2, 3, 4, 5], 3))
+    [(1, 2, 3), (2, 3, 4), (3, 4, 5)]
+    >>> list(finestra([4, 1, 3, 5, 2, 6], 2, passo=2, aggregato='massimo'))
+    [4, 5, 6]
+    >>> list(finestra([{'v': 1}, {'v': 5}, {'v': 3}], 2, aggregato=('somma', 'minimo'), chiave='v'))
+    [{'somma': 6, 'minimo': 1}, {'somma': 8, 'minimo': 3}]
+    """
+    if ampiezza < 1 or passo < 1:
+        raise ValueError("ampiezza e passo devono essere almeno 1")
+    nomi = (aggregato,) if isinstance(aggregato, str) else aggregato
+    for nome in nomi or ():
+        if nome not in _AGGREGATI:
+            raise ValueError(f"Aggregato sconosciuto '{nome}' (ammessi: {', '.join(_AGGREGATI)})")
+    valori = iter(cont) if chiave is None else map(_funzione_chiave(chiave), cont)
+    if aggregato is None:
+        return _tuple(valori, ampiezza, passo)
+    if isinstance(aggregato, str):
+        return _aggregati(valori, ampiezza, passo, nomi, singolo=True)
+    return _aggregati(valori, ampiezza, passo, tuple(nomi), singolo=False)
+
+
+def _tuple(valori: Iterator[Any], ampiezza: int, passo: int) -> Iterator[Tuple[Any, ...]]:
+    corrente = deque(islice(valori, ampiezza), maxlen=ampiezza)
+    while len(corrente) == ampiezza:
+        yield tuple(corrente)
+        if passo >= ampiezza:
+            # Finestre disgiunte: si saltano gli item in mezzo
+            corrente = deque(islice(valori, passo - ampiezza, passo), maxlen=ampiezza)
+        else:
+            nuovi = list(islice(valori, passo))
+            if len(nuovi) < passo:
+                return
+            corrente.extend(nuovi)
+
+
+def _aggregati(valori: Iterator[Any], ampiezza: int, passo: int,
+               nomi: Tuple[str, ...], singolo: bool) -> Iterator[Any]:
+    somma_serve = 'somma' in nomi or 'media' in nomi
+    minimo_serve = 'minimo' in nomi
+    massimo_serve = 'massimo' in nomi
+    corrente: deque = deque()          # valori nella finestra (per la somma)
+    minimi: deque = deque()            # (indice, valore) crescenti
+    massimi: deque = deque()           # (indice, valore) decrescenti
+    somma = 0
+    uscite = 0                         # sottrazioni dall'ultima somma esatta
+    prossima = ampiezza - 1            # indice dell'ultimo item della prossima finestra
+
+    for j, v in enumerate(valori):
+        if somma_serve:
+            corrente.append(v)
+            somma += v
+            if len(corrente) > ampiezza:
+                somma -= corrente.popleft()
+                uscite += 1
+                if uscite >= ampiezza and type(somma) is float:
+                    # Ricalcolo esatto ogni ampiezza uscite: l'errore dei float non si accumula
+                    somma = fsum(corrente)
+                    uscite = 0
+        if minimo_serve:
+            while minimi and minimi[-1][1] >= v:
+                minimi.pop()
+            minimi.append((j, v))
+            if minimi[0][0] <= j - ampiezza:
+                minimi.popleft()
+        if massimo_serve:
+            while massimi and massimi[-1][1] <= v:
+                massimi.pop()
+            massimi.append((j, v))
+            if massimi[0][0] <= j - ampiezza:
+                massimi.popleft()
+
+        if j < prossima:
+            continue
+        prossima += passo
+        risultato = [somma if nome == 'somma' else
+                     somma / ampiezza if nome == 'media' else
+                     minimi[0][1] if nome == 'minimo' else
+                     massimi[0][1] for nome in nomi]
+        yield risultato[0] if singolo else dict(zip(nomi, risultato))
+
+
+def partiziona(cont: Iterable[Any], predicato: Callable[[Any], bool]) -> Tuple[Any, Any]:
+    """
+    (item con predicato vero, item con predicato falso), nell'ordine
+    originale, chiamando il predicato una volta per item.
+
+    Sequenze: due liste. Iteratori: due iteratori pigri sulla stessa
+    sorgente.
+
+    >>> partiziona([1, 5, 2, 8], lambda x: x > 3)
+    ([5, 8], [1, 2])
+    >>> pari, dispari = partiziona(iter(range(6)), lambda x: x % 2 == 0)
+    >>> list(dispari), list(pari)
+    ([1, 3, 5], [0, 2, 4])
+    """
+    if not hasattr(cont, '__len__'):
+        return _partiziona_pigro(iter(cont), predicato)
+    kernel = vettoriale.riconosci(predicato)
+    if kernel is not None and kernel.python is not None:
+        predicato = kernel.python  # ciclo in C (funzioni di operator)
+    esiti = list(map(predicato, cont))
+    return list(compress(cont, esiti)), list(compress(cont, map(operator.not_, esiti)))
+
+
+def _partiziona_pigro(sorgente: Iterator[Any],
+                      predicato: Callable[[Any], bool]) -> Tuple[Iterator[Any], Iterator[Any]]:
+    veri: deque = deque()
+    falsi: deque = deque()
+
+    def lato(mio: deque, altro: deque, esito: bool) -> Iterator[Any]:
+        while True:
+            while mio:
+                yield mio.popleft()
+            item = next(sorgente, _MANCANTE)
+            if item is _MANCANTE:
+                return
+            if bool(predicato(item)) is esito:
+                yield item
+            else:
+                altro.append(item)
+
+    return lato(veri, falsi, True), lato(falsi, veri, False)
@@ -0,0 +1,177 @@
+"""
+INDICIZZATO — Contenitore con indici hash sui campi
+
+contenitore.trova con un predicato scorre tutti gli item. Per le
+ricerche per chiave (sku di un catalogo, id di un tavolo) un
+ContenitoreIndicizzato mantiene, per ogni campo indicizzato, una
+MappaPersistente valore → posizioni:
+
+    catalogo = contenitore.indicizzato(prodotti, chiavi=['sku'])
+    contenitore.trova(catalogo, partial(confronta.campo_uguale, campo='sku', valore='A1'))
+
+Il predicato campo_uguale su un campo indicizzato diventa una lettura
+O(1); gli altri predicati scorrono gli item come prima.
+
+È un VettorePersistente: aggiunge, imposta, rimuove_ultimo ed estende
+ritornano un nuovo contenitore con gli indici aggiornati in O(log32 n)
+per campo, condividendo il resto. rimuove_a in mezzo ricostruisce gli
+indici (O(n), come lo spostamento degli item). Slicing, filtra e mappa
+ritornano sequenze normali, senza indici.
+
+I valori dei campi indicizzati devono essere hashable.
+"""
+
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
+from bisect import insort
+from functools import partial
+
+from .elemento import elemento
+from .confronta import confronta
+from .persistente import MappaPersistente, VettorePersistente
+
+_VUOTO: Tuple[int, ...] = ()
+
+_legge = elemento.legge
+
+
+def _valore_chiave(item: Any, campo: str) -> Any:
+    v = _legge(item, campo)
+    try:
+        hash(v)
+    except TypeError:
+        raise TypeError(f"Valore non hashable per il campo indicizzato '{campo}': {v!r}") from None
+    return v
+
+
+def _con_posizione(indice: MappaPersistente, v: Any, i: int) -> MappaPersistente:
+    posizioni = indice.get(v, _VUOTO)
+    if not posizioni or posizioni[-1] < i:
+        return indice.associa(v, posizioni + (i,))
+    nuove = list(posizioni)
+    insort(nuove, i)
+    return indice.associa(v, tuple(nuove))
+
+
+def _senza_posizione(indice: MappaPersistente, v: Any, i: int) -> MappaPersistente:
+    posizioni = tuple(p for p in indice.get(v, _VUOTO) if p != i)
+    return indice.associa(v, posizioni) if posizioni else indice.dissocia(v)
+
+
+class ContenitoreIndicizzato(VettorePersistente):
+    """
+    VettorePersistente con indici hash su alcuni campi degli item.
+
+    >>> c = ContenitoreIndicizzato([{'sku': 'A'}, {'sku': 'B'}], chiavi=['sku'])
+    >>> c.trova_per('sku', 'B')
+    {'sku': 'B'}
+    >>> c.aggiunge({'sku': 'C'}).posizioni('sku', 'C')
+    (2,)
+    """
+
+    __slots__ = ('_indici',)
+
+    def __init__(self, sorgente: Optional[Iterable[Any]] = None, chiavi: Sequence[str] = ()):
+        super().__init__(sorgente)
+        if isinstance(chiavi, str):
+            chiavi = (chiavi,)
+        indici: Dict[str, MappaPersistente] = {}
+        for campo in chiavi:
+            gruppi: Dict[Any, list] = {}
+            for i, item in enumerate(self):
+                gruppi.setdefault(_valore_chiave(item, campo), []).append(i)
+            indici[campo] = MappaPersistente({v: tuple(p) for v, p in gruppi.items()})
+        self._indici = indici
+
+    @classmethod
+    def _da_vettore(cls, vettore: VettorePersistente,
+                    indici: Dict[str, MappaPersistente]) -> 'ContenitoreIndicizzato':
+        c = cls._da_parti(vettore._n, vettore._livello, vettore._radice, vettore._coda)
+        c._indici = indici
+        return c
+
+    # --- Ricerca ---
+
+    @property
+    def chiavi(self) -> Tuple[str, ...]:
+        """I campi indicizzati."""
+        return tuple(self._indici)
+
+    def posizioni(self, campo: str, valore: Any) -> Tuple[int, ...]:
+        """Posizioni degli item con campo == valore, in ordine (KeyError se non indicizzato)."""
+        return self._indici[campo].get(valore, _VUOTO)
+
+    def trova_per(self, campo: str, valore: Any, default: Any = None) -> Any:
+        """Primo item con campo == valore, O(1)."""
+        posizioni = self._indici[campo].get(valore, _VUOTO)
+        return self[posizioni[0]] if posizioni else default
+
+    # --- Scrittura (nuovo contenitore, indici aggiornati) ---
+
+    def aggiunge(self, valore: Any) -> 'ContenitoreIndicizzato':
+        i = self._n
+        indici = {campo: _con_posizione(indice, _valore_chiave(valore, campo), i)
+                  for campo, indice in self._indici.items()}
+        return self._da_vettore(VettorePersistente.aggiunge(self, valore), indici)
+
+    def estende(self, valori: Iterable[Any]) -> 'ContenitoreIndicizzato':
+        valori = list(valori)
+        indici = {}
+        for campo, indice in self._indici.items():
+            for i, item in enumerate(valori, self._n):
+                indice = _con_posizione(indice, _valore_chiave(item, campo), i)
+            indici[campo] = indice
+        return self._da_vettore(VettorePersistente.estende(self, valori), indici)
+
+    def imposta(self, indice: int, valore: Any) -> 'ContenitoreIndicizzato':
+        if indice < 0:
+            indice += self._n
+        vettore = VettorePersistente.imposta(self, indice, valore)
+        precedente = self[indice]
+        indici = {}
+        for campo, mappa in self._indici.items():
+            vecchio, nuovo = _legge(precedente, campo), _valore_chiave(valore, campo)
+            if vecchio is not nuovo and vecchio != nuovo:
+                mappa = _con_posizione(_senza_posizione(mappa, vecchio, indice), nuovo, indice)
+            indici[campo] = mappa
+        return self._da_vettore(vettore, indici)
+
+    def rimuove_ultimo(self) -> 'ContenitoreIndicizzato':
+        vettore = VettorePersistente.rimuove_ultimo(self)
+        i = self._n - 1
+        ultimo = self[i]
+        indici = {campo: _senza_posizione(mappa, _legge(ultimo, campo), i)
+                  for campo, mappa in self._indici.items()}
+        return self._da_vettore(vettore, indici)
+
+    def rimuove_a(self, indice: int) -> 'ContenitoreIndicizzato':
+        if indice < 0:
+            indice += self._n
+        if indice == self._n - 1:
+            return self.rimuove_ultimo()
+        # Le posizioni successive scalano tutte: si ricostruisce
+        return ContenitoreIndicizzato(VettorePersistente.rimuove_a(self, indice), self.chiavi)
+
+    def __reduce__(self):
+        return (ContenitoreIndicizzato, (list(self), self.chiavi))
+
+    def __repr__(self) -> str:
+        return f'ContenitoreIndicizzato({list(self)!r}, chiavi={list(self._indici)!r})'
+
+
+def posizioni_per(cont: Any, predicato: Callable[[Any], bool]) -> Optional[Tuple[int, ...]]:
+    """
+    Posizioni che soddisfano predicato lette dall'indice, None se il
+    predicato non è campo_uguale su un campo indicizzato di cont.
+    """
+    if type(predicato) is not partial or predicato.func is not confronta.campo_uguale:
+        return None
+    if not isinstance(cont, ContenitoreIndicizzato) or predicato.args:
+        return None
+    parametri = predicato.keywords
+    indice = cont._indici.get(parametri.get('campo'))
+    if indice is None or len(parametri) != 2 or 'valore' not in parametri:
+        return None
+    try:
+        return indice.get(parametri['valore'], _VUOTO)
+    except TypeError:  # valore cercato non hashable: si scorrono gli item
+        return None
@@ -0,0 +1,256 @@
+"""
+ORDINATO — Contenitore ordinato per chiave, con ricerche per intervallo
+
+contenitore.ordina riordina tutto l'input a ogni chiamata e
+confronta.tra filtra scorrendo ogni item. Un ContenitoreOrdinato tiene
+gli item sempre ordinati per una chiave (un campo o una funzione):
+
+    catalogo = contenitore.ordinato(prodotti, chiave='prezzo')
+    catalogo.tra(10, 50)          # bisect: O(log n + risultati)
+    catalogo.rango(20)            # quanti item con prezzo < 20
+    catalogo.percentile(90)       # item al 90° percentile
+    catalogo = catalogo.aggiunge(nuovo)
+
+Struttura: lista ordinata di blocchi (tuple di al più 2 * BLOCCO item),
+con le chiavi di ogni blocco a parte per bisect. Inserire e togliere
+cercano il blocco con bisect sui massimi, ricostruiscono quel blocco
+(O(BLOCCO)) e la tupla dei blocchi (O(n / BLOCCO) riferimenti, copiati
+in C): il resto è condiviso tra le versioni, come in VettorePersistente.
+
+A parità di chiave l'ordine è quello di inserimento.
+"""
+
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple, Union
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence as _SequenceABC
+from itertools import accumulate, chain, groupby, islice
+from operator import itemgetter
+
+from .elemento import elemento
+
+BLOCCO = 256  # dimensione obiettivo di un blocco; oltre il doppio si divide
+
+
+def _funzione_chiave(chiave: Union[str, Callable[[Any], Any]]) -> Callable[[Any], Any]:
+    if callable(chiave):
+        return chiave
+    return elemento.accessore(chiave)  # getter compilato e in cache
+
+
+class ContenitoreOrdinato(_SequenceABC):
+    """
+    Sequenza immutabile ordinata per chiave.
+
+    >>> c = ContenitoreOrdinato([5, 1, 4, 2], chiave=lambda x: x)
+    >>> list(c)
+    [1, 2, 4, 5]
+    >>> c.tra(2, 4)
+    [2, 4]
+    >>> list(c.aggiunge(3))
+    [1, 2, 3, 4, 5]
+    """
+
+    __slots__ = ('_chiave', '_funzione', '_blocchi', '_chiavi', '_massimi', '_n', '_inizi')
+
+    def __init__(self, sorgente: Optional[Iterable[Any]] = None,
+                 chiave: Union[str, Callable[[Any], Any]] = None):
+        if chiave is None:
+            raise TypeError("ContenitoreOrdinato richiede una chiave (campo o funzione)")
+        funzione = _funzione_chiave(chiave)
+        coppie = sorted(((funzione(x), x) for x in (sorgente or ())), key=itemgetter(0))
+        inizi = range(0, len(coppie), BLOCCO)
+        blocchi = tuple(tuple(x for _, x in coppie[i:i + BLOCCO]) for i in inizi)
+        chiavi = tuple(tuple(k for k, _ in coppie[i:i + BLOCCO]) for i in inizi)
+        self._chiave = chiave
+        self._funzione = funzione
+        self._blocchi = blocchi
+        self._chiavi = chiavi
+        self._massimi = tuple(c[-1] for c in chiavi)
+        self._n = len(coppie)
+        self._inizi = None
+
+    def _sostituisce_blocco(self, b: int, blocchi: tuple, chiavi: tuple,
+                            delta: int) -> 'ContenitoreOrdinato':
+        """Nuova versione con il blocco b sostituito da blocchi (zero, uno o due)."""
+        c = object.__new__(ContenitoreOrdinato)
+        c._chiave = self._chiave
+        c._funzione = self._funzione
+        c._blocchi = self._blocchi[:b] + blocchi + self._blocchi[b + 1:]
+        c._chiavi = self._chiavi[:b] + chiavi + self._chiavi[b + 1:]
+        c._massimi = self._massimi[:b] + tuple(k[-1] for k in chiavi) + self._massimi[b + 1:]
+        c._n = self._n + delta
+        c._inizi = None
+        return c
+
+    # --- Lettura ---
+
+    @property
+    def chiave(self) -> Union[str, Callable[[Any], Any]]:
+        """Il campo (o la funzione) di ordinamento."""
+        return self._chiave
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __iter__(self) -> Iterator[Any]:
+        return chain.from_iterable(self._blocchi)
+
+    def __reversed__(self) -> Iterator[Any]:
+        return chain.from_iterable(map(reversed, reversed(self._blocchi)))
+
+    def decrescente(self) -> Iterator[Any]:
+        """
+        Item per chiave decrescente, a parità di chiave in ordine di
+        inserimento (come sorted(..., reverse=True)); reversed li inverte.
+
+        >>> c = ContenitoreOrdinato(['b1', 'a1', 'b2', 'a2'], chiave=lambda s: s[0])
+        >>> list(c.decrescente()), list(reversed(c))
+        (['b1', 'b2', 'a1', 'a2'], ['b2', 'b1', 'a2', 'a1'])
+        """
+        chiavi = chain.from_iterable(map(reversed, reversed(self._chiavi)))
+        for _, gruppo in groupby(zip(chiavi, reversed(self)), key=itemgetter(0)):
+            yield from reversed([x for _, x in gruppo])
+
+    def _inizio_blocchi(self) -> List[int]:
+        """Indice globale del primo item di ogni blocco (calcolato una volta per versione)."""
+        if self._inizi is None:
+            self._inizi = list(accumulate(map(len, self._blocchi), initial=0))
+        return self._inizi
+
+    def _posizione(self, indice: int) -> Tuple[int, int]:
+        """indice globale → (blocco, indice nel blocco)."""
+        inizi = self._inizio_blocchi()
+        b = bisect_right(inizi, indice) - 1
+        return b, indice - inizi[b]
+
+    def __getitem__(self, indice: Any) -> Any:
+        if type(indice) is slice:
+            return list(self)[indice]
+        if indice < 0:
+            indice += self._n
+        if not 0 <= indice < self._n:
+            raise IndexError('indice fuori dal contenitore')
+        b, i = self._posizione(indice)
+        return self._blocchi[b][i]
+
+    def rango(self, valore: Any) -> int:
+        """Numero di item con chiave < valore (posizione di inserimento), O(log n)."""
+        b = bisect_left(self._massimi, valore)
+        if b == len(self._blocchi):
+            return self._n
+        return self._inizio_blocchi()[b] + bisect_left(self._chiavi[b], valore)
+
+    def _rango_destro(self, valore: Any) -> int:
+        """Numero di item con chiave <= valore."""
+        b = bisect_right(self._massimi, valore)
+        if b == len(self._blocchi):
+            return self._n
+        return self._inizio_blocchi()[b] + bisect_right(self._chiavi[b], valore)
+
+    def tra(self, minimo: Any, massimo: Any) -> List[Any]:
+        """Item con minimo <= chiave <= massimo, in ordine (come confronta.tra)."""
+        inizio, fine = self.rango(minimo), self._rango_destro(massimo)
+        if inizio >= fine:
+            return []
+        return list(islice(self._da(inizio), fine - inizio))
+
+    def conta_tra(self, minimo: Any, massimo: Any) -> int:
+        """Quanti item con minimo <= chiave <= massimo, senza leggerli: O(log n)."""
+        return max(0, self._rango_destro(massimo) - self.rango(minimo))
+
+    def _da(self, indice: int) -> Iterator[Any]:
+        """Iteratore dagli item a partire da indice, senza scorrere i blocchi precedenti."""
+        if indice >= self._n:
+            return iter(())
+        b, i = self._posizione(indice)
+        return chain(islice(self._blocchi[b], i, None), chain.from_iterable(self._blocchi[b + 1:]))
+
+    def percentile(self, p: float) -> Any:
+        """
+        Item al percentile p (0-100, rango più vicino), None se vuoto.
+
+        >>> ContenitoreOrdinato(range(1, 101), chiave=lambda x: x).percentile(90)
+        90
+        """
+        if not self._n:
+            return None
+        if not 0 <= p <= 100:
+            raise ValueError('percentile fuori da 0-100')
+        rango = max(1, -(-p * self._n // 100))  # ceil(p * n / 100)
+        return self[int(rango) - 1]
+
+    def minimo(self) -> Any:
+        return self._blocchi[0][0] if self._n else None
+
+    def massimo(self) -> Any:
+        return self._blocchi[-1][-1] if self._n else None
+
+    # --- Scrittura (nuovo contenitore) ---
+
+    def aggiunge(self, item: Any) -> 'ContenitoreOrdinato':
+        """Nuovo contenitore con item al suo posto (dopo gli item con la stessa chiave)."""
+        k = self._funzione(item)
+        if not self._n:
+            return ContenitoreOrdinato((item,), self._chiave)
+        b = min(bisect_right(self._massimi, k), len(self._blocchi) - 1)
+        i = bisect_right(self._chiavi[b], k)
+        blocco = self._blocchi[b][:i] + (item,) + self._blocchi[b][i:]
+        chiavi = self._chiavi[b][:i] + (k,) + self._chiavi[b][i:]
+        if len(blocco) > 2 * BLOCCO:  # divide a metà
+            return self._sostituisce_blocco(
+                b, (blocco[:BLOCCO], blocco[BLOCCO:]), (chiavi[:BLOCCO], chiavi[BLOCCO:]), 1)
+        return self._sostituisce_blocco(b, (blocco,), (chiavi,), 1)
+
+    def estende(self, items: Iterable[Any]) -> 'ContenitoreOrdinato':
+        """Nuovo contenitore con tutti gli item (riordina se sono molti)."""
+        items = list(items)
+        if len(items) > BLOCCO:
+            return ContenitoreOrdinato(chain(self, items), self._chiave)
+        c = self
+        for item in items:
+            c = c.aggiunge(item)
+        return c
+
+    def rimuove_a(self, indice: int) -> 'ContenitoreOrdinato':
+        """Nuovo contenitore senza l'item all'indice."""
+        if indice < 0:
+            indice += self._n
+        if not 0 <= indice < self._n:
+            raise IndexError('indice fuori dal contenitore')
+        b, i = self._posizione(indice)
+        blocco = self._blocchi[b][:i] + self._blocchi[b][i + 1:]
+        if not blocco:
+            return self._sostituisce_blocco(b, (), (), -1)
+        chiavi = self._chiavi[b][:i] + self._chiavi[b][i + 1:]
+        return self._sostituisce_blocco(b, (blocco,), (chiavi,), -1)
+
+    def rimuove(self, item: Any) -> 'ContenitoreOrdinato':
+        """Nuovo contenitore senza la prima occorrenza di item (cercata tra le chiavi uguali)."""
+        k = self._funzione(item)
+        inizio, fine = self.rango(k), self._rango_destro(k)
+        for i, e in enumerate(islice(self._da(inizio), fine - inizio), inizio):
+            if e is item or e == item:
+                return self.rimuove_a(i)
+        return self
+
+    # --- Confronto ---
+
+    def __eq__(self, altro: Any) -> bool:
+        if self is altro:
+            return True
+        if isinstance(altro, (ContenitoreOrdinato, list)):
+            return len(self) == len(altro) and all(a is b or a == b for a, b in zip(self, altro))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __add__(self, altro: Any) -> 'ContenitoreOrdinato':
+        if isinstance(altro, (_SequenceABC, list, tuple)):
+            return self.estende(altro)
+        return NotImplemented
+
+    def __reduce__(self):
+        return (ContenitoreOrdinato, (list(self), self._chiave))
+
+    def __repr__(self) -> str:
+        return f'ContenitoreOrdinato({list(self)!r}, chiave={self._chiave!r})'
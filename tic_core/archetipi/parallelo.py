@@ -0,0 +1,223 @@
+"""
+PARALLELO — mappa/filtra su più processi
+
+contenitore.mappa usa un core solo. Per celle pure e CPU-bound
+(validazione, prezzi) contenitore.mappa_parallelo/filtra_parallelo
+dividono l'input in blocchi su un pool di processi persistente e
+ricompongono il risultato nell'ordine originale.
+
+Le celle viaggiano per nome, non per pickle. Una funzione a livello di
+modulo ha già un nome (modulo:qualname) che il worker risolve
+importando il modulo: non serve registrarla. Lambda, funzioni locali,
+partial e altri callable vanno registrati con registra_cella (con
+l'avvio 'fork', Linux; il pool si ricrea quando il registro cresce,
+quindi conviene registrarli all'import), altrimenti si eseguono in
+serie nel processo corrente. Il registro tiene solo ciò che si registra
+esplicitamente: le chiamate con lambda create al volo non lo fanno
+crescere né ricreano il pool.
+
+Blocchi adattivi: i primi item si calcolano nel processo corrente per
+misurare il costo per item. Se tutto il lavoro stimato sta sotto
+SOGLIA_SECONDI si prosegue in serie (il pool costerebbe di più);
+altrimenti ogni blocco vale circa BLOCCO_SECONDI di calcolo.
+
+Solo per funzioni pure: gli effetti nei worker non tornano indietro.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from collections.abc import Sequence as _SequenceABC
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress, islice, repeat
+import atexit
+import importlib
+import multiprocessing
+import os
+import time
+
+SOGLIA_SECONDI = 0.05   # lavoro stimato sotto cui si resta in serie
+BLOCCO_SECONDI = 0.01   # lavoro obiettivo per blocco
+_CAMPIONE = 32          # item calcolati in serie per stimare il costo
+
+_MAPPA = 0
+_FILTRA = 1
+
+
+# === Registro delle celle ===
+
+_CELLE: Dict[str, Callable[[Any], Any]] = {}
+_NOMI: Dict[Callable[[Any], Any], str] = {}
+
+
+def registra_cella(funzione: Callable[[Any], Any], nome: str = None) -> str:
+    """
+    Registra una cella e ritorna il suo nome (default: modulo:qualname).
+    Serve solo per callable senza un nome importabile (lambda, funzioni
+    locali, partial); il registro li tiene per tutto il processo.
+    Registrare all'import (a livello di modulo) evita di ricreare il pool.
+
+    >>> def doppio(x): return x * 2
+    >>> registra_cella(doppio, 'doc.doppio')
+    'doc.doppio'
+    """
+    esistente = _NOMI.get(funzione)
+    if esistente is not None and nome in (None, esistente):
+        return esistente
+    if nome is None:
+        nome = f'{funzione.__module__}:{funzione.__qualname__}'
+        if nome in _CELLE and _CELLE[nome] is not funzione:
+            nome = f'{nome}#{len(_CELLE)}'  # lambda o funzioni locali omonime
+    _CELLE[nome] = funzione
+    _NOMI[funzione] = nome
+    return nome
+
+
+def _importa(modulo: str, percorso: str) -> Any:
+    oggetto = importlib.import_module(modulo)
+    for parte in percorso.split('.'):
+        oggetto = getattr(oggetto, parte)
+    return oggetto
+
+
+def _nome_cella(funzione: Callable[[Any], Any]) -> Optional[str]:
+    """Nome con cui il worker trova la cella, None se non ne ha uno (→ in serie)."""
+    try:
+        nome = _NOMI.get(funzione)
+    except TypeError:  # callable non hashable
+        nome = None
+    if nome is not None:
+        return nome
+    modulo = getattr(funzione, '__module__', None)
+    percorso = getattr(funzione, '__qualname__', None)
+    if not modulo or not percorso or '<' in percorso:  # lambda o funzione locale
+        return None
+    try:
+        if _importa(modulo, percorso) is not funzione:
+            return None
+    except (ImportError, AttributeError):
+        return None
+    return f'{modulo}:{percorso}'
+
+
+def _risolvi(nome: str) -> Callable[[Any], Any]:
+    """Nel worker: dal registro, altrimenti importando modulo:qualname."""
+    funzione = _CELLE.get(nome)
+    if funzione is not None:
+        return funzione
+    modulo, _, percorso = nome.partition(':')
+    try:
+        return _importa(modulo, percorso)
+    except (ImportError, AttributeError):
+        raise LookupError(
+            f"Cella '{nome}' non trovata nel worker: con l'avvio 'spawn' "
+            f"usa una funzione a livello di modulo"
+        ) from None
+
+
+def _esegui_blocco(nome: str, modo: int, blocco: List[Any]) -> List[Any]:
+    funzione = _risolvi(nome)
+    if modo == _MAPPA:
+        return [funzione(x) for x in blocco]
+    return [bool(funzione(x)) for x in blocco]
+
+
+# === Pool persistente ===
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_processi = 0
+_pool_celle = 0  # dimensione del registro alla creazione (fork)
+
+
+def _contesto() -> Any:
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context()
+
+
+def _ottieni_pool(processi: int) -> ProcessPoolExecutor:
+    global _pool, _pool_processi, _pool_celle
+    contesto = _contesto()
+    # Con fork i worker vedono il registro com'era alla creazione
+    obsoleto = contesto.get_start_method() == 'fork' and len(_CELLE) != _pool_celle
+    if _pool is None or _pool_processi != processi or obsoleto:
+        chiudi_pool()
+        _pool = ProcessPoolExecutor(max_workers=processi, mp_context=contesto)
+        _pool_processi = processi
+        _pool_celle = len(_CELLE)
+    return _pool
+
+
+def chiudi_pool() -> None:
+    """Termina il pool (viene ricreato alla prossima chiamata)."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
+atexit.register(chiudi_pool)
+
+
+# === Esecuzione ===
+
+def _core_disponibili() -> int:
+    try:
+        return len(os.sched_getaffinity(0))  # rispetta i limiti del container
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def _esegui(cont: Sequence[Any], funzione: Callable[[Any], Any], modo: int,
+            processi: Optional[int], blocco: Optional[int]) -> List[Any]:
+    """Risultati per item (valori per mappa, bool per filtra), nell'ordine."""
+    items = cont if isinstance(cont, _SequenceABC) else list(cont)
+    n = len(items)
+    resto = iter(items)  # un solo passaggio: niente copie o slice del contenitore
+    processi = processi or _core_disponibili()
+    calcola = funzione if modo == _MAPPA else (lambda x: bool(funzione(x)))
+
+    inizio = 0
+    risultati: List[Any] = []
+    if blocco is None:
+        # Campione in serie: stima del costo per item
+        campione = min(_CAMPIONE, n)
+        t0 = time.perf_counter()
+        risultati = [calcola(x) for x in islice(resto, campione)]
+        costo = (time.perf_counter() - t0) / max(campione, 1)
+        inizio = campione
+        if processi < 2 or costo * (n - inizio) < SOGLIA_SECONDI:
+            risultati.extend(map(calcola, resto))
+            return risultati
+        blocco = max(1, int(BLOCCO_SECONDI / max(costo, 1e-9)))
+        # Almeno qualche blocco per worker, per bilanciare il carico
+        blocco = min(blocco, -(-(n - inizio) // (processi * 4)))
+    nome = _nome_cella(funzione)
+    if nome is None or n - inizio <= blocco:
+        risultati.extend(map(calcola, resto))
+        return risultati
+
+    blocchi = iter(lambda: list(islice(resto, blocco)), [])
+    pool = _ottieni_pool(processi)
+    for parte in pool.map(_esegui_blocco, repeat(nome), repeat(modo), blocchi):
+        risultati.extend(parte)
+    return risultati
+
+
+def mappa_parallelo(cont: Sequence[Any], funzione: Callable[[Any], Any],
+                    processi: int = None, blocco: int = None) -> List[Any]:
+    """
+    Come contenitore.mappa, su più processi.
+
+    processi: default i core disponibili al processo
+    blocco:   item per blocco; default adattivo (con fallback seriale)
+    """
+    return _esegui(cont, funzione, _MAPPA, processi, blocco)
+
+
+def filtra_parallelo(cont: Sequence[Any], predicato: Callable[[Any], bool],
+                     processi: int = None, blocco: int = None) -> List[Any]:
+    """
+    Come contenitore.filtra, su più processi.
+    Dai worker tornano solo i bool: gli item restano quelli originali.
+    """
+    items = cont if isinstance(cont, _SequenceABC) else list(cont)
+    return list(compress(items, _esegui(items, predicato, _FILTRA, processi, blocco)))
@@ -0,0 +1,652 @@
+"""
+STRUTTURE PERSISTENTI
+Strutture dati immutabili con condivisione strutturale.
+
+MappaPersistente → hash-array-mapped trie (HAMT), scritture O(log32 n)
+VettorePersistente → trie a 32 vie con coda, aggiunta/modifica/pop O(log32 n)
+ListaCongelata   → list immutabile (valori annidati negli elementi)
+DizionarioCongelato → dict immutabile (valori annidati negli elementi)
+congela          → congela ricorsivamente un valore
+
+Una scrittura non copia la struttura: copia solo il percorso
+dalla radice alla foglia (al più 13 nodi da 32 voci), il resto è condiviso.
+"""
+
+from typing import Any, Iterable, Iterator, Mapping, Optional, Tuple
+from collections.abc import Mapping as _MappingABC, Sequence as _SequenceABC
+from itertools import chain, islice
+
+
+_MANCANTE = object()
+_BITS = 5
+_MASCHERA = (1 << _BITS) - 1
+_HASH_MASCHERA = 0xFFFFFFFFFFFFFFFF
+
+try:
+    _popcount = int.bit_count  # Python 3.10+
+except AttributeError:  # pragma: no cover - Python 3.9
+    def _popcount(x: int) -> int:
+        return bin(x).count('1')
+
+
+def _hash(chiave: Any) -> int:
+    return hash(chiave) & _HASH_MASCHERA
+
+
+# =============================================================================
+# HAMT: nodi
+# =============================================================================
+#
+# Un nodo è (bitmap, voci). Ogni voce è:
+#   - una foglia:     tuple (hash, chiave, valore)
+#   - un sotto-nodo:  _Nodo
+#   - una collisione: _Collisione (stesso hash a 64 bit, chiavi diverse)
+
+class _Nodo:
+    __slots__ = ('bitmap', 'voci')
+
+    def __init__(self, bitmap: int, voci: tuple):
+        self.bitmap = bitmap
+        self.voci = voci
+
+
+class _Collisione:
+    __slots__ = ('hash', 'coppie')
+
+    def __init__(self, h: int, coppie: tuple):
+        self.hash = h
+        self.coppie = coppie  # ((chiave, valore), ...)
+
+
+def _cerca(nodo: _Nodo, h: int, chiave: Any) -> Any:
+    shift = 0
+    while True:
+        bit = 1 << ((h >> shift) & _MASCHERA)
+        if not nodo.bitmap & bit:
+            return _MANCANTE
+        voce = nodo.voci[_popcount(nodo.bitmap & (bit - 1))]
+        tipo = type(voce)
+        if tipo is tuple:
+            if voce[0] == h and (voce[1] is chiave or voce[1] == chiave):
+                return voce[2]
+            return _MANCANTE
+        if tipo is _Collisione:
+            if voce.hash == h:
+                for k, v in voce.coppie:
+                    if k is chiave or k == chiave:
+                        return v
+            return _MANCANTE
+        nodo = voce
+        shift += _BITS
+
+
+def _fondi(shift: int, voce1: Any, h1: int, voce2: Any, h2: int) -> Any:
+    """Crea il sotto-albero minimo che contiene due voci con hash diversi."""
+    if h1 == h2:
+        # Solo foglie possono avere hash identico qui (collisione completa)
+        return _Collisione(h1, ((voce1[1], voce1[2]), (voce2[1], voce2[2])))
+    i1 = (h1 >> shift) & _MASCHERA
+    i2 = (h2 >> shift) & _MASCHERA
+    if i1 == i2:
+        return _Nodo(1 << i1, (_fondi(shift + _BITS, voce1, h1, voce2, h2),))
+    if i1 < i2:
+        return _Nodo((1 << i1) | (1 << i2), (voce1, voce2))
+    return _Nodo((1 << i1) | (1 << i2), (voce2, voce1))
+
+
+def _associa(nodo: _Nodo, shift: int, h: int, chiave: Any, valore: Any) -> Tuple[_Nodo, bool]:
+    """Ritorna (nuovo_nodo, aggiunta). Copia solo il percorso modificato."""
+    bit = 1 << ((h >> shift) & _MASCHERA)
+    idx = _popcount(nodo.bitmap & (bit - 1))
+    voci = nodo.voci
+
+    if not nodo.bitmap & bit:
+        return _Nodo(nodo.bitmap | bit, voci[:idx] + ((h, chiave, valore),) + voci[idx:]), True
+
+    voce = voci[idx]
+    tipo = type(voce)
+    if tipo is tuple:
+        if voce[0] == h and (voce[1] is chiave or voce[1] == chiave):
+            if voce[2] is valore:
+                return nodo, False
+            nuova, aggiunta = (h, chiave, valore), False
+        else:
+            nuova, aggiunta = _fondi(shift + _BITS, voce, voce[0], (h, chiave, valore), h), True
+    elif tipo is _Collisione:
+        if voce.hash == h:
+            coppie = voce.coppie
+            for i, (k, _) in enumerate(coppie):
+                if k is chiave or k == chiave:
+                    nuova = _Collisione(h, coppie[:i] + ((chiave, valore),) + coppie[i + 1:])
+                    aggiunta = False
+                    break
+            else:
+                nuova, aggiunta = _Collisione(h, coppie + ((chiave, valore),)), True
+        else:
+            nuova, aggiunta = _fondi(shift + _BITS, voce, voce.hash, (h, chiave, valore), h), True
+    else:
+        nuova, aggiunta = _associa(voce, shift + _BITS, h, chiave, valore)
+        if nuova is voce:
+            return nodo, False
+
+    return _Nodo(nodo.bitmap, voci[:idx] + (nuova,) + voci[idx + 1:]), aggiunta
+
+
+def _dissocia(nodo: _Nodo, shift: int, h: int, chiave: Any) -> Any:
+    """Ritorna il nuovo nodo, None se vuoto, o lo stesso nodo se chiave assente."""
+    bit = 1 << ((h >> shift) & _MASCHERA)
+    if not nodo.bitmap & bit:
+        return nodo
+    idx = _popcount(nodo.bitmap & (bit - 1))
+    voce = nodo.voci[idx]
+    tipo = type(voce)
+
+    if tipo is tuple:
+        if not (voce[0] == h and (voce[1] is chiave or voce[1] == chiave)):
+            return nodo
+        nuova = None
+    elif tipo is _Collisione:
+        if voce.hash != h:
+            return nodo
+        coppie = tuple(c for c in voce.coppie if not (c[0] is chiave or c[0] == chiave))
+        if len(coppie) == len(voce.coppie):
+            return nodo
+        nuova = (h, coppie[0][0], coppie[0][1]) if len(coppie) == 1 else _Collisione(h, coppie)
+    else:
+        nuova = _dissocia(voce, shift + _BITS, h, chiave)
+        if nuova is voce:
+            return nodo
+        # Un sotto-nodo con una sola foglia risale di livello
+        if nuova is not None and len(nuova.voci) == 1 and type(nuova.voci[0]) is not _Nodo:
+            nuova = nuova.voci[0]
+
+    if nuova is None:
+        if nodo.bitmap == bit:
+            return None
+        return _Nodo(nodo.bitmap & ~bit, nodo.voci[:idx] + nodo.voci[idx + 1:])
+    return _Nodo(nodo.bitmap, nodo.voci[:idx] + (nuova,) + nodo.voci[idx + 1:])
+
+
+def _itera(nodo: _Nodo) -> Iterator[Tuple[Any, Any]]:
+    for voce in nodo.voci:
+        tipo = type(voce)
+        if tipo is tuple:
+            yield voce[1], voce[2]
+        elif tipo is _Collisione:
+            yield from voce.coppie
+        else:
+            yield from _itera(voce)
+
+
+def _voci_di(voce: Any) -> dict:
+    tipo = type(voce)
+    if voce is None:
+        return {}
+    if tipo is tuple:
+        return {voce[1]: voce[2]}
+    if tipo is _Collisione:
+        return dict(voce.coppie)
+    return dict(_itera(voce))
+
+
+def _confronta_nodi(a: _Nodo, b: _Nodo, modifiche: dict, rimossi: list) -> None:
+    """Raccoglie le differenze tra due nodi, saltando i sotto-alberi condivisi."""
+    bitmap = a.bitmap | b.bitmap
+    while bitmap:
+        bit = bitmap & -bitmap
+        bitmap ^= bit
+        va = a.voci[_popcount(a.bitmap & (bit - 1))] if a.bitmap & bit else None
+        vb = b.voci[_popcount(b.bitmap & (bit - 1))] if b.bitmap & bit else None
+        if va is vb:
+            continue
+        if type(va) is _Nodo and type(vb) is _Nodo:
+            _confronta_nodi(va, vb, modifiche, rimossi)
+            continue
+        vecchie, nuove = _voci_di(va), _voci_di(vb)
+        rimossi.extend(k for k in vecchie if k not in nuove)
+        modifiche.update((k, v) for k, v in nuove.items() if vecchie.get(k, _MANCANTE) is not v)
+
+
+def _differenze(vecchia: 'MappaPersistente', nuova: 'MappaPersistente') -> Tuple[dict, tuple]:
+    """
+    (chiavi aggiunte o cambiate → valore, chiavi rimosse) tra due mappe.
+    Visita solo i percorsi non condivisi: O(modifiche × log32 n).
+    """
+    modifiche: dict = {}
+    rimossi: list = []
+    if vecchia._radice is not nuova._radice:
+        _confronta_nodi(vecchia._radice, nuova._radice, modifiche, rimossi)
+    return modifiche, tuple(rimossi)
+
+
+_NODO_VUOTO = _Nodo(0, ())
+
+
+# =============================================================================
+# MappaPersistente
+# =============================================================================
+
+class MappaPersistente(_MappingABC):
+    """
+    Mappa immutabile basata su HAMT.
+
+    >>> m = MappaPersistente({'x': 1})
+    >>> m2 = m.associa('y', 2)
+    >>> (len(m), len(m2), m2['y'])
+    (1, 2, 2)
+    """
+
+    __slots__ = ('_radice', '_n')
+
+    def __init__(self, sorgente: Optional[Mapping] = None):
+        self._radice = _NODO_VUOTO
+        self._n = 0
+        if sorgente:
+            radice, n = _NODO_VUOTO, 0
+            for k, v in sorgente.items():
+                radice, aggiunta = _associa(radice, 0, _hash(k), k, v)
+                n += aggiunta
+            self._radice, self._n = radice, n
+
+    @classmethod
+    def _da_radice(cls, radice: _Nodo, n: int) -> 'MappaPersistente':
+        m = object.__new__(cls)
+        m._radice = radice
+        m._n = n
+        return m
+
+    def __getitem__(self, chiave: Any) -> Any:
+        v = _cerca(self._radice, _hash(chiave), chiave)
+        if v is _MANCANTE:
+            raise KeyError(chiave)
+        return v
+
+    def get(self, chiave: Any, default: Any = None) -> Any:
+        v = _cerca(self._radice, _hash(chiave), chiave)
+        return default if v is _MANCANTE else v
+
+    def __contains__(self, chiave: Any) -> bool:
+        return _cerca(self._radice, _hash(chiave), chiave) is not _MANCANTE
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __iter__(self) -> Iterator[Any]:
+        for k, _ in _itera(self._radice):
+            yield k
+
+    def items(self):
+        return _itera(self._radice)
+
+    def associa(self, chiave: Any, valore: Any) -> 'MappaPersistente':
+        """Ritorna una nuova mappa con chiave → valore (O(log32 n))."""
+        radice, aggiunta = _associa(self._radice, 0, _hash(chiave), chiave, valore)
+        if radice is self._radice:
+            return self
+        return MappaPersistente._da_radice(radice, self._n + aggiunta)
+
+    def dissocia(self, chiave: Any) -> 'MappaPersistente':
+        """Ritorna una nuova mappa senza chiave (O(log32 n))."""
+        radice = _dissocia(self._radice, 0, _hash(chiave), chiave)
+        if radice is self._radice:
+            return self
+        if radice is None:
+            return MappaPersistente._da_radice(_NODO_VUOTO, 0)
+        return MappaPersistente._da_radice(radice, self._n - 1)
+
+    def aggiorna(self, modifiche: Mapping) -> 'MappaPersistente':
+        """Ritorna una nuova mappa con tutte le modifiche applicate."""
+        radice, n = self._radice, self._n
+        for k, v in modifiche.items():
+            radice, aggiunta = _associa(radice, 0, _hash(k), k, v)
+            n += aggiunta
+        return MappaPersistente._da_radice(radice, n)
+
+    def __reduce__(self):
+        return (MappaPersistente, (dict(self.items()),))
+
+    def __repr__(self) -> str:
+        return f'MappaPersistente({dict(self.items())!r})'
+
+
+# =============================================================================
+# VettorePersistente: nodi
+# =============================================================================
+#
+# Trie a 32 vie partizionato per bit (come i vettori di Clojure). I nodi
+# sono tuple: quelli interni contengono nodi, le foglie contengono valori.
+# Gli ultimi 1-32 valori stanno nella coda, fuori dall'albero: aggiungere
+# in fondo copia solo la coda, e una volta su 32 la spinge nell'albero.
+# L'albero è sempre riempito da sinistra: il valore i sta nella foglia
+# raggiunta scendendo con i bit (i >> livello) & 31 a ogni livello.
+
+_LARGHEZZA = 1 << _BITS
+
+
+def _percorso(livello: int, nodo: tuple) -> tuple:
+    """Catena di nodi con un solo figlio sopra nodo, da livello a 0."""
+    while livello > 0:
+        nodo = (nodo,)
+        livello -= _BITS
+    return nodo
+
+
+def _spingi_coda(n: int, livello: int, genitore: tuple, coda: tuple) -> tuple:
+    """Inserisce la coda piena come foglia più a destra (n = valori prima dell'aggiunta)."""
+    sub = ((n - 1) >> livello) & _MASCHERA
+    if livello == _BITS:
+        nodo = coda
+    elif sub < len(genitore):
+        nodo = _spingi_coda(n, livello - _BITS, genitore[sub], coda)
+    else:
+        nodo = _percorso(livello - _BITS, coda)
+    return genitore[:sub] + (nodo,) + genitore[sub + 1:]
+
+
+def _imposta(livello: int, nodo: tuple, i: int, valore: Any) -> tuple:
+    sub = (i >> livello) & _MASCHERA
+    if livello == 0:
+        return nodo[:sub] + (valore,) + nodo[sub + 1:]
+    return nodo[:sub] + (_imposta(livello - _BITS, nodo[sub], i, valore),) + nodo[sub + 1:]
+
+
+def _togli_foglia(n: int, livello: int, nodo: tuple) -> Optional[tuple]:
+    """Rimuove la foglia più a destra (n = valori prima del pop); None se il nodo resta vuoto."""
+    sub = ((n - 2) >> livello) & _MASCHERA
+    if livello > _BITS:
+        figlio = _togli_foglia(n, livello - _BITS, nodo[sub])
+        if figlio is not None:
+            return nodo[:sub] + (figlio,)
+    return nodo[:sub] if sub else None
+
+
+def _foglie(nodo: tuple, livello: int) -> Iterator[tuple]:
+    if livello == _BITS:
+        yield from nodo
+    else:
+        for figlio in nodo:
+            yield from _foglie(figlio, livello - _BITS)
+
+
+# =============================================================================
+# VettorePersistente
+# =============================================================================
+
+class VettorePersistente(_SequenceABC):
+    """
+    Sequenza immutabile con condivisione strutturale.
+
+    aggiunge, imposta e rimuove_ultimo ritornano un nuovo vettore in
+    O(log32 n) copiando solo il percorso modificato. Si confronta
+    uguale a una list o tuple con gli stessi valori e si serializza con
+    pickle come una lista. Non è una list: isinstance(v, list) è falso e
+    json.dumps vuole default=list (o list(v)).
+
+    >>> v = VettorePersistente([1, 2])
+    >>> v2 = v.aggiunge(3)
+    >>> (list(v), list(v2), v2 == [1, 2, 3], v2 == (1, 2, 3))
+    ([1, 2], [1, 2, 3], True, True)
+    >>> import json; json.dumps(v2, default=list)
+    '[1, 2, 3]'
+    """
+
+    __slots__ = ('_n', '_livello', '_radice', '_coda')
+
+    def __init__(self, sorgente: Optional[Iterable[Any]] = None):
+        if type(sorgente) is VettorePersistente:
+            self._n, self._livello = sorgente._n, sorgente._livello
+            self._radice, self._coda = sorgente._radice, sorgente._coda
+            return
+        valori = [] if sorgente is None else list(sorgente)
+        n = len(valori)
+        inizio_coda = ((n - 1) >> _BITS) << _BITS if n > _LARGHEZZA else 0
+        # Costruzione dal basso: foglie piene, poi livelli di nodi da 32
+        nodi = [tuple(valori[i:i + _LARGHEZZA]) for i in range(0, inizio_coda, _LARGHEZZA)]
+        livello = _BITS
+        while len(nodi) > _LARGHEZZA:
+            nodi = [tuple(nodi[i:i + _LARGHEZZA]) for i in range(0, len(nodi), _LARGHEZZA)]
+            livello += _BITS
+        self._n = n
+        self._livello = livello
+        self._radice = tuple(nodi)
+        self._coda = tuple(valori[inizio_coda:])
+
+    @classmethod
+    def _da_parti(cls, n: int, livello: int, radice: tuple, coda: tuple) -> 'VettorePersistente':
+        v = object.__new__(cls)
+        v._n = n
+        v._livello = livello
+        v._radice = radice
+        v._coda = coda
+        return v
+
+    # --- Lettura ---
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, indice: Any) -> Any:
+        n = self._n
+        try:
+            if indice < 0:
+                indice += n
+        except TypeError:
+            if type(indice) is slice:
+                return VettorePersistente(list(self)[indice])
+            raise
+        inizio_coda = n - len(self._coda)
+        if indice >= inizio_coda:
+            if indice >= n:
+                raise IndexError('indice fuori dal vettore')
+            return self._coda[indice - inizio_coda]
+        if indice < 0:
+            raise IndexError('indice fuori dal vettore')
+        nodo = self._radice
+        livello = self._livello
+        while livello:
+            nodo = nodo[(indice >> livello) & _MASCHERA]
+            livello -= _BITS
+        return nodo[indice & _MASCHERA]
+
+    def _foglia(self, indice: int) -> tuple:
+        nodo = self._radice
+        livello = self._livello
+        while livello > 0:
+            nodo = nodo[(indice >> livello) & _MASCHERA]
+            livello -= _BITS
+        return nodo
+
+    def __iter__(self) -> Iterator[Any]:
+        # Itera foglia per foglia in C (chain), senza scendere per ogni valore
+        return chain.from_iterable(chain(_foglie(self._radice, self._livello), (self._coda,)))
+
+    def __reversed__(self) -> Iterator[Any]:
+        return reversed(list(self))
+
+    # --- Scrittura (nuovo vettore) ---
+
+    def aggiunge(self, valore: Any) -> 'VettorePersistente':
+        """Nuovo vettore con valore in fondo."""
+        n, livello, radice, coda = self._n, self._livello, self._radice, self._coda
+        if len(coda) < _LARGHEZZA:
+            return VettorePersistente._da_parti(n + 1, livello, radice, coda + (valore,))
+        # Coda piena: diventa una foglia dell'albero
+        if (n >> _BITS) > (1 << livello):
+            radice = (radice, _percorso(livello, coda))
+            livello += _BITS
+        else:
+            radice = _spingi_coda(n, livello, radice, coda)
+        return VettorePersistente._da_parti(n + 1, livello, radice, (valore,))
+
+    def estende(self, valori: Iterable[Any]) -> 'VettorePersistente':
+        """Nuovo vettore con tutti i valori in fondo."""
+        v = self
+        valori = iter(valori)
+        while True:
+            # Riempie la coda a blocchi invece di un valore alla volta
+            spazio = _LARGHEZZA - len(v._coda)
+            if spazio:
+                blocco = tuple(islice(valori, spazio))
+                if not blocco:
+                    return v
+                v = VettorePersistente._da_parti(v._n + len(blocco), v._livello, v._radice,
+                                                 v._coda + blocco)
+            else:
+                for valore in valori:
+                    v = v.aggiunge(valore)
+                    break
+                else:
+                    return v
+
+    def imposta(self, indice: int, valore: Any) -> 'VettorePersistente':
+        """Nuovo vettore con valore all'indice."""
+        n = self._n
+        if indice < 0:
+            indice += n
+        if not 0 <= indice < n:
+            raise IndexError('indice fuori dal vettore')
+        inizio_coda = n - len(self._coda)
+        if indice >= inizio_coda:
+            j = indice - inizio_coda
+            coda = self._coda[:j] + (valore,) + self._coda[j + 1:]
+            return VettorePersistente._da_parti(n, self._livello, self._radice, coda)
+        radice = _imposta(self._livello, self._radice, indice, valore)
+        return VettorePersistente._da_parti(n, self._livello, radice, self._coda)
+
+    def rimuove_ultimo(self) -> 'VettorePersistente':
+        """Nuovo vettore senza l'ultimo valore."""
+        n = self._n
+        if n == 0:
+            raise IndexError('vettore vuoto')
+        if len(self._coda) > 1 or n == 1:
+            return VettorePersistente._da_parti(n - 1, self._livello, self._radice, self._coda[:-1])
+        # La coda si svuota: l'ultima foglia dell'albero diventa la coda
+        coda = self._foglia(n - 2)
+        radice = _togli_foglia(n, self._livello, self._radice) or ()
+        livello = self._livello
+        if livello > _BITS and len(radice) == 1:
+            radice = radice[0]
+            livello -= _BITS
+        return VettorePersistente._da_parti(n - 1, livello, radice, coda)
+
+    def rimuove_a(self, indice: int) -> 'VettorePersistente':
+        """Nuovo vettore senza il valore all'indice (O(n) salvo l'ultimo)."""
+        n = self._n
+        if indice < 0:
+            indice += n
+        if not 0 <= indice < n:
+            raise IndexError('indice fuori dal vettore')
+        if indice == n - 1:
+            return self.rimuove_ultimo()
+        return VettorePersistente(chain(islice(self, indice), islice(self, indice + 1, None)))
+
+    # --- Interoperabilità con list ---
+
+    def __eq__(self, altro: Any) -> bool:
+        if self is altro:
+            return True
+        if isinstance(altro, (VettorePersistente, list, tuple)):
+            return len(self) == len(altro) and all(a is b or a == b for a, b in zip(self, altro))
+        return NotImplemented
+
+    __hash__ = None  # come list: usa elemento.impronta
+
+    def __add__(self, altro: Any) -> 'VettorePersistente':
+        if isinstance(altro, (VettorePersistente, list, tuple)):
+            return self.estende(altro)
+        return NotImplemented
+
+    def __radd__(self, altro: Any) -> 'VettorePersistente':
+        if isinstance(altro, (list, tuple)):
+            return VettorePersistente(altro).estende(self)
+        return NotImplemented
+
+    def __reduce__(self):
+        return (VettorePersistente, (list(self),))
+
+    def __repr__(self) -> str:
+        return f'VettorePersistente({list(self)!r})'
+
+
+VETTORE_VUOTO = VettorePersistente()
+
+
+# =============================================================================
+# Valori congelati
+# =============================================================================
+
+def _immutabile(self, *args, **kwargs):
+    raise TypeError(f'{type(self).__name__} è immutabile: usa elemento.scrive')
+
+
+class ListaCongelata(list):
+    """
+    list immutabile. Slicing e concatenazione ritornano list normali;
+    copy/deepcopy ritornano una list mutabile (copia esplicita).
+    """
+
+    __slots__ = ()
+
+    append = extend = insert = pop = remove = clear = sort = reverse = _immutabile
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutabile
+
+    def __copy__(self) -> list:
+        return list(self)
+
+    def __deepcopy__(self, memo) -> list:
+        from copy import deepcopy
+        return [deepcopy(v, memo) for v in self]
+
+    def __reduce__(self):
+        return (ListaCongelata, (list(self),))
+
+
+class DizionarioCongelato(dict):
+    """dict immutabile. copy/deepcopy ritornano un dict mutabile."""
+
+    __slots__ = ()
+
+    __setitem__ = __delitem__ = __ior__ = _immutabile
+    clear = pop = popitem = setdefault = update = _immutabile
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo) -> dict:
+        from copy import deepcopy
+        return {k: deepcopy(v, memo) for k, v in self.items()}
+
+    def __reduce__(self):
+        return (DizionarioCongelato, (dict(self),))
+
+
+_IMMUTABILI = frozenset({
+    type(None), bool, int, float, complex, str, bytes,
+    frozenset, ListaCongelata, DizionarioCongelato, MappaPersistente,
+    VettorePersistente,
+})
+
+
+def congela(valore: Any) -> Any:
+    """
+    Congela ricorsivamente un valore: list → ListaCongelata,
+    dict → DizionarioCongelato, set → frozenset. Gli altri tipi restano invariati.
+
+    >>> congela([1, [2]])
+    [1, [2]]
+    >>> type(congela([1])).__name__
+    'ListaCongelata'
+    """
+    tipo = type(valore)
+    if tipo in _IMMUTABILI:
+        return valore
+    if isinstance(valore, list):
+        return ListaCongelata([congela(v) for v in valore])
+    if isinstance(valore, dict):
+        return DizionarioCongelato({k: congela(v) for k, v in valore.items()})
+    if isinstance(valore, tuple):
+        congelati = tuple(congela(v) for v in valore)
+        return valore if all(a is b for a, b in zip(congelati, valore)) else congelati
+    if isinstance(valore, set):
+        return frozenset(valore)
+    return valore
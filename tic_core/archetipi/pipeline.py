@@ -0,0 +1,192 @@
+"""
+PIPELINE — Operazioni su contenitori pigre e fuse
+
+contenitore.filtra → contenitore.mappa → valore.somma materializza una
+lista intera per ogni passaggio. Una Pipeline registra i passaggi e li
+esegue solo al terminale, in un unico passaggio sulla sorgente:
+
+    contenitore.pipeline(tavoli).filtra(tavolo_libero).mappa(posti).somma()
+
+Nessuna lista intermedia: la memoria di picco non dipende dal numero
+di righe. I terminali trova/primo/qualcuno/tutti si fermano al primo
+risultato utile. Ogni passaggio ritorna una nuova Pipeline (immutabile):
+la stessa pipeline parziale si può riusare con terminali diversi, se la
+sorgente si può rileggere (list, range, contenitori, ContenitoreSuFile).
+
+Un iteratore (generatore, file aperto, map) si legge una volta sola: il
+primo terminale lo consuma e un secondo terminale su una pipeline della
+stessa sorgente solleva RuntimeError invece di vedere solo gli item
+rimasti. Per riusarla: contenitore.pipeline(list(gen)), o un iterabile
+che crea un nuovo iteratore a ogni lettura.
+
+Passaggi:   filtra, scarta, mappa, prendi, salta, piatto
+Terminali:  lista, vettore, riduce, somma, conta, minimo, massimo,
+            primi_k, trova, primo, ultimo, qualcuno, tutti
+"""
+
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+from collections import deque
+from collections.abc import Iterator as _IteratorABC
+from itertools import chain, filterfalse, islice
+
+from .persistente import VettorePersistente
+from .classifica import primi_k
+
+# Tipi di passaggio
+_FILTRA = 0
+_SCARTA = 1
+_MAPPA = 2
+_PRENDI = 3
+_SALTA = 4
+_PIATTO = 5
+
+_MANCANTE = object()
+
+
+class _UnaVolta:
+    """Sorgente iteratore condivisa dalle pipeline derivate: una sola lettura."""
+
+    __slots__ = ('_it',)
+
+    def __init__(self, it: Iterator[Any]):
+        self._it = it
+
+    def __iter__(self) -> Iterator[Any]:
+        it = self._it
+        if it is None:
+            raise RuntimeError(
+                "Sorgente della pipeline già letta: un iteratore si legge una volta, "
+                "usa una lista per più terminali"
+            )
+        self._it = None
+        return it
+
+
+class Pipeline:
+    """
+    Catena pigra di passaggi su una sorgente iterabile.
+
+    >>> p = Pipeline(range(10)).filtra(lambda x: x % 2 == 0).mappa(lambda x: x * 10)
+    >>> p.lista()
+    [0, 20, 40, 60, 80]
+    >>> p.somma()
+    200
+    >>> p.trova(lambda x: x > 30)
+    40
+    """
+
+    __slots__ = ('_sorgente', '_passi')
+
+    def __init__(self, sorgente: Iterable[Any], _passi: Tuple[Tuple[int, Any], ...] = ()):
+        if isinstance(sorgente, _IteratorABC):
+            sorgente = _UnaVolta(sorgente)
+        self._sorgente = sorgente
+        self._passi = _passi
+
+    def _con(self, tipo: int, argomento: Any) -> 'Pipeline':
+        return Pipeline(self._sorgente, self._passi + ((tipo, argomento),))
+
+    # --- Passaggi (pigri) ---
+
+    def filtra(self, predicato: Callable[[Any], bool]) -> 'Pipeline':
+        """Tiene gli item che soddisfano predicato."""
+        return self._con(_FILTRA, predicato)
+
+    def scarta(self, predicato: Callable[[Any], bool]) -> 'Pipeline':
+        """Tiene gli item che non soddisfano predicato."""
+        return self._con(_SCARTA, predicato)
+
+    def mappa(self, funzione: Callable[[Any], Any]) -> 'Pipeline':
+        """Trasforma ogni item."""
+        return self._con(_MAPPA, funzione)
+
+    def prendi(self, n: int) -> 'Pipeline':
+        """Solo i primi n item (la sorgente non viene letta oltre)."""
+        return self._con(_PRENDI, n)
+
+    def salta(self, n: int) -> 'Pipeline':
+        """Salta i primi n item."""
+        return self._con(_SALTA, n)
+
+    def piatto(self) -> 'Pipeline':
+        """Appiattisce item che sono a loro volta iterabili."""
+        return self._con(_PIATTO, None)
+
+    # --- Esecuzione ---
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        Un solo iteratore fuso: map/filter/islice del C incatenati,
+        ogni item attraversa tutti i passaggi prima del successivo.
+        """
+        it = iter(self._sorgente)
+        for tipo, argomento in self._passi:
+            if tipo == _FILTRA:
+                it = filter(argomento, it)
+            elif tipo == _MAPPA:
+                it = map(argomento, it)
+            elif tipo == _SCARTA:
+                it = filterfalse(argomento, it)
+            elif tipo == _PRENDI:
+                it = islice(it, argomento)
+            elif tipo == _SALTA:
+                it = islice(it, argomento, None)
+            else:
+                it = chain.from_iterable(it)
+        return it
+
+    # --- Terminali ---
+
+    def lista(self) -> List[Any]:
+        return list(self)
+
+    def vettore(self) -> VettorePersistente:
+        return VettorePersistente(self)
+
+    def riduce(self, funzione: Callable[[Any, Any], Any], iniziale: Any) -> Any:
+        acc = iniziale
+        for x in self:
+            acc = funzione(acc, x)
+        return acc
+
+    def somma(self, iniziale: Any = 0) -> Any:
+        return sum(self, iniziale)
+
+    def conta(self) -> int:
+        n = 0
+        for n, _ in enumerate(self, 1):
+            pass
+        return n
+
+    def minimo(self, chiave: Callable[[Any], Any] = None) -> Optional[Any]:
+        """Minimo (None se vuota)."""
+        return min(self, key=chiave, default=None)
+
+    def massimo(self, chiave: Callable[[Any], Any] = None) -> Optional[Any]:
+        """Massimo (None se vuota)."""
+        return max(self, key=chiave, default=None)
+
+    def primi_k(self, k: int, chiave: Any = None, inverso: bool = False) -> List[Any]:
+        """I primi k per chiave (heap di k item, nessuna lista intera)."""
+        return primi_k(self, k, chiave, inverso)
+
+    def trova(self, predicato: Callable[[Any], bool]) -> Optional[Any]:
+        """Primo item che soddisfa predicato (si ferma lì)."""
+        return next(filter(predicato, self), None)
+
+    def primo(self, default: Any = None) -> Any:
+        return next(iter(self), default)
+
+    def ultimo(self, default: Any = None) -> Any:
+        coda = deque(self, maxlen=1)
+        return coda[0] if coda else default
+
+    def qualcuno(self, predicato: Callable[[Any], bool] = bool) -> bool:
+        return any(map(predicato, self))
+
+    def tutti(self, predicato: Callable[[Any], bool] = bool) -> bool:
+        return all(map(predicato, self))
+
+    def __repr__(self) -> str:
+        nomi = ('filtra', 'scarta', 'mappa', 'prendi', 'salta', 'piatto')
+        return f"Pipeline({' → '.join(nomi[t] for t, _ in self._passi) or 'sorgente'})"
@@ -0,0 +1,162 @@
+"""
+SCHEMA — Record compilati con __slots__
+
+elemento.schema('prodotto', ['sku', 'nome', 'prezzo', 'quantita'])
+genera un tipo record immutabile: un attributo slot per campo,
+niente dict per i dati. Per cataloghi da milioni di prodotti il costo
+per oggetto scende da diverse centinaia di byte a pochi puntatori.
+
+I record sono Elemento: legge/scrive/elimina funzionano tramite
+accessori precompilati. Scrivere un campo fuori schema produce
+un Elemento in forma dict (fallback).
+"""
+
+from typing import Any, Dict, Iterable, Mapping, Tuple
+from operator import attrgetter
+
+from .elemento import Elemento, Meta, META_VUOTO, _con_campi, _come_meta
+from .persistente import congela
+
+
+# Registro degli schemi: lo stesso (nome, campi) ritorna la stessa classe
+_SCHEMI: Dict[Tuple[str, Tuple[str, ...]], type] = {}
+
+_IMPOSTA_META = Elemento._meta.__set__
+
+
+class Record(Elemento):
+    """
+    Base dei record generati da elemento.schema.
+    Non istanziare direttamente: usa elemento.schema(...).
+    """
+
+    __slots__ = ()
+
+    _nome: str = ''
+    _campi_schema: Tuple[str, ...] = ()
+    _accessori: Dict[str, Any] = {}
+    _setter: Dict[str, Any] = {}
+
+    def __init__(self, _meta: Meta = None, **campi: Any):
+        sconosciuti = set(campi) - set(self._campi_schema)
+        if sconosciuti:
+            raise ValueError(f"Campi non nello schema '{self._nome}': {sorted(sconosciuti)}")
+        setter = self._setter
+        for campo, valore in campi.items():
+            setter[campo](self, congela(valore))
+        _IMPOSTA_META(self, _come_meta(_meta))
+
+    def __setattr__(self, nome: str, valore: Any) -> None:
+        raise TypeError(f"Record '{self._nome}' immutabile: usa elemento.scrive")
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        raise TypeError(f"Record '{self._nome}' immutabile: usa elemento.scrive")
+
+    @property
+    def _dati(self) -> Dict[str, Any]:
+        """Vista dict (lenta, per compatibilità): legge usa gli accessori."""
+        dati = {}
+        for campo, accessore in self._accessori.items():
+            try:
+                dati[campo] = accessore(self)
+            except AttributeError:
+                pass
+        return dati
+
+    def __repr__(self) -> str:
+        campi = ', '.join(f'{k}={v!r}' for k, v in self._dati.items())
+        return f'{self._nome}({campi})'
+
+    def __reduce__(self):
+        return (_ricostruisci, (self._nome, self._campi_schema, self._dati, self._meta))
+
+    # --- Interfaccia Elemento ---
+
+    def _legge(self, campo: str, default: Any) -> Any:
+        accessore = self._accessori.get(campo)
+        if accessore is None:
+            return default
+        try:
+            return accessore(self)
+        except AttributeError:  # campo dello schema non valorizzato
+            return default
+
+    def _con_modifiche(self, modifiche: Mapping[str, Any], meta: Meta) -> Elemento:
+        setter = self._setter
+        if not all(campo in setter for campo in modifiche):
+            # Campo fuori schema → fallback alla forma dict
+            return Elemento(_dati=_con_campi(self._dati, modifiche), _meta=meta)
+        nuovo = self._copia(meta)
+        for campo, valore in modifiche.items():
+            setter[campo](nuovo, valore)
+        return nuovo
+
+    def _con_meta(self, meta: Meta) -> Elemento:
+        return self._copia(meta)
+
+    def _campi(self) -> list:
+        return list(self._dati.keys())
+
+    def _copia(self, meta: Meta) -> 'Record':
+        cls = type(self)
+        nuovo = object.__new__(cls)
+        setter = self._setter
+        for campo, accessore in self._accessori.items():
+            try:
+                setter[campo](nuovo, accessore(self))
+            except AttributeError:
+                pass
+        _IMPOSTA_META(nuovo, meta)
+        return nuovo
+
+    @classmethod
+    def da_dati(cls, dati: Mapping[str, Any], meta: Meta = None) -> Elemento:
+        """
+        Costruisce un record da un dict (valori già congelati).
+        Se dati contiene campi fuori schema ritorna un Elemento in forma dict.
+        """
+        setter = cls._setter
+        if not all(campo in setter for campo in dati):
+            return Elemento(_dati=dict(dati), _meta=meta)
+        nuovo = object.__new__(cls)
+        for campo, valore in dati.items():
+            setter[campo](nuovo, valore)
+        _IMPOSTA_META(nuovo, META_VUOTO if meta is None else meta)
+        return nuovo
+
+
+def schema(nome: str, campi: Iterable[str]) -> type:
+    """
+    Genera (o ritorna dal registro) il tipo record per uno schema.
+
+    >>> Punto = schema('punto', ['x', 'y'])
+    >>> p = Punto(x=1, y=2)
+    >>> p
+    punto(x=1, y=2)
+    """
+    campi = tuple(campi)
+    chiave = (nome, campi)
+    if chiave in _SCHEMI:
+        return _SCHEMI[chiave]
+
+    if len(set(campi)) != len(campi):
+        raise ValueError(f"Campi duplicati nello schema '{nome}'")
+    for campo in campi:
+        if not campo.isidentifier() or campo.startswith('_'):
+            raise ValueError(f"Nome di campo non valido per uno schema: '{campo}'")
+
+    cls = type(nome, (Record,), {'__slots__': campi})
+    # Accessori precompilati: attrgetter (C) per leggere, descrittore slot per scrivere
+    type.__setattr__(cls, '_nome', nome)
+    type.__setattr__(cls, '_campi_schema', campi)
+    type.__setattr__(cls, '_accessori', {c: attrgetter(c) for c in campi})
+    type.__setattr__(cls, '_setter', {c: cls.__dict__[c].__set__ for c in campi})
+
+    _SCHEMI[chiave] = cls
+    return cls
+
+
+def _ricostruisci(nome: str, campi: Tuple[str, ...], dati: Dict[str, Any],
+                  meta: Meta) -> Elemento:
+    """Ricostruzione per pickle: ricrea lo schema dal registro."""
+    return schema(nome, campi).da_dati(dati, meta)
@@ -0,0 +1,220 @@
+"""
+STORIA — Versioni con delta per undo/redo
+
+Nulla è mutato, quindi ogni versione resta valida: ma conservarle tutte
+intere costa stato × versioni. Storia registra solo le differenze tra
+versioni successive, con un checkpoint completo ogni N versioni:
+
+  - Elemento:    campi modificati/aggiunti, campi rimossi, metadata
+  - list/tuple: il tratto sostituito (prefisso e suffisso comuni esclusi)
+  - VettorePersistente: la versione intera, che condivide già la struttura
+  - altri valori: la versione intera
+
+Ricostruire una versione applica al più N-1 delta dal checkpoint precedente,
+su un solo buffer mutabile (lista o campi modificati) congelato alla fine:
+O(n + catena) invece di una copia completa per delta.
+
+Uso:
+    storia = Storia(canvas)
+    storia.registra(elemento.scrive(canvas, 'selezione', nuova))
+    canvas = storia.annulla()      # undo
+    canvas = storia.ripristina()   # redo
+"""
+
+from typing import Any, List, Optional, Tuple
+
+from .elemento import Elemento
+from .persistente import MappaPersistente, _differenze
+
+# Tipi di delta
+_INTERO = 0       # (_INTERO, valore)
+_ELEMENTO = 1     # (_ELEMENTO, modifiche, rimossi, meta)
+_SEQUENZA = 2     # (_SEQUENZA, inizio, fine_vecchia, nuovi)
+
+
+class Storia:
+    """
+    Cronologia di versioni immutabili con undo/redo.
+
+    checkpoint_ogni: ogni quante versioni salvare uno stato completo
+
+    >>> from tic_core.archetipi import elemento
+    >>> s = Storia(elemento.crea({'x': 1}))
+    >>> _ = s.registra(elemento.scrive(s.corrente, 'x', 2))
+    >>> elemento.legge(s.annulla(), 'x')
+    1
+    >>> elemento.legge(s.ripristina(), 'x')
+    2
+    """
+
+    def __init__(self, iniziale: Any, checkpoint_ogni: int = 32):
+        if checkpoint_ogni < 1:
+            raise ValueError("checkpoint_ogni deve essere almeno 1")
+        self._ogni = checkpoint_ogni
+        # Una voce per versione: stato completo (checkpoint) o delta dalla precedente
+        self._voci: List[Tuple[bool, Any]] = [(True, iniziale)]
+        self._cursore = 0
+        self._corrente = iniziale
+
+    @property
+    def corrente(self) -> Any:
+        """Versione al cursore."""
+        return self._corrente
+
+    @property
+    def posizione(self) -> int:
+        """Indice della versione corrente."""
+        return self._cursore
+
+    def __len__(self) -> int:
+        return len(self._voci)
+
+    def registra(self, nuova: Any) -> int:
+        """
+        Registra una nuova versione dopo la corrente e ritorna il suo indice.
+        Le versioni annullate (redo) vengono scartate.
+        """
+        del self._voci[self._cursore + 1:]
+        indice = len(self._voci)
+        if indice % self._ogni == 0:
+            self._voci.append((True, nuova))
+        else:
+            self._voci.append((False, _delta(self._corrente, nuova)))
+        self._cursore = indice
+        self._corrente = nuova
+        return indice
+
+    def versione(self, indice: int) -> Any:
+        """Ricostruisce una versione dal checkpoint precedente."""
+        if indice < 0:
+            indice += len(self._voci)
+        if not 0 <= indice < len(self._voci):
+            raise IndexError('versione inesistente')
+        if indice == self._cursore:
+            return self._corrente
+        base = indice - indice % self._ogni
+        delta = [voce[1] for voce in self._voci[base + 1:indice + 1]]
+        return _applica_catena(self._voci[base][1], delta)
+
+    def puo_annullare(self) -> bool:
+        return self._cursore > 0
+
+    def puo_ripristinare(self) -> bool:
+        return self._cursore < len(self._voci) - 1
+
+    def annulla(self) -> Optional[Any]:
+        """Undo: torna alla versione precedente (None se non c'è)."""
+        if not self.puo_annullare():
+            return None
+        return self._vai(self._cursore - 1)
+
+    def ripristina(self) -> Optional[Any]:
+        """Redo: torna alla versione successiva (None se non c'è)."""
+        if not self.puo_ripristinare():
+            return None
+        return self._vai(self._cursore + 1)
+
+    def _vai(self, indice: int) -> Any:
+        if indice == self._cursore + 1 and not self._voci[indice][0]:
+            valore = _applica_catena(self._corrente, [self._voci[indice][1]])  # un solo delta
+        else:
+            valore = self.versione(indice)
+        self._cursore = indice
+        self._corrente = valore
+        return valore
+
+
+# === Delta ===
+
+def _delta(vecchio: Any, nuovo: Any) -> tuple:
+    """Differenza tra due versioni successive."""
+    if type(vecchio) is type(nuovo):
+        if isinstance(nuovo, Elemento):
+            return _delta_elemento(vecchio, nuovo)
+        if isinstance(nuovo, (list, tuple)):
+            return _delta_sequenza(vecchio, nuovo)
+    return (_INTERO, nuovo)
+
+
+def _delta_elemento(vecchio: Elemento, nuovo: Elemento) -> tuple:
+    dati_vecchi = vecchio._dati
+    dati_nuovi = nuovo._dati
+    if dati_vecchi is dati_nuovi:
+        return (_ELEMENTO, {}, (), nuovo._meta)
+    if type(dati_vecchi) is MappaPersistente and type(dati_nuovi) is MappaPersistente:
+        # HAMT: si visitano solo i percorsi copiati dalla scrittura
+        modifiche, rimossi = _differenze(dati_vecchi, dati_nuovi)
+        return (_ELEMENTO, modifiche, rimossi, nuovo._meta)
+    assente = object()
+    modifiche = {
+        k: v for k, v in dati_nuovi.items()
+        if dati_vecchi.get(k, assente) is not v
+    }
+    rimossi = tuple(k for k in dati_vecchi if k not in dati_nuovi)
+    return (_ELEMENTO, modifiche, rimossi, nuovo._meta)
+
+
+def _delta_sequenza(vecchio: Any, nuovo: Any) -> tuple:
+    # Prefisso e suffisso comuni (identità prima: di solito gli item sono condivisi)
+    limite = min(len(vecchio), len(nuovo))
+    inizio = 0
+    while inizio < limite and _stesso(vecchio[inizio], nuovo[inizio]):
+        inizio += 1
+    fine = 0
+    while fine < limite - inizio and _stesso(vecchio[-1 - fine], nuovo[-1 - fine]):
+        fine += 1
+    return (_SEQUENZA, inizio, len(vecchio) - fine, tuple(nuovo[inizio:len(nuovo) - fine]))
+
+
+def _stesso(a: Any, b: Any) -> bool:
+    return a is b or (type(a) is type(b) and a == b)
+
+
+_RIMOSSO = object()
+
+
+def _applica_catena(valore: Any, delta: List[tuple]) -> Any:
+    """
+    Applica una serie di delta consecutivi. I delta di sequenza modificano
+    una sola lista, quelli di elemento accumulano i campi cambiati; la
+    versione immutabile si costruisce una volta alla fine.
+    """
+    lista: Optional[list] = None   # buffer dei delta di sequenza
+    campi: Optional[dict] = None   # campo → valore (o _RIMOSSO) dei delta di elemento
+    meta = None
+    for d in delta:
+        tipo = d[0]
+        if tipo == _INTERO:
+            # Tra versioni di tipo diverso c'è sempre un delta intero: il buffer si scarta
+            valore, lista, campi = d[1], None, None
+        elif tipo == _SEQUENZA:
+            if lista is None:
+                lista = list(valore)
+            _, inizio, fine, nuovi = d
+            lista[inizio:fine] = nuovi
+        else:
+            if campi is None:
+                campi = {}
+            _, modifiche, rimossi, meta = d
+            for k in rimossi:
+                campi[k] = _RIMOSSO
+            campi.update(modifiche)
+    if lista is not None:
+        return lista if type(valore) is list else type(valore)(lista)
+    if campi is None:
+        return valore
+    rimossi = {k for k, v in campi.items() if v is _RIMOSSO}
+    if not rimossi:
+        if not campi:
+            return valore._con_meta(meta)
+        return valore._con_modifiche(campi, meta)
+    for k in rimossi:
+        del campi[k]
+    dati = valore._dati
+    if type(dati) is MappaPersistente:
+        for k in rimossi:
+            dati = dati.dissocia(k)
+        return Elemento(_dati=dati.aggiorna(campi), _meta=meta)
+    dati = {k: v for k, v in dati.items() if k not in rimossi}
+    dati.update(campi)
+    return Elemento(_dati=dati, _meta=meta)
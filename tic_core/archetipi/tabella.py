@@ -0,0 +1,311 @@
+"""
+TABELLA — Elementi dello stesso schema in forma colonnare
+
+ElementoTabella salva N elementi come un array per campo:
+  - NumPy (se installato) per colonne omogenee int/float/bool
+  - array.array ('q'/'d') per colonne int/float senza NumPy
+  - tuple per tutte le altre colonne
+
+Le query aggregate leggono una colonna intera invece di chiamare
+elemento.legge N volte:
+
+    tabella = ElementoTabella.da_righe(prodotti)
+    tabella.somma_prodotto('prezzo', 'quantita')   # valore inventario
+    disponibili = tabella.filtra(tabella.maschera('quantita', lambda q: q > 0))
+
+Iterando si ottengono righe (RigaTabella): viste che si comportano come
+Elemento per gli archetipi (legge/scrive/elimina). Scrivere una riga
+produce un Elemento normale: la tabella non cambia mai.
+
+Le colonne in ingresso vengono copiate e quelle restituite da
+legge_colonna sono in sola lettura. Le somme di interi oltre int64
+ripiegano sugli interi Python, come sum().
+"""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+from array import array
+from itertools import compress
+from operator import mul
+
+from .elemento import Elemento, Meta, _con_campi, _meta_nuovo
+from .vettoriale import _INT64_MAX, _somma_entro_int64
+
+try:
+    import numpy as np
+except ImportError:  # NumPy è opzionale: ripiego su array.array
+    np = None
+
+
+class ElementoTabella:
+    """
+    Collezione colonnare immutabile di elementi con gli stessi campi.
+
+    >>> t = ElementoTabella({'sku': ['A', 'B'], 'prezzo': [10, 20]})
+    >>> len(t)
+    2
+    >>> [int(x) for x in t.legge_colonna('prezzo')]
+    [10, 20]
+    """
+
+    __slots__ = ('_colonne', '_lettori', '_n', '_meta')
+
+    def __init__(self, colonne: Mapping[str, Sequence[Any]], _meta: Meta = None):
+        self._colonne: Dict[str, Any] = {}
+        self._lettori: Dict[str, Callable[[int], Any]] = {}
+        lunghezze = set()
+        for campo, valori in colonne.items():
+            colonna = _colonna(valori)
+            self._colonne[campo] = colonna
+            self._lettori[campo] = _lettore(colonna)
+            lunghezze.add(len(colonna))
+        if len(lunghezze) > 1:
+            raise ValueError(f"Colonne di lunghezza diversa: {sorted(lunghezze)}")
+        self._n = lunghezze.pop() if lunghezze else 0
+        self._meta = _meta_nuovo() if _meta is None else _meta
+
+    @classmethod
+    def da_righe(cls, righe: Iterable[Any], campi: Sequence[str] = None) -> 'ElementoTabella':
+        """
+        Costruisce una tabella da elementi (o dict).
+        campi: default, i campi del primo elemento.
+
+        >>> from tic_core.archetipi import elemento
+        >>> t = ElementoTabella.da_righe([elemento.crea({'x': 1}), elemento.crea({'x': 2})])
+        >>> t.somma('x')
+        3
+        """
+        from .elemento import elemento
+        righe = list(righe)
+        if campi is None:
+            campi = elemento.campi(righe[0]) if righe else []
+        return cls({campo: [elemento.legge(r, campo) for r in righe] for campo in campi})
+
+    # --- Colonne ---
+
+    def legge_colonna(self, campo: str) -> Sequence[Any]:
+        """
+        Colonna intera, in sola lettura: ndarray non scrivibile,
+        memoryview (array.array senza NumPy) o tuple.
+        """
+        colonna = self._interna(campo)
+        if np is not None and isinstance(colonna, np.ndarray):
+            return colonna.view()  # la base non è scrivibile: nemmeno la vista
+        if isinstance(colonna, array):
+            return memoryview(colonna).toreadonly()
+        return colonna
+
+    def _interna(self, campo: str) -> Any:
+        try:
+            return self._colonne[campo]
+        except KeyError:
+            raise KeyError(f"Campo non nella tabella: '{campo}'") from None
+
+    @property
+    def campi(self) -> List[str]:
+        return list(self._colonne)
+
+    def maschera(self, campo: str, predicato: Callable[[Any], bool]) -> List[bool]:
+        """
+        Maschera booleana: predicato applicato a ogni valore della colonna.
+        Con NumPy si può costruire direttamente: tabella.legge_colonna('q') > 0
+        """
+        return list(map(predicato, _come_python(self._interna(campo))))
+
+    def filtra(self, maschera: Sequence[bool]) -> 'ElementoTabella':
+        """Nuova tabella con le sole righe dove maschera è vera."""
+        if len(maschera) != self._n:
+            raise ValueError(f"Maschera di lunghezza {len(maschera)}, attesa {self._n}")
+        if np is not None:
+            maschera = np.asarray(maschera, dtype=bool)
+        else:
+            maschera = list(maschera)
+        return ElementoTabella(
+            {campo: _filtra_colonna(colonna, maschera) for campo, colonna in self._colonne.items()},
+            self._meta,
+        )
+
+    # --- Aggregazioni vettoriali ---
+
+    def somma(self, campo: str) -> Any:
+        """Somma della colonna (0 se vuota)."""
+        colonna = self._interna(campo)
+        if np is not None and isinstance(colonna, np.ndarray):
+            if _somma_entro_int64(colonna):
+                return colonna.sum().item()
+            return sum(colonna.tolist())
+        return sum(colonna)
+
+    def somma_prodotto(self, campo_a: str, campo_b: str) -> Any:
+        """
+        Somma dei prodotti riga per riga (es. prezzo × quantità).
+
+        >>> t = ElementoTabella({'prezzo': [10, 20], 'quantita': [5, 3]})
+        >>> t.somma_prodotto('prezzo', 'quantita')
+        110
+        """
+        a = self._interna(campo_a)
+        b = self._interna(campo_b)
+        if np is not None and isinstance(a, np.ndarray) and isinstance(b, np.ndarray):
+            if _prodotti_entro_int64(a, b):
+                return (a * b).sum().item()
+            return sum(map(mul, a.tolist(), b.tolist()))
+        return sum(map(mul, a, b))
+
+    def minimo(self, campo: str) -> Optional[Any]:
+        """Minimo della colonna (None se vuota)."""
+        colonna = self._interna(campo)
+        if not self._n:
+            return None
+        if np is not None and isinstance(colonna, np.ndarray):
+            return colonna.min().item()
+        return min(colonna)
+
+    def massimo(self, campo: str) -> Optional[Any]:
+        """Massimo della colonna (None se vuota)."""
+        colonna = self._interna(campo)
+        if not self._n:
+            return None
+        if np is not None and isinstance(colonna, np.ndarray):
+            return colonna.max().item()
+        return max(colonna)
+
+    # --- Righe ---
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __iter__(self) -> Iterator['RigaTabella']:
+        for i in range(self._n):
+            yield RigaTabella(self, i)
+
+    def __getitem__(self, indice: int) -> 'RigaTabella':
+        if indice < 0:
+            indice += self._n
+        if not 0 <= indice < self._n:
+            raise IndexError('indice fuori dalla tabella')
+        return RigaTabella(self, indice)
+
+    def __repr__(self) -> str:
+        return f'ElementoTabella(righe={self._n}, campi={self.campi})'
+
+
+class RigaTabella(Elemento):
+    """
+    Vista su una riga di ElementoTabella.
+
+    Legge direttamente dalle colonne; scrive/modifica/elimina
+    producono un Elemento in forma dict (copy-on-write).
+    """
+
+    __slots__ = ('_tabella', '_indice')
+
+    def __init__(self, tabella: ElementoTabella, indice: int):
+        _IMPOSTA_TABELLA(self, tabella)
+        _IMPOSTA_INDICE(self, indice)
+        _IMPOSTA_META(self, tabella._meta)
+
+    def __setattr__(self, nome: str, valore: Any) -> None:
+        raise TypeError("Riga di tabella immutabile: usa elemento.scrive")
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        raise TypeError("Riga di tabella immutabile: usa elemento.scrive")
+
+    @property
+    def _dati(self) -> Dict[str, Any]:
+        i = self._indice
+        return {campo: lettore(i) for campo, lettore in self._tabella._lettori.items()}
+
+    def __repr__(self) -> str:
+        return f'RigaTabella({self._indice}, {self._dati!r})'
+
+    def __reduce__(self):
+        return (Elemento, (self._dati, self._meta))
+
+    # --- Interfaccia Elemento ---
+
+    def _legge(self, campo: str, default: Any) -> Any:
+        lettore = self._tabella._lettori.get(campo)
+        if lettore is None:
+            return default
+        return lettore(self._indice)
+
+    def _con_modifiche(self, modifiche: Mapping[str, Any], meta: Meta) -> Elemento:
+        return Elemento(_dati=_con_campi(self._dati, modifiche), _meta=meta)
+
+    def _con_meta(self, meta: Meta) -> Elemento:
+        return Elemento(_dati=self._dati, _meta=meta)
+
+    def _campi(self) -> list:
+        return list(self._tabella._colonne)
+
+
+_IMPOSTA_TABELLA = RigaTabella._tabella.__set__
+_IMPOSTA_INDICE = RigaTabella._indice.__set__
+_IMPOSTA_META = Elemento._meta.__set__
+
+
+# === Colonne ===
+
+def _colonna(valori: Sequence[Any]) -> Any:
+    """
+    Sceglie la rappresentazione più compatta per una colonna. Gli array
+    in ingresso si copiano: chi li ha passati non può cambiare la tabella.
+    """
+    if np is not None and isinstance(valori, np.ndarray):
+        return _sola_lettura(valori.copy())
+    if isinstance(valori, array):
+        return array(valori.typecode, valori)
+    valori = list(valori)
+    tipi = set(map(type, valori))
+    if len(tipi) == 1:
+        tipo = tipi.pop()
+        if np is not None and tipo in (int, float, bool):
+            try:
+                return _sola_lettura(np.array(valori, dtype=_DTYPE[tipo]))
+            except OverflowError:
+                pass
+        elif tipo in _CODICI:
+            try:
+                return array(_CODICI[tipo], valori)
+            except OverflowError:  # interi oltre 64 bit
+                pass
+    return tuple(valori)
+
+
+_DTYPE = {int: 'int64', float: 'float64', bool: 'bool'}
+_CODICI = {int: 'q', float: 'd'}
+
+
+def _sola_lettura(arr: Any) -> Any:
+    arr.flags.writeable = False
+    return arr
+
+
+def _prodotti_entro_int64(a: Any, b: Any) -> bool:
+    """La somma dei prodotti di due colonne intere resta in int64?"""
+    if a.dtype.kind not in 'iu' or b.dtype.kind not in 'iu' or not len(a):
+        return True
+    picco_a = max(abs(int(a.min())), abs(int(a.max())))
+    picco_b = max(abs(int(b.min())), abs(int(b.max())))
+    return picco_a * picco_b * len(a) <= _INT64_MAX
+
+
+def _lettore(colonna: Any) -> Callable[[int], Any]:
+    """Lettura per indice che ritorna sempre scalari Python."""
+    if np is not None and isinstance(colonna, np.ndarray):
+        return colonna.item
+    return colonna.__getitem__
+
+
+def _filtra_colonna(colonna: Any, maschera: Any) -> Any:
+    if np is not None and isinstance(colonna, np.ndarray):
+        return colonna[maschera]
+    if isinstance(colonna, array):
+        return array(colonna.typecode, compress(colonna, maschera))
+    return tuple(compress(colonna, maschera))
+
+
+def _come_python(colonna: Any) -> Sequence[Any]:
+    if np is not None and isinstance(colonna, np.ndarray):
+        return colonna.tolist()
+    return colonna
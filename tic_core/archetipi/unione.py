@@ -0,0 +1,137 @@
+"""
+UNIONE — Hash join tra contenitori
+
+Abbinare gli item di un carrello ai prodotti con un trova per item
+costa O(item × prodotti). unisci_per costruisce una tabella hash su un
+lato e la sonda con l'altro: O(sx + dx).
+
+    contenitore.unisci_per(items, catalogo, 'prodotto_sku', 'sku')
+    → [(item, prodotto), ...]
+
+tipo='inner': solo le coppie con la chiave uguale; la tabella si
+costruisce sul lato più piccolo.
+tipo='left':  ogni item di sx, con None se non ha corrispondenze; la
+tabella è sempre su dx.
+
+Un item abbinato a più item dell'altro lato produce una coppia per
+ognuno. L'ordine è quello di sx (e di dx a parità di item sx). Le
+chiavi None non si abbinano mai, come NULL in SQL.
+
+Se dx è un contenitore indicizzato sulla chiave e sx è molto più
+piccolo (gli item di un carrello contro il catalogo), il suo indice è
+già la tabella: niente costruzione. Con flusso=True si ottiene un
+generatore che sonda con sx un item alla volta (sx può essere un
+iteratore senza fine; dx viene letto tutto).
+"""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from operator import itemgetter
+
+from .indicizzato import ContenitoreIndicizzato
+from .ordinato import _funzione_chiave
+
+Chiave = Union[str, Callable[[Any], Any]]
+
+_NESSUNO: Tuple[Any, ...] = ()
+
+# L'indice di dx si usa se len(sx) * _RAPPORTO_INDICE < len(dx)
+_RAPPORTO_INDICE = 4
+
+
+def _tabella(items: Iterable[Any], leggi: Callable[[Any], Any]) -> Dict[Any, List[Any]]:
+    tabella: Dict[Any, List[Any]] = {}
+    for item in items:
+        k = leggi(item)
+        if k is None:
+            continue
+        gruppo = tabella.get(k)
+        if gruppo is None:
+            tabella[k] = [item]
+        else:
+            gruppo.append(item)
+    return tabella
+
+
+def _usa_indice(sx: Any, dx: Any, chiave_dx: Chiave) -> bool:
+    """
+    True se conviene sondare l'indice di dx invece di costruire una tabella:
+    una lettura dall'indice costa come qualche inserimento in un dict, quindi
+    solo se sx è molto più piccolo di dx (o di lunghezza ignota).
+    """
+    if (type(dx) is not ContenitoreIndicizzato or not isinstance(chiave_dx, str)
+            or chiave_dx not in dx.chiavi):
+        return False
+    return not hasattr(sx, '__len__') or len(sx) * _RAPPORTO_INDICE < len(dx)
+
+
+def _cerca_dx(dx: Any, chiave_dx: Chiave, indice: bool) -> Callable[[Any], Iterable[Any]]:
+    """chiave → item di dx con quella chiave (indice esistente o tabella hash nuova)."""
+    if indice:
+        posizioni = dx._indici[chiave_dx].get
+        leggi = dx.__getitem__
+
+        def dall_indice(k: Any) -> Iterable[Any]:
+            return map(leggi, posizioni(k, _NESSUNO))
+        return dall_indice
+    tabella = _tabella(dx, _funzione_chiave(chiave_dx))
+    cerca = tabella.get
+    return lambda k: cerca(k, _NESSUNO)
+
+
+def _sonda(sx: Iterable[Any], leggi_sx: Callable[[Any], Any],
+           cerca: Callable[[Any], Iterable[Any]], sinistra: bool) -> Iterator[Tuple[Any, Any]]:
+    for s in sx:
+        k = leggi_sx(s)
+        trovato = False
+        if k is not None:
+            for d in cerca(k):
+                trovato = True
+                yield (s, d)
+        if sinistra and not trovato:
+            yield (s, None)
+
+
+def unisci_per(sx: Iterable[Any], dx: Iterable[Any], chiave_sx: Chiave,
+               chiave_dx: Optional[Chiave] = None, tipo: str = 'inner',
+               flusso: bool = False) -> Union[List[Tuple[Any, Any]], Iterator[Tuple[Any, Any]]]:
+    """
+    Coppie (item sx, item dx) con chiave_sx == chiave_dx (campi o funzioni).
+    chiave_dx: default uguale a chiave_sx.
+
+    >>> items = [{'sku': 'A', 'qty': 2}, {'sku': 'Z', 'qty': 1}]
+    >>> prodotti = [{'sku': 'A', 'prezzo': 5}, {'sku': 'B', 'prezzo': 7}]
+    >>> unisci_per(items, prodotti, 'sku')
+    [({'sku': 'A', 'qty': 2}, {'sku': 'A', 'prezzo': 5})]
+    >>> [d for _, d in unisci_per(items, prodotti, 'sku', tipo='left')]
+    [{'sku': 'A', 'prezzo': 5}, None]
+    """
+    if tipo not in ('inner', 'left'):
+        raise ValueError(f"Tipo di unione non valido: '{tipo}' (ammessi: inner, left)")
+    if chiave_dx is None:
+        chiave_dx = chiave_sx
+    leggi_sx = _funzione_chiave(chiave_sx)
+    sinistra = tipo == 'left'
+
+    indice = _usa_indice(sx, dx, chiave_dx)
+    if flusso:
+        return _sonda(sx, leggi_sx, _cerca_dx(dx, chiave_dx, indice), sinistra)
+
+    if (not sinistra and not indice
+            and hasattr(sx, '__len__') and hasattr(dx, '__len__') and len(sx) < len(dx)):
+        return _unisci_su_sx(sx, dx, leggi_sx, _funzione_chiave(chiave_dx))
+    return list(_sonda(sx, leggi_sx, _cerca_dx(dx, chiave_dx, indice), sinistra))
+
+
+def _unisci_su_sx(sx: Iterable[Any], dx: Iterable[Any], leggi_sx: Callable[[Any], Any],
+                  leggi_dx: Callable[[Any], Any]) -> List[Tuple[Any, Any]]:
+    """Inner join con la tabella sul lato sinistro (il più piccolo), risultato in ordine di sx."""
+    sx = list(sx)
+    tabella = _tabella(range(len(sx)), lambda i: leggi_sx(sx[i]))
+    coppie = []
+    for d in dx:
+        k = leggi_dx(d)
+        if k is not None:
+            for i in tabella.get(k, _NESSUNO):
+                coppie.append((i, d))
+    coppie.sort(key=itemgetter(0))  # stabile: a parità di item sx resta l'ordine di dx
+    return [(sx[i], d) for i, d in coppie]
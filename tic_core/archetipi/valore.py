@@ -16,6 +16,11 @@ valore.media      → media di lista
 
 from typing import Any, List, Optional, Union
 
+try:
+    import numpy as np
+except ImportError:  # NumPy è opzionale: solo per le riduzioni su ndarray
+    np = None
+
 Numero = Union[int, float]
 
 
@@ -87,6 +92,8 @@ class _ValoreArchetipo:
         >>> valore.minimo([3, 1, 4, 1, 5])
         1
         """
+        if _ndarray(valori):
+            return valori.min().item() if len(valori) else None
         return min(valori) if valori else None
 
     @staticmethod
@@ -94,6 +101,8 @@ class _ValoreArchetipo:
         """
         valore.massimo → max(valori)
         """
+        if _ndarray(valori):
+            return valori.max().item() if len(valori) else None
         return max(valori) if valori else None
 
     @staticmethod
@@ -104,6 +113,11 @@ class _ValoreArchetipo:
         >>> valore.somma([1, 2, 3, 4])
         10
         """
+        if _ndarray(valori):
+            from .vettoriale import _somma_entro_int64  # vettoriale importa valore
+            if not len(valori) or _somma_entro_int64(valori):
+                return valori.sum().item()
+            return sum(valori.tolist())  # interi Python: niente overflow int64
         return sum(valori)
 
     @staticmethod
@@ -114,6 +128,8 @@ class _ValoreArchetipo:
         >>> valore.media([2, 4, 6])
         4.0
         """
+        if _ndarray(valori):
+            return valori.mean().item() if len(valori) else None
         if not valori:
             return None
         return sum(valori) / len(valori)
@@ -161,5 +177,10 @@ class _ValoreArchetipo:
         return n == 0
 
 
+def _ndarray(valori: Any) -> bool:
+    """ndarray NumPy: riduzione vettoriale con risultato scalare Python."""
+    return np is not None and isinstance(valori, np.ndarray)
+
+
 # Istanza singleton per uso come namespace
 valore = _ValoreArchetipo()
@@ -0,0 +1,252 @@
+"""
+VETTORIALE — Kernel per contenitori numerici
+
+contenitore.mappa/filtra/riduce chiamano la funzione una volta per item.
+Quando la funzione è una primitiva pura riconosciuta, il ciclo diventa
+un kernel:
+
+  - ndarray e array.array, con NumPy: un'operazione vettoriale
+  - list/tuple/vettori: map/filter con funzioni di operator (ciclo in C);
+    convertire in ndarray e ritorno costa più del ciclo stesso, quindi
+    si passa da NumPy solo per le primitive senza equivalente in operator
+    (divide, tra) e solo se i valori sono tutti int o tutti float
+
+Primitive riconosciute (da sole o con functools.partial sui parametri
+dopo il primo, es. partial(valore.moltiplica, fattore=2)):
+
+    valore:    incrementa, decrementa, moltiplica, divide, assoluto,
+               arrotonda (decimali=0), positivo, negativo, zero
+    confronta: uguale, diverso, maggiore, minore, almeno, alpiù,
+               sopra, sotto, tra, vero, falso
+    riduce:    valore.incrementa / operator.add (somma),
+               valore.moltiplica / operator.mul (prodotto), min, max
+
+Le lambda e le altre funzioni sono opache: ciclo Python come prima.
+Gli interi NumPy sono a 64 bit: se il risultato può uscire da int64
+(controllato su minimo e massimo) si resta sul ciclo Python.
+Le somme di float possono differire nell'ultima cifra (NumPy somma a
+coppie invece che in sequenza).
+"""
+
+from typing import Any, Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+from array import array
+from functools import partial
+from itertools import chain, compress
+from math import prod
+import operator
+
+from .valore import valore
+from .confronta import confronta
+from .persistente import VettorePersistente
+
+try:
+    import numpy as np
+except ImportError:  # NumPy è opzionale: kernel con operator
+    np = None
+
+# Sotto questa lunghezza la conversione costa più del ciclo
+SOGLIA_VETTORIALE = 64
+
+_INT64_MIN = -(1 << 63)
+_INT64_MAX = (1 << 63) - 1
+
+
+class Kernel(NamedTuple):
+    """Una primitiva riconosciuta, con i parametri già applicati."""
+    numpy: Callable[[Any], Any]           # ndarray → ndarray
+    python: Optional[Callable[[Any], Any]]  # callable in C, None se non c'è
+    scalare: Callable[[Any], Any]         # la funzione originale
+    aritmetico: bool                      # può uscire da int64
+
+
+# === Tabelle delle primitive ===
+
+# funzione → (kernel numpy, kernel operator, aritmetico)
+_UNARI: Dict[Callable, Tuple[Callable, Optional[Callable], bool]] = {
+    valore.assoluto: (lambda a: abs(a), abs, True),
+    abs: (lambda a: abs(a), abs, True),
+    valore.incrementa: (lambda a: a + 1, partial(operator.add, 1), True),
+    valore.decrementa: (lambda a: a - 1, partial(operator.add, -1), True),
+    valore.arrotonda: (lambda a: a.round(0), partial(round, ndigits=0), False),
+    valore.positivo: (lambda a: a > 0, partial(operator.lt, 0), False),
+    valore.negativo: (lambda a: a < 0, partial(operator.gt, 0), False),
+    valore.zero: (lambda a: a == 0, partial(operator.eq, 0), False),
+    confronta.vero: (lambda a: a != 0, bool, False),
+    confronta.falso: (lambda a: a == 0, operator.not_, False),
+}
+
+
+def _confronto(np_op: Callable, op_riflesso: Callable) -> Callable:
+    # x > v  ⇔  v < x: partial(op_riflesso, v) confronta in C
+    return lambda v: (lambda a: np_op(a, v), partial(op_riflesso, v), False)
+
+
+# funzione → (nome del parametro, costruttore(valore) → voce come in _UNARI)
+_BINARI: Dict[Callable, Tuple[str, Callable[[Any], Tuple[Callable, Optional[Callable], bool]]]] = {
+    valore.incrementa: ('delta', lambda v: (lambda a: a + v, partial(operator.add, v), True)),
+    valore.decrementa: ('delta', lambda v: (lambda a: a - v, partial(operator.add, -v), True)),
+    valore.moltiplica: ('fattore', lambda v: (lambda a: a * v, partial(operator.mul, v), True)),
+    valore.divide: ('divisore', lambda v: (lambda a: a / v, None, False)),
+    confronta.uguale: ('b', _confronto(operator.eq, operator.eq)),
+    confronta.diverso: ('b', _confronto(operator.ne, operator.ne)),
+    confronta.maggiore: ('b', _confronto(operator.gt, operator.lt)),
+    confronta.minore: ('b', _confronto(operator.lt, operator.gt)),
+    confronta.almeno: ('b', _confronto(operator.ge, operator.le)),
+    confronta.alpiù: ('b', _confronto(operator.le, operator.ge)),
+    confronta.sopra: ('soglia', _confronto(operator.gt, operator.lt)),
+    confronta.sotto: ('soglia', _confronto(operator.lt, operator.gt)),
+}
+
+# Riduzioni: funzione(acc, x) → nome
+_RIDUTTORI: Dict[Callable, str] = {
+    valore.incrementa: 'somma',
+    operator.add: 'somma',
+    valore.moltiplica: 'prodotto',
+    operator.mul: 'prodotto',
+    min: 'minimo',
+    max: 'massimo',
+}
+
+
+def riconosci(funzione: Callable) -> Optional[Kernel]:
+    """
+    Kernel per una primitiva riconosciuta, None se la funzione è opaca.
+
+    >>> riconosci(lambda x: x * 2) is None
+    True
+    >>> k = riconosci(partial(valore.moltiplica, fattore=2))
+    >>> list(map(k.python, [1, 2, 3]))
+    [2, 4, 6]
+    """
+    try:
+        voce = _UNARI.get(funzione)
+    except TypeError:  # callable non hashable
+        return None
+    if voce is not None:
+        return Kernel(voce[0], voce[1], funzione, voce[2])
+    if type(funzione) is not partial or funzione.args:
+        return None
+    base, parametri = funzione.func, funzione.keywords
+    if not parametri:
+        voce = _UNARI.get(base)
+    elif base is confronta.tra and set(parametri) == {'minimo', 'massimo'}:
+        lo, hi = parametri['minimo'], parametri['massimo']
+        voce = (lambda a: (a >= lo) & (a <= hi), None, False)
+    else:
+        binaria = _BINARI.get(base)
+        if binaria is None or set(parametri) != {binaria[0]}:
+            return None
+        v = parametri[binaria[0]]
+        if type(v) not in (int, float) or (base is valore.divide and v == 0):
+            return None  # divide per 0 → None per item: resta scalare
+        voce = binaria[1](v)
+    if voce is None:
+        return None
+    return Kernel(voce[0], voce[1], funzione, voce[2])
+
+
+# === Conversione ad array ===
+
+def _come_array(cont: Any, converti_liste: bool = True) -> Any:
+    """ndarray numerico per cont, None se NumPy manca o cont non è numerico omogeneo."""
+    if np is None:
+        return None
+    if isinstance(cont, np.ndarray):
+        return cont if cont.dtype.kind in 'iuf' else None
+    if isinstance(cont, array):
+        return np.asarray(cont) if cont.typecode not in 'uw' else None
+    if not converti_liste or not isinstance(cont, (list, tuple, VettorePersistente)):
+        return None
+    if len(cont) < SOGLIA_VETTORIALE:
+        return None
+    tipi = set(map(type, cont))
+    if tipi == {float}:
+        return np.fromiter(cont, dtype=np.float64, count=len(cont))
+    if tipi == {int}:
+        try:
+            return np.array(list(cont), dtype=np.int64)
+        except OverflowError:  # interi oltre 64 bit
+            return None
+    return None
+
+
+def _entro_int64(arr: Any, scalare: Callable[[Any], Any]) -> bool:
+    """Il kernel resta in int64? (funzioni monotone a tratti: bastano gli estremi)"""
+    if arr.dtype.kind not in 'iu' or not len(arr):
+        return True
+    for estremo in (int(arr.min()), int(arr.max())):
+        r = scalare(estremo)
+        if type(r) is int and not _INT64_MIN <= r <= _INT64_MAX:
+            return False
+    return True
+
+
+def _uscita(cont: Any, risultato: Any) -> Any:
+    """ndarray in ingresso → ndarray; altrimenti list di scalari Python."""
+    return risultato if isinstance(cont, np.ndarray) else risultato.tolist()
+
+
+# === Operazioni ===
+
+def mappa(cont: Iterable[Any], funzione: Callable) -> Optional[Any]:
+    """contenitore.mappa con kernel; None se la funzione è opaca."""
+    kernel = riconosci(funzione)
+    if kernel is None:
+        return None
+    arr = _come_array(cont, converti_liste=kernel.python is None)
+    if arr is not None and (not kernel.aritmetico or _entro_int64(arr, kernel.scalare)):
+        return _uscita(cont, kernel.numpy(arr))
+    if kernel.python is not None:
+        return list(map(kernel.python, cont))
+    return None
+
+
+def filtra(cont: Iterable[Any], predicato: Callable) -> Optional[Any]:
+    """contenitore.filtra con kernel; None se il predicato è opaco."""
+    kernel = riconosci(predicato)
+    if kernel is None:
+        return None
+    arr = _come_array(cont, converti_liste=kernel.python is None)
+    if arr is not None:
+        maschera = kernel.numpy(arr)
+        if isinstance(cont, np.ndarray):
+            return cont[maschera]
+        # Gli item originali (non gli scalari ricostruiti dall'array)
+        return list(compress(cont, maschera.tolist()))
+    if kernel.python is not None:
+        return list(filter(kernel.python, cont))
+    return None
+
+
+def riduce(cont: Iterable[Any], funzione: Callable, iniziale: Any) -> Any:
+    """contenitore.riduce con riduzione nota; None se la funzione è opaca."""
+    try:
+        nome = _RIDUTTORI.get(funzione)
+    except TypeError:
+        return None
+    if nome is None or type(iniziale) not in (int, float):
+        return None
+    if np is not None and isinstance(cont, (np.ndarray, array)):
+        arr = _come_array(cont)
+        if arr is not None and len(arr):
+            if nome == 'minimo':
+                return min(iniziale, arr.min().item())
+            if nome == 'massimo':
+                return max(iniziale, arr.max().item())
+            if nome == 'somma' and _somma_entro_int64(arr):
+                return iniziale + arr.sum().item()
+    if nome == 'somma':
+        return sum(cont, iniziale)
+    if nome == 'prodotto':
+        return prod(cont, start=iniziale)
+    if nome == 'minimo':
+        return min(chain((iniziale,), cont))
+    return max(chain((iniziale,), cont))
+
+
+def _somma_entro_int64(arr: Any) -> bool:
+    if arr.dtype.kind not in 'iu':
+        return True
+    picco = max(abs(int(arr.min())), abs(int(arr.max())))
+    return picco * len(arr) <= _INT64_MAX
+
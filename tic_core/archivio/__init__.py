@@ -0,0 +1,34 @@
+"""
+ARCHIVIO — Serializzazione e archiviazione di elementi
+
+BINARIO:
+  - codifica/decodifica: codec compatto per Elemento, contenitori e scalari
+  - tabella degli schemi: le chiavi viaggiano una volta sola
+  - decodifica pigra da memoryview (ElementoBinario, ListaBinaria)
+  - Codificatore/Decodificatore: flussi di messaggi (audit, snapshot)
+
+MAPPATO:
+  - scrive_mappato: record a layout fisso su file
+  - ArchivioMappato: viste ElementoMappato su file mappato (mmap),
+    apertura O(1), campi decodificati alla lettura
+
+BLOCCHI:
+  - ContenitoreSuFile: record da file (JSON lines o binario) letti a
+    blocchi con lettura anticipata su un thread; filtra/mappa pigri,
+    riduce/conta in una lettura, scrive per riversare su disco
+  - scrive_righe: scrittura in flusso di un iterabile di record
+"""
+
+from .binario import (
+    codifica, decodifica, Codificatore, Decodificatore,
+    ElementoBinario, ListaBinaria, ErroreCodifica,
+)
+from .mappato import ArchivioMappato, ElementoMappato, scrive_mappato, deduce_layout
+from .blocchi import ContenitoreSuFile, scrive_righe
+
+__all__ = [
+    'codifica', 'decodifica', 'Codificatore', 'Decodificatore',
+    'ElementoBinario', 'ListaBinaria', 'ErroreCodifica',
+    'ArchivioMappato', 'ElementoMappato', 'scrive_mappato', 'deduce_layout',
+    'ContenitoreSuFile', 'scrive_righe',
+]
@@ -0,0 +1,740 @@
+"""
+ARCHIVIO — Codec binario per il dominio dell'algebra
+
+Valori supportati: Elemento (anche record da schema), list, tuple,
+dict, set, int, float, str, bytes, bool, None.
+
+Compressione per schema: le chiavi di elementi e dict vengono scritte
+una sola volta in una tabella (nome record, campi); ogni elemento
+successivo con gli stessi campi scrive solo l'id dello schema e i valori.
+In un flusso la tabella è condivisa tra i messaggi.
+
+Uso:
+    dati = codifica(ordine)
+    ordine = decodifica(dati)
+
+    vista = decodifica(dati, pigro=True)   # nessuna copia del buffer
+    elemento.legge(vista, 'stato')         # decodifica solo quel campo
+
+    with open('audit.bin', 'wb') as f:
+        codificatore = Codificatore(f)
+        for evento in eventi:
+            codificatore.scrive(evento)
+
+    with open('audit.bin', 'rb') as f:
+        for evento in Decodificatore(f):
+            ...
+
+Formato (little-endian):
+    messaggio := schemi_nuovi valore
+    schemi    := varint n, n × (str nome, varint k, k × str campo)
+    contenitori ed elementi hanno una lunghezza in byte fissa (u32)
+    per poter essere saltati senza decodificarli.
+"""
+
+from typing import Any, BinaryIO, Dict, Iterator, List, Mapping, Optional, Tuple
+from collections.abc import Sequence as _SequenceABC
+import struct
+
+from ..archetipi.elemento import (
+    Elemento, Meta, META_VUOTO, META_ELIMINATO, SOGLIA_TRIE, _con_campi,
+)
+from ..archetipi.persistente import (
+    DizionarioCongelato, ListaCongelata, MappaPersistente, VettorePersistente,
+)
+from ..archetipi.schema import Record, schema as _schema_record
+
+MAGIA = b'TB\x01'
+
+# Tag dei valori
+_NONE = 0x00
+_VERO = 0x01
+_FALSO = 0x02
+_INT = 0x03        # varint zigzag
+_INT_GRANDE = 0x04  # varint lunghezza + byte con segno
+_FLOAT = 0x05      # 8 byte
+_STR = 0x06        # varint lunghezza + utf-8
+_BYTES = 0x07
+_LISTA = 0x08      # u32 byte, varint n, n × valore
+_TUPLA = 0x09
+_INSIEME = 0x0A
+_DICT = 0x0B       # u32 byte, varint n, n × (chiave, valore)
+_DICT_SCHEMA = 0x0C  # u32 byte, varint schema, valori
+_ELEMENTO = 0x0D   # u32 byte, varint schema, meta, valori
+_ASSENTE = 0x0E    # campo di record non valorizzato
+_ELEMENTO_DICT = 0x0F  # u32 byte, meta, varint n, n × (chiave, valore): tabella piena
+
+# Flag dei metadata
+_META_ELIMINATO = 0x01
+_META_TIMBRI = 0x02
+_META_STESSO_TIMBRO = 0x04  # creato == modificato: un solo timbro
+
+# Oltre questi limiti un dict non usa la tabella degli schemi
+MAX_CAMPI_SCHEMA = 64
+MAX_SCHEMI = 4096
+
+_U32 = struct.Struct('<I')
+_F64 = struct.Struct('<d')
+_LIMITE_INT = 1 << 63
+
+
+class ErroreCodifica(ValueError):
+    """Valore non codificabile o buffer non valido."""
+
+
+# === Codifica ===
+
+class _Tabella:
+    """Tabella degli schemi: (nome, campi) → id."""
+
+    __slots__ = ('ids', 'schemi', 'nuovi')
+
+    def __init__(self) -> None:
+        self.ids: Dict[Tuple[str, Tuple[Any, ...]], int] = {}
+        self.schemi: List[Tuple[str, Tuple[Any, ...]]] = []
+        self.nuovi: List[Tuple[str, Tuple[Any, ...]]] = []
+
+    def id(self, nome: str, campi: Tuple[Any, ...]) -> Optional[int]:
+        chiave = (nome, campi)
+        i = self.ids.get(chiave)
+        if i is None:
+            if len(self.schemi) >= MAX_SCHEMI:
+                return None
+            i = len(self.schemi)
+            self.ids[chiave] = i
+            self.schemi.append(chiave)
+            self.nuovi.append(chiave)
+        return i
+
+
+def _scrivi_varint(out: bytearray, n: int) -> None:
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _scrivi_str(out: bytearray, s: str) -> None:
+    b = s.encode('utf-8')
+    n = len(b)
+    if n < 0x80:
+        out.append(n)
+    else:
+        _scrivi_varint(out, n)
+    out += b
+
+
+def _apri(out: bytearray, tag: int) -> int:
+    """Scrive il tag e riserva la lunghezza u32; ritorna la posizione da completare."""
+    out.append(tag)
+    pos = len(out)
+    out += b'\x00\x00\x00\x00'
+    return pos
+
+
+def _chiudi(out: bytearray, pos: int) -> None:
+    _U32.pack_into(out, pos, len(out) - pos - 4)
+
+
+def _scrivi(out: bytearray, v: Any, tabella: _Tabella) -> None:
+    t = type(v)
+    if t is str:
+        out.append(_STR)
+        _scrivi_str(out, v)
+    elif t is int:
+        if -_LIMITE_INT <= v < _LIMITE_INT:
+            out.append(_INT)
+            _scrivi_varint(out, (v << 1) ^ (v >> 63))
+        else:
+            out.append(_INT_GRANDE)
+            b = v.to_bytes((v.bit_length() + 8) // 8, 'little', signed=True)
+            _scrivi_varint(out, len(b))
+            out += b
+    elif t is float:
+        out.append(_FLOAT)
+        out += _F64.pack(v)
+    elif v is None:
+        out.append(_NONE)
+    elif v is True:
+        out.append(_VERO)
+    elif v is False:
+        out.append(_FALSO)
+    elif isinstance(v, Elemento):
+        _scrivi_elemento(out, v, tabella)
+    elif isinstance(v, (dict, Mapping)):
+        _scrivi_dict(out, v, tabella)
+    elif isinstance(v, (list, VettorePersistente)):
+        _scrivi_sequenza(out, _LISTA, v, tabella)
+    elif isinstance(v, tuple):
+        _scrivi_sequenza(out, _TUPLA, v, tabella)
+    elif isinstance(v, (set, frozenset)):
+        _scrivi_sequenza(out, _INSIEME, v, tabella)
+    elif isinstance(v, (bytes, bytearray, memoryview)):
+        b = bytes(v)
+        out.append(_BYTES)
+        _scrivi_varint(out, len(b))
+        out += b
+    elif isinstance(v, int):  # sottoclassi di int (es. IntEnum)
+        _scrivi(out, int(v), tabella)
+    elif isinstance(v, float):
+        _scrivi(out, float(v), tabella)
+    elif isinstance(v, str):
+        _scrivi(out, str(v), tabella)
+    else:
+        raise ErroreCodifica(f"Tipo non codificabile: {t.__name__}")
+
+
+def _scrivi_sequenza(out: bytearray, tag: int, valori: Any, tabella: _Tabella) -> None:
+    pos = _apri(out, tag)
+    _scrivi_varint(out, len(valori))
+    for v in valori:
+        _scrivi(out, v, tabella)
+    _chiudi(out, pos)
+
+
+def _scrivi_dict(out: bytearray, d: Mapping[Any, Any], tabella: _Tabella) -> None:
+    campi = tuple(d)
+    if len(campi) <= MAX_CAMPI_SCHEMA and all(type(k) is str for k in campi):
+        i = tabella.id('', campi)
+        if i is not None:
+            pos = _apri(out, _DICT_SCHEMA)
+            _scrivi_varint(out, i)
+            for v in d.values():
+                _scrivi(out, v, tabella)
+            _chiudi(out, pos)
+            return
+    pos = _apri(out, _DICT)
+    _scrivi_varint(out, len(campi))
+    for k, v in d.items():
+        _scrivi(out, k, tabella)
+        _scrivi(out, v, tabella)
+    _chiudi(out, pos)
+
+
+def _scrivi_elemento(out: bytearray, el: Elemento, tabella: _Tabella) -> None:
+    if isinstance(el, Record):
+        nome = el._nome
+        campi = el._campi_schema
+        valori = [el._legge(c, _ASSENTE_SENTINELLA) for c in campi]
+    else:
+        dati = el._dati
+        nome = ''
+        campi = tuple(dati)
+        valori = dati.values()
+    i = tabella.ids.get((nome, campi))
+    if i is None and (nome or (len(campi) <= MAX_CAMPI_SCHEMA
+                               and all(type(k) is str for k in campi))):
+        i = tabella.id(nome, campi)
+    if i is None:
+        # Tabella piena o elemento troppo largo: chiavi inline
+        pos = _apri(out, _ELEMENTO_DICT)
+        _scrivi_meta(out, el._meta, tabella)
+        dati = el._dati
+        _scrivi_varint(out, len(dati))
+        for k, v in dati.items():
+            _scrivi(out, k, tabella)
+            _scrivi(out, v, tabella)
+        _chiudi(out, pos)
+        return
+    pos = _apri(out, _ELEMENTO)
+    if i < 0x80:
+        out.append(i)
+    else:
+        _scrivi_varint(out, i)
+    _scrivi_meta(out, el._meta, tabella)
+    for v in valori:
+        # Fast path per gli scalari più comuni
+        t = type(v)
+        if t is str:
+            out.append(_STR)
+            _scrivi_str(out, v)
+        elif t is float:
+            out.append(_FLOAT)
+            out += _F64.pack(v)
+        elif v is _ASSENTE_SENTINELLA:
+            out.append(_ASSENTE)
+        else:
+            _scrivi(out, v, tabella)
+    _chiudi(out, pos)
+
+
+def _scrivi_meta(out: bytearray, meta: Meta, tabella: _Tabella) -> None:
+    if meta is META_VUOTO:
+        out.append(0)
+        return
+    creato, modificato, eliminato = meta
+    flag = _META_ELIMINATO if eliminato else 0
+    if creato is None and modificato is None:
+        out.append(flag)
+    elif creato == modificato and type(creato) is type(modificato):
+        out.append(flag | _META_TIMBRI | _META_STESSO_TIMBRO)
+        _scrivi(out, creato, tabella)
+    else:
+        out.append(flag | _META_TIMBRI)
+        _scrivi(out, creato, tabella)
+        _scrivi(out, modificato, tabella)
+
+
+_ASSENTE_SENTINELLA = object()
+
+
+def _scrivi_schemi(out: bytearray, schemi: List[Tuple[str, Tuple[Any, ...]]]) -> None:
+    _scrivi_varint(out, len(schemi))
+    for nome, campi in schemi:
+        _scrivi_str(out, nome)
+        _scrivi_varint(out, len(campi))
+        for campo in campi:
+            _scrivi_str(out, campo)
+
+
+def codifica(valore: Any) -> bytes:
+    """
+    Codifica un valore in un messaggio binario autonomo.
+
+    >>> decodifica(codifica({'sku': 'A1', 'qta': [1, 2.5, None]}))
+    {'sku': 'A1', 'qta': [1, 2.5, None]}
+    """
+    tabella = _Tabella()
+    corpo = bytearray()
+    _scrivi(corpo, valore, tabella)
+    out = bytearray(MAGIA)
+    _scrivi_schemi(out, tabella.nuovi)
+    out += corpo
+    return bytes(out)
+
+
+# === Decodifica ===
+
+def _leggi_varint(buf: Any, pos: int) -> Tuple[int, int]:
+    b = buf[pos]
+    pos += 1
+    if b < 0x80:
+        return b, pos
+    n = b & 0x7F
+    shift = 7
+    while True:
+        b = buf[pos]
+        pos += 1
+        n |= (b & 0x7F) << shift
+        if b < 0x80:
+            return n, pos
+        shift += 7
+
+
+def _leggi_str(buf: Any, pos: int) -> Tuple[str, int]:
+    n = buf[pos]
+    pos += 1
+    if n >= 0x80:
+        n, pos = _leggi_varint(buf, pos - 1)
+    fine = pos + n
+    return str(buf[pos:fine], 'utf-8'), fine
+
+
+def _leggi_schemi(buf: Any, pos: int, schemi: List[Any]) -> int:
+    n, pos = _leggi_varint(buf, pos)
+    for _ in range(n):
+        nome, pos = _leggi_str(buf, pos)
+        k, pos = _leggi_varint(buf, pos)
+        campi = []
+        for _ in range(k):
+            campo, pos = _leggi_str(buf, pos)
+            campi.append(campo)
+        campi = tuple(campi)
+        record = _schema_record(nome, campi) if nome else None
+        schemi.append((campi, record))
+    return pos
+
+
+# Modi di decodifica
+_PIANO = 0       # contenitori normali (list, dict)
+_CONGELATO = 1   # valori dentro un elemento (ListaCongelata, DizionarioCongelato)
+_PIGRO = 2       # liste ed elementi come viste sul buffer
+
+
+def _leggi(buf: Any, pos: int, schemi: List[Any], modo: int) -> Tuple[Any, int]:
+    """Decodifica il valore a pos; ritorna (valore, posizione successiva)."""
+    tag = buf[pos]
+    pos += 1
+    if tag == _STR:
+        n = buf[pos]
+        pos += 1
+        if n >= 0x80:
+            n, pos = _leggi_varint(buf, pos - 1)
+        fine = pos + n
+        return str(buf[pos:fine], 'utf-8'), fine
+    if tag == _INT:
+        z = buf[pos]
+        if z < 0x80:
+            pos += 1
+        else:
+            z, pos = _leggi_varint(buf, pos)
+        return (z >> 1) ^ -(z & 1), pos
+    if tag == _FLOAT:
+        return _F64.unpack_from(buf, pos)[0], pos + 8
+    if tag == _NONE:
+        return None, pos
+    if tag == _VERO:
+        return True, pos
+    if tag == _FALSO:
+        return False, pos
+    if tag == _ELEMENTO:
+        fine = pos + 4 + _U32.unpack_from(buf, pos)[0]
+        if modo == _PIGRO:
+            return ElementoBinario(buf, pos + 4, schemi), fine
+        return _leggi_elemento(buf, pos + 4, schemi), fine
+    if tag == _DICT_SCHEMA:
+        fine = pos + 4 + _U32.unpack_from(buf, pos)[0]
+        i, pos = _leggi_varint(buf, pos + 4)
+        figli = _CONGELATO if modo == _CONGELATO else _PIANO
+        d = {}
+        for campo in schemi[i][0]:
+            d[campo], pos = _leggi(buf, pos, schemi, figli)
+        return (DizionarioCongelato(d) if modo == _CONGELATO else d), fine
+    if tag == _LISTA or tag == _TUPLA or tag == _INSIEME:
+        fine = pos + 4 + _U32.unpack_from(buf, pos)[0]
+        if modo == _PIGRO and tag == _LISTA:
+            return ListaBinaria(buf, pos + 4, schemi), fine
+        n, pos = _leggi_varint(buf, pos + 4)
+        figli = _CONGELATO if modo == _CONGELATO else _PIANO
+        valori = []
+        for _ in range(n):
+            v, pos = _leggi(buf, pos, schemi, figli)
+            valori.append(v)
+        if tag == _TUPLA:
+            return tuple(valori), fine
+        if tag == _INSIEME:
+            return frozenset(valori), fine
+        return (ListaCongelata(valori) if modo == _CONGELATO else valori), fine
+    if tag == _DICT:
+        fine = pos + 4 + _U32.unpack_from(buf, pos)[0]
+        n, pos = _leggi_varint(buf, pos + 4)
+        figli = _CONGELATO if modo == _CONGELATO else _PIANO
+        d = {}
+        for _ in range(n):
+            k, pos = _leggi(buf, pos, schemi, _PIANO)
+            d[k], pos = _leggi(buf, pos, schemi, figli)
+        return (DizionarioCongelato(d) if modo == _CONGELATO else d), fine
+    if tag == _ELEMENTO_DICT:
+        fine = pos + 4 + _U32.unpack_from(buf, pos)[0]
+        meta, pos = _leggi_meta(buf, pos + 4, schemi)
+        n, pos = _leggi_varint(buf, pos)
+        d = {}
+        for _ in range(n):
+            k, pos = _leggi(buf, pos, schemi, _PIANO)
+            d[k], pos = _leggi(buf, pos, schemi, _CONGELATO)
+        return Elemento(_come_dati(d), meta), fine
+    if tag == _INT_GRANDE:
+        n, pos = _leggi_varint(buf, pos)
+        return int.from_bytes(buf[pos:pos + n], 'little', signed=True), pos + n
+    if tag == _BYTES:
+        n, pos = _leggi_varint(buf, pos)
+        return bytes(buf[pos:pos + n]), pos + n
+    raise ErroreCodifica(f"Tag sconosciuto 0x{tag:02x} in posizione {pos - 1}")
+
+
+def _come_dati(d: Dict[str, Any]) -> Any:
+    """I valori sono già congelati: serve solo la scelta dict/HAMT."""
+    return MappaPersistente(d) if len(d) > SOGLIA_TRIE else d
+
+
+def _salta(buf: Any, pos: int) -> int:
+    """Posizione dopo il valore a pos, senza decodificarlo."""
+    tag = buf[pos]
+    pos += 1
+    if tag in _CON_LUNGHEZZA:
+        return pos + 4 + _U32.unpack_from(buf, pos)[0]
+    if tag == _INT:
+        while buf[pos] >= 0x80:
+            pos += 1
+        return pos + 1
+    if tag == _FLOAT:
+        return pos + 8
+    if tag == _STR or tag == _BYTES or tag == _INT_GRANDE:
+        n, pos = _leggi_varint(buf, pos)
+        return pos + n
+    if tag <= _FALSO or tag == _ASSENTE:
+        return pos
+    raise ErroreCodifica(f"Tag sconosciuto 0x{tag:02x} in posizione {pos - 1}")
+
+
+_CON_LUNGHEZZA = frozenset({
+    _LISTA, _TUPLA, _INSIEME, _DICT, _DICT_SCHEMA, _ELEMENTO, _ELEMENTO_DICT,
+})
+
+
+def _leggi_meta(buf: Any, pos: int, schemi: List[Any]) -> Tuple[Meta, int]:
+    flag = buf[pos]
+    pos += 1
+    if not flag & _META_TIMBRI:
+        return (META_ELIMINATO if flag & _META_ELIMINATO else META_VUOTO), pos
+    creato, pos = _leggi(buf, pos, schemi, _PIANO)
+    if flag & _META_STESSO_TIMBRO:
+        modificato = creato
+    else:
+        modificato, pos = _leggi(buf, pos, schemi, _PIANO)
+    return Meta(creato, modificato, bool(flag & _META_ELIMINATO)), pos
+
+
+def _leggi_elemento(buf: Any, pos: int, schemi: List[Any]) -> Elemento:
+    i = buf[pos]
+    if i < 0x80:
+        pos += 1
+    else:
+        i, pos = _leggi_varint(buf, pos)
+    campi, record = schemi[i]
+    if buf[pos] == 0:
+        meta = META_VUOTO
+        pos += 1
+    else:
+        meta, pos = _leggi_meta(buf, pos, schemi)
+    dati = {}
+    for campo in campi:
+        tag = buf[pos]
+        if tag == _FLOAT:  # fast path
+            dati[campo] = _F64.unpack_from(buf, pos + 1)[0]
+            pos += 9
+        elif tag == _ASSENTE:
+            pos += 1
+        else:
+            dati[campo], pos = _leggi(buf, pos, schemi, _CONGELATO)
+    if record is not None:
+        return record.da_dati(dati, meta)
+    return Elemento(_come_dati(dati), meta)
+
+
+def decodifica(dati: Any, pigro: bool = False) -> Any:
+    """
+    Decodifica un messaggio prodotto da codifica().
+
+    pigro=True: nessuna copia del buffer. Elementi e liste diventano
+    viste (ElementoBinario, ListaBinaria) che decodificano un campo
+    o un item solo quando viene letto. Il buffer deve restare valido.
+    """
+    buf = memoryview(dati)
+    if buf.ndim != 1 or buf.itemsize != 1:
+        buf = buf.cast('B')
+    if bytes(buf[:len(MAGIA)]) != MAGIA:
+        raise ErroreCodifica("Buffer non valido: magia mancante")
+    schemi: List[Any] = []
+    pos = _leggi_schemi(buf, len(MAGIA), schemi)
+    valore, _ = _leggi(buf, pos, schemi, _PIGRO if pigro else _PIANO)
+    return valore
+
+
+# === Viste pigre ===
+
+class ElementoBinario(Elemento):
+    """
+    Vista read-only di un elemento codificato.
+
+    legge decodifica solo il campo richiesto (l'indice delle posizioni
+    si costruisce al primo accesso saltando i valori senza decodificarli).
+    scrive/modifica/elimina producono un Elemento normale.
+    """
+
+    __slots__ = ('_buf', '_inizio', '_schemi', '_posizioni')
+
+    def __init__(self, buf: memoryview, inizio: int, schemi: List[Any]):
+        _IMPOSTA['_buf'](self, buf)
+        _IMPOSTA['_inizio'](self, inizio)
+        _IMPOSTA['_schemi'](self, schemi)
+        _IMPOSTA['_posizioni'](self, None)
+        _, pos = _leggi_varint(buf, inizio)
+        meta, _ = _leggi_meta(buf, pos, schemi)
+        _IMPOSTA['_meta'](self, meta)
+
+    def __setattr__(self, nome: str, valore: Any) -> None:
+        raise TypeError("Vista binaria immutabile: usa elemento.scrive")
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        raise TypeError("Vista binaria immutabile: usa elemento.scrive")
+
+    def _indice(self) -> Dict[str, int]:
+        posizioni = self._posizioni
+        if posizioni is None:
+            buf = self._buf
+            i, pos = _leggi_varint(buf, self._inizio)
+            campi = self._schemi[i][0]
+            pos = _salta_meta(buf, pos)
+            posizioni = {}
+            for campo in campi:
+                if buf[pos] != _ASSENTE:
+                    posizioni[campo] = pos
+                pos = _salta(buf, pos)
+            _IMPOSTA['_posizioni'](self, posizioni)
+        return posizioni
+
+    @property
+    def _dati(self) -> Dict[str, Any]:
+        buf, schemi = self._buf, self._schemi
+        return {campo: _leggi(buf, pos, schemi, _CONGELATO)[0]
+                for campo, pos in self._indice().items()}
+
+    def __repr__(self) -> str:
+        return f'ElementoBinario({self._dati!r})'
+
+    def __reduce__(self):
+        return (Elemento, (self._dati, self._meta))
+
+    # --- Interfaccia Elemento ---
+
+    def _legge(self, campo: str, default: Any) -> Any:
+        pos = self._indice().get(campo)
+        if pos is None:
+            return default
+        return _leggi(self._buf, pos, self._schemi, _CONGELATO)[0]
+
+    def _con_modifiche(self, modifiche: Mapping[str, Any], meta: Meta) -> Elemento:
+        return Elemento(_dati=_con_campi(_come_dati(self._dati), modifiche), _meta=meta)
+
+    def _con_meta(self, meta: Meta) -> Elemento:
+        return Elemento(_dati=_come_dati(self._dati), _meta=meta)
+
+    def _campi(self) -> list:
+        return list(self._indice())
+
+
+_IMPOSTA = {
+    nome: getattr(ElementoBinario, nome).__set__
+    for nome in ('_buf', '_inizio', '_schemi', '_posizioni')
+}
+_IMPOSTA['_meta'] = Elemento._meta.__set__
+
+
+def _salta_meta(buf: Any, pos: int) -> int:
+    flag = buf[pos]
+    pos += 1
+    if flag & _META_TIMBRI:
+        pos = _salta(buf, pos)
+        if not flag & _META_STESSO_TIMBRO:
+            pos = _salta(buf, pos)
+    return pos
+
+
+class ListaBinaria(_SequenceABC):
+    """
+    Vista read-only di una lista codificata: gli item sono decodificati
+    all'accesso (gli elementi come ElementoBinario).
+    """
+
+    __slots__ = ('_buf', '_schemi', '_n', '_primo', '_posizioni')
+
+    def __init__(self, buf: memoryview, inizio: int, schemi: List[Any]):
+        self._buf = buf
+        self._schemi = schemi
+        self._n, self._primo = _leggi_varint(buf, inizio)
+        self._posizioni: Optional[List[int]] = None
+
+    def _indice(self) -> List[int]:
+        if self._posizioni is None:
+            buf = self._buf
+            posizioni = []
+            pos = self._primo
+            for _ in range(self._n):
+                posizioni.append(pos)
+                pos = _salta(buf, pos)
+            self._posizioni = posizioni
+        return self._posizioni
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, indice: Any) -> Any:
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(self._n))]
+        if indice < 0:
+            indice += self._n
+        if not 0 <= indice < self._n:
+            raise IndexError('indice fuori dalla lista')
+        return _leggi(self._buf, self._indice()[indice], self._schemi, _PIGRO)[0]
+
+    def __iter__(self) -> Iterator[Any]:
+        buf, schemi = self._buf, self._schemi
+        pos = self._primo
+        for _ in range(self._n):
+            v, pos = _leggi(buf, pos, schemi, _PIGRO)
+            yield v
+
+    def __eq__(self, altro: Any) -> bool:
+        if isinstance(altro, (list, ListaBinaria)):
+            return len(self) == len(altro) and all(a == b for a, b in zip(self, altro))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f'ListaBinaria({list(self)!r})'
+
+
+# === Flussi ===
+
+class Codificatore:
+    """
+    Scrive una sequenza di messaggi su un file binario.
+    La tabella degli schemi è condivisa: ogni schema viaggia una volta sola.
+    """
+
+    def __init__(self, file: BinaryIO):
+        self._file = file
+        self._tabella = _Tabella()
+        file.write(MAGIA)
+
+    def scrive(self, valore: Any) -> None:
+        """Accoda un messaggio: u32 lunghezza, schemi nuovi, valore."""
+        corpo = bytearray()
+        _scrivi(corpo, valore, self._tabella)
+        messaggio = bytearray()
+        _scrivi_schemi(messaggio, self._tabella.nuovi)
+        self._tabella.nuovi = []
+        messaggio += corpo
+        self._file.write(_U32.pack(len(messaggio)))
+        self._file.write(messaggio)
+
+
+def _leggi_messaggio(file: BinaryIO) -> Optional[bytes]:
+    """I byte del prossimo messaggio di un flusso, None a fine flusso."""
+    testa = file.read(4)
+    if not testa:
+        return None
+    if len(testa) < 4:
+        raise ErroreCodifica("Flusso troncato")
+    n = _U32.unpack(testa)[0]
+    messaggio = file.read(n)
+    if len(messaggio) < n:
+        raise ErroreCodifica("Flusso troncato")
+    return messaggio
+
+
+def _decodifica_messaggio(messaggio: bytes, schemi: List[Any], pigro: bool = False) -> Any:
+    """Decodifica un messaggio del flusso; gli schemi nuovi si aggiungono a schemi."""
+    buf = memoryview(messaggio)
+    pos = _leggi_schemi(buf, 0, schemi)
+    valore, _ = _leggi(buf, pos, schemi, _PIGRO if pigro else _PIANO)
+    return valore
+
+
+class Decodificatore:
+    """
+    Legge i messaggi di un Codificatore uno alla volta (iterabile).
+
+    pigro=True: ogni messaggio viene decodificato come vista sul proprio buffer.
+    """
+
+    def __init__(self, file: BinaryIO, pigro: bool = False):
+        self._file = file
+        self._pigro = pigro
+        self._schemi: List[Any] = []
+        if file.read(len(MAGIA)) != MAGIA:
+            raise ErroreCodifica("Flusso non valido: magia mancante")
+
+    def leggi(self) -> Tuple[bool, Any]:
+        """Prossimo messaggio: (trovato, valore). (False, None) a fine flusso."""
+        messaggio = _leggi_messaggio(self._file)
+        if messaggio is None:
+            return (False, None)
+        return (True, _decodifica_messaggio(messaggio, self._schemi, self._pigro))
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            trovato, valore = self.leggi()
+            if not trovato:
+                return
+            yield valore
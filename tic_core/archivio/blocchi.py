@@ -0,0 +1,280 @@
+"""
+ARCHIVIO — Contenitore su file, letto a blocchi
+
+Uno storico ordini più grande della RAM non entra in una lista. Un
+ContenitoreSuFile legge i record da un file locale un blocco alla volta
+e offre lo stesso vocabolario di contenitore:
+
+    storico = ContenitoreSuFile('ordini.jsonl', blocco=50_000)
+    pagati = storico.filtra(ordine_pagato).mappa(totale_ordine)   # pigri
+    pagati.riduce(lambda acc, t: acc + t, 0.0)                     # un passaggio
+    storico.filtra(ordine_annullato).scrive('annullati.tic')       # risultato su disco
+
+Formati:
+    'json'    una riga JSON per record (.jsonl, .ndjson): gli oggetti
+              letti come Elemento, gli altri valori (numeri, stringhe,
+              liste: ad esempio il risultato di un mappa) così come sono
+    'binario' un messaggio del Codificatore per record (codec di binario.py)
+Default dedotto dall'estensione: .jsonl / .ndjson → json, altro → binario.
+Il JSON conserva solo i dati (niente metadata, gli elementi annidati
+tornano dict); il binario conserva tutto.
+
+Memoria: al più `anticipo` blocchi letti in anticipo più quello in
+lavorazione. Un thread legge dal file i blocchi successivi (righe o
+messaggi in byte: l'I/O rilascia il GIL) mentre il chiamante decodifica
+ed elabora quello corrente; la coda è limitata, se il consumatore è
+lento il lettore aspetta. Per file già nella cache del sistema
+operativo anticipo=0 evita il thread.
+
+filtra e mappa sono pigri e ritornano un nuovo ContenitoreSuFile sullo
+stesso file; ogni blocco passa per contenitore.filtra / contenitore.mappa
+(quindi anche per il percorso vettoriale). riduce, conta, lista e scrive
+eseguono i passaggi in una sola lettura del file.
+"""
+
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+from itertools import chain, islice
+import json
+import os
+import queue
+import threading
+
+from ..archetipi.elemento import Elemento, elemento
+from ..archetipi.contenitore import contenitore
+from .binario import MAGIA, Codificatore, ErroreCodifica, _decodifica_messaggio, _leggi_messaggio
+
+BLOCCO = 10_000  # record per blocco
+ANTICIPO = 2     # blocchi letti in anticipo dal thread
+
+_ESTENSIONI_JSON = ('.jsonl', '.ndjson')
+
+# Tipi di passaggio
+_FILTRA = 0
+_MAPPA = 1
+
+_FINE = object()
+
+
+def _formato(percorso: str, formato: Optional[str]) -> str:
+    if formato is None:
+        return 'json' if os.path.splitext(percorso)[1].lower() in _ESTENSIONI_JSON else 'binario'
+    if formato not in ('json', 'binario'):
+        raise ValueError(f"Formato non valido: '{formato}' (ammessi: json, binario)")
+    return formato
+
+
+def _come_json(v: Any) -> Any:
+    """default di json.dumps: Elemento e contenitori congelati → dict e liste."""
+    if isinstance(v, Elemento):
+        return {campo: elemento.legge(v, campo) for campo in elemento.campi(v)}
+    if hasattr(v, 'items'):
+        return dict(v.items())
+    if isinstance(v, (set, frozenset)) or hasattr(v, '__iter__'):
+        return list(v)
+    raise TypeError(f"Valore non serializzabile in JSON: {type(v).__name__}")
+
+
+# Blocchi grezzi (righe di testo, messaggi in byte): si leggono sul thread
+
+def _righe_json(percorso: str, blocco: int) -> Iterator[List[str]]:
+    with open(percorso, 'r', encoding='utf-8') as f:
+        while True:
+            parte = list(islice(f, blocco))
+            if not parte:
+                return
+            yield parte
+
+
+def _messaggi_binario(percorso: str, blocco: int) -> Iterator[List[bytes]]:
+    with open(percorso, 'rb') as f:
+        if f.read(len(MAGIA)) != MAGIA:
+            raise ErroreCodifica("Flusso non valido: magia mancante")
+        while True:
+            parte = []
+            for _ in range(blocco):
+                messaggio = _leggi_messaggio(f)
+                if messaggio is None:
+                    break
+                parte.append(messaggio)
+            if not parte:
+                return
+            yield parte
+
+
+def _decodifica_json(parte: List[str]) -> List[Any]:
+    loads = json.loads
+    valori = [loads(riga) for riga in parte if not riga.isspace()]
+    oggetti = [v for v in valori if type(v) is dict]
+    if len(oggetti) == len(valori):
+        return elemento.crea_molti(valori)
+    record = iter(elemento.crea_molti(oggetti))
+    return [next(record) if type(v) is dict else v for v in valori]
+
+
+def scrive_righe(percorso: str, righe: Iterable[Any], formato: str = None) -> int:
+    """
+    Scrive i record di un iterabile su file, uno alla volta (memoria
+    costante). Ritorna il numero di record scritti.
+    """
+    formato = _formato(percorso, formato)
+    n = 0
+    if formato == 'json':
+        with open(percorso, 'w', encoding='utf-8') as f:
+            for riga in righe:
+                f.write(json.dumps(riga, default=_come_json, ensure_ascii=False))
+                f.write('\n')
+                n += 1
+    else:
+        with open(percorso, 'wb') as f:
+            codificatore = Codificatore(f)
+            for riga in righe:
+                codificatore.scrive(riga)
+                n += 1
+    return n
+
+
+def _in_anticipo(sorgente: Iterator[List[Any]], anticipo: int) -> Iterator[List[Any]]:
+    """
+    Itera i blocchi di sorgente prodotti da un thread, al più anticipo
+    blocchi avanti. Gli errori del lettore si rilanciano nel chiamante;
+    se il chiamante smette di iterare il thread si ferma.
+    """
+    coda: 'queue.Queue[Tuple[Any, Any]]' = queue.Queue(maxsize=anticipo)
+    stop = threading.Event()
+
+    def metti(voce: Tuple[Any, Any]) -> bool:
+        while not stop.is_set():
+            try:
+                coda.put(voce, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def leggi() -> None:
+        try:
+            for parte in sorgente:
+                if not metti((parte, None)):
+                    return
+            metti((_FINE, None))
+        except BaseException as e:  # consegnato al consumatore
+            metti((_FINE, e))
+        finally:
+            sorgente.close()
+
+    lettore = threading.Thread(target=leggi, name='tic-blocchi', daemon=True)
+    lettore.start()
+    try:
+        while True:
+            parte, errore = coda.get()
+            if parte is _FINE:
+                if errore is not None:
+                    raise errore
+                return
+            yield parte
+    finally:
+        stop.set()
+        lettore.join()
+
+
+class ContenitoreSuFile:
+    """
+    Record di un file locale letti a blocchi, con passaggi pigri.
+
+    >>> import tempfile, os
+    >>> percorso = os.path.join(tempfile.mkdtemp(), 'n.jsonl')
+    >>> scrive_righe(percorso, [{'n': i} for i in range(10)])
+    10
+    >>> c = ContenitoreSuFile(percorso, blocco=4)
+    >>> c.filtra(lambda r: r['n'] % 2 == 0).mappa(lambda r: r['n']).lista()
+    [0, 2, 4, 6, 8]
+    >>> c.riduce(lambda acc, r: acc + r['n'], 0), c.conta()
+    (45, 10)
+    """
+
+    __slots__ = ('percorso', 'formato', 'blocco', 'anticipo', '_passi')
+
+    def __init__(self, percorso: str, formato: str = None, blocco: int = BLOCCO,
+                 anticipo: int = ANTICIPO, _passi: Tuple[Tuple[int, Callable], ...] = ()):
+        if blocco < 1:
+            raise ValueError("blocco deve essere almeno 1")
+        if anticipo < 0:
+            raise ValueError("anticipo deve essere >= 0")
+        self.percorso = percorso
+        self.formato = _formato(percorso, formato)
+        self.blocco = blocco
+        self.anticipo = anticipo
+        self._passi = _passi
+
+    def _con(self, tipo: int, funzione: Callable) -> 'ContenitoreSuFile':
+        return ContenitoreSuFile(self.percorso, self.formato, self.blocco, self.anticipo,
+                                 self._passi + ((tipo, funzione),))
+
+    # --- Lettura ---
+
+    def _grezzi(self) -> Iterator[List[Any]]:
+        if self.formato == 'json':
+            return _righe_json(self.percorso, self.blocco)
+        return _messaggi_binario(self.percorso, self.blocco)
+
+    def _decodifica(self) -> Callable[[List[Any]], List[Any]]:
+        if self.formato == 'json':
+            return _decodifica_json
+        schemi: List[Any] = []  # tabella degli schemi del flusso, riempita in ordine
+        return lambda parte: [_decodifica_messaggio(m, schemi) for m in parte]
+
+    def blocchi(self) -> Iterator[List[Any]]:
+        """I blocchi di record con i passaggi applicati (liste, in ordine)."""
+        grezzi = self._grezzi()
+        if self.anticipo:
+            grezzi = _in_anticipo(grezzi, self.anticipo)
+        decodifica = self._decodifica()
+        try:
+            for parte in map(decodifica, grezzi):
+                for tipo, funzione in self._passi:
+                    if tipo == _FILTRA:
+                        parte = contenitore.filtra(parte, funzione)
+                    else:
+                        parte = contenitore.mappa(parte, funzione)
+                if parte:
+                    yield parte
+        finally:
+            grezzi.close()  # ferma il thread e chiude il file anche se il chiamante smette prima
+
+    def __iter__(self) -> Iterator[Any]:
+        return chain.from_iterable(self.blocchi())
+
+    # --- Passaggi (pigri) ---
+
+    def filtra(self, predicato: Callable[[Any], bool]) -> 'ContenitoreSuFile':
+        return self._con(_FILTRA, predicato)
+
+    def mappa(self, funzione: Callable[[Any], Any]) -> 'ContenitoreSuFile':
+        return self._con(_MAPPA, funzione)
+
+    # --- Terminali (una lettura del file) ---
+
+    def riduce(self, funzione: Callable[[Any, Any], Any], iniziale: Any) -> Any:
+        acc = iniziale
+        for parte in self.blocchi():
+            acc = contenitore.riduce(parte, funzione, acc)
+        return acc
+
+    def conta(self) -> int:
+        return sum(map(len, self.blocchi()))
+
+    def lista(self) -> List[Any]:
+        """Tutti i record in memoria (solo per risultati piccoli)."""
+        return list(self)
+
+    def scrive(self, percorso: str, formato: str = None) -> 'ContenitoreSuFile':
+        """
+        Scrive i record su un nuovo file, un blocco alla volta; ritorna il
+        contenitore su quel file.
+        """
+        scrive_righe(percorso, self, formato)
+        return ContenitoreSuFile(percorso, formato, self.blocco, self.anticipo)
+
+    def __repr__(self) -> str:
+        return (f'ContenitoreSuFile({self.percorso!r}, formato={self.formato!r}, '
+                f'blocco={self.blocco}, passi={len(self._passi)})')
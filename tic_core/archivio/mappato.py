@@ -0,0 +1,270 @@
+"""
+ARCHIVIO — Record a layout fisso in un file mappato in memoria
+
+Per dati di riferimento letti spesso e scritti di rado (cataloghi,
+piante dei tavoli) invece di caricare tutto in dict all'avvio:
+
+    scrive_mappato('catalogo.tic', prodotti)        # una volta
+    catalogo = ArchivioMappato('catalogo.tic')      # O(1): solo l'header
+    p = catalogo[12345]                             # ElementoMappato
+    elemento.legge(p, 'prezzo')                     # decodifica quel campo dal buffer
+    elemento.scrive(p, 'prezzo', 9.9)               # Elemento normale (copy-on-write)
+
+Tempo di apertura e memoria residente non dipendono dalla dimensione
+del catalogo: il sistema operativo carica solo le pagine lette.
+
+Tipi di campo:
+    'i'    intero 64 bit (con segno)
+    'f'    float 64 bit
+    'b'    bool
+    's<N>' stringa utf-8 di al più N byte, senza '\\x00' finali (il
+           riempimento a N byte è di zeri e si toglie in lettura)
+
+I valori non rappresentabili (interi fuori da 64 bit, stringhe troppo
+lunghe o con '\\x00' finali) sono rifiutati in scrittura con ValueError.
+"""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
+from collections.abc import Sequence as _SequenceABC
+import json
+import mmap
+import struct
+
+from ..archetipi.elemento import Elemento, Meta, META_VUOTO, _con_campi
+
+MAGIA = b'TM\x01'
+
+_U32 = struct.Struct('<I')
+_FORMATI = {'i': 'q', 'f': 'd', 'b': '?'}
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+
+def _formato(tipo: str) -> str:
+    if tipo in _FORMATI:
+        return _FORMATI[tipo]
+    if tipo.startswith('s') and tipo[1:].isdigit() and int(tipo[1:]) > 0:
+        return f'{int(tipo[1:])}s'
+    raise ValueError(f"Tipo di campo non valido: '{tipo}' (ammessi: i, f, b, s<N>)")
+
+
+def deduce_layout(righe: Sequence[Any]) -> List[Tuple[str, str]]:
+    """
+    Layout dai valori: int → 'i', float → 'f', bool → 'b',
+    str → 's<N>' con N la lunghezza massima in byte.
+
+    >>> from tic_core.archetipi import elemento
+    >>> deduce_layout([elemento.crea({'sku': 'A1', 'prezzo': 9.5})])
+    [('sku', 's2'), ('prezzo', 'f')]
+    """
+    from ..archetipi.elemento import elemento
+    if not righe:
+        return []
+    layout = []
+    for campo in elemento.campi(righe[0]):
+        valori = [elemento.legge(r, campo) for r in righe]
+        tipi = set(map(type, valori))
+        if tipi == {bool}:
+            tipo = 'b'
+        elif tipi == {int}:
+            tipo = 'i'
+        elif tipi <= {int, float}:
+            tipo = 'f'
+        elif tipi == {str}:
+            tipo = f's{max(1, max(len(v.encode("utf-8")) for v in valori))}'
+        else:
+            nomi = sorted(t.__name__ for t in tipi)
+            raise ValueError(f"Campo '{campo}' non rappresentabile a layout fisso: {nomi}")
+        layout.append((campo, tipo))
+    return layout
+
+
+def scrive_mappato(percorso: str, righe: Iterable[Any],
+                   layout: Sequence[Tuple[str, str]] = None) -> int:
+    """
+    Scrive un archivio di record a layout fisso. Ritorna il numero di record.
+
+    layout: [(campo, tipo), ...]; default dedotto dai valori (deduce_layout).
+    """
+    from ..archetipi.elemento import elemento
+    righe = list(righe)
+    if layout is None:
+        layout = deduce_layout(righe)
+    layout = [(campo, tipo) for campo, tipo in layout]
+    record = struct.Struct('<' + ''.join(_formato(tipo) for _, tipo in layout))
+    header = json.dumps({'layout': layout, 'n': len(righe)}).encode('utf-8')
+    inizio = _inizio_dati(len(header))
+
+    with open(percorso, 'wb') as f:
+        f.write(MAGIA)
+        f.write(_U32.pack(len(header)))
+        f.write(header)
+        f.write(b'\x00' * (inizio - len(MAGIA) - 4 - len(header)))
+        for riga in righe:
+            valori = []
+            for campo, tipo in layout:
+                v = elemento.legge(riga, campo)
+                if tipo[0] == 's':
+                    v = v.encode('utf-8')
+                    if len(v) > int(tipo[1:]):
+                        raise ValueError(
+                            f"Valore troppo lungo per '{campo}' ({tipo}): {len(v)} byte")
+                    if v.endswith(b'\x00'):
+                        raise ValueError(
+                            f"Valore di '{campo}' con '\\x00' finali: si perderebbero in lettura")
+                elif tipo == 'i' and not _INT64_MIN <= v <= _INT64_MAX:
+                    raise ValueError(f"Intero fuori da 64 bit per '{campo}': {v}")
+                valori.append(v)
+            f.write(record.pack(*valori))
+    return len(righe)
+
+
+def _inizio_dati(lunghezza_header: int) -> int:
+    """I record iniziano allineati a 8 byte dopo l'header."""
+    n = len(MAGIA) + 4 + lunghezza_header
+    return (n + 7) & ~7
+
+
+class ArchivioMappato(_SequenceABC):
+    """
+    Sequenza read-only di ElementoMappato su un file mappato in memoria.
+
+    Aprire l'archivio legge solo l'header; i record si decodificano
+    campo per campo quando vengono letti.
+    """
+
+    def __init__(self, percorso: str):
+        self._file = open(percorso, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # file vuoto
+            self._file.close()
+            raise ValueError(f"Archivio non valido: {percorso}") from None
+        self._buf = memoryview(self._mm)
+        if bytes(self._buf[:len(MAGIA)]) != MAGIA:
+            self.chiudi()
+            raise ValueError(f"Archivio non valido: {percorso}")
+        lunghezza = _U32.unpack_from(self._buf, len(MAGIA))[0]
+        inizio_header = len(MAGIA) + 4
+        header = json.loads(bytes(self._buf[inizio_header:inizio_header + lunghezza]))
+        self.layout: List[Tuple[str, str]] = [tuple(c) for c in header['layout']]
+        self._n: int = header['n']
+        self._inizio = _inizio_dati(lunghezza)
+
+        # Un lettore precompilato per campo: (buffer, offset record) → valore
+        self._lettori: Dict[str, Callable[[Any, int], Any]] = {}
+        scostamento = 0
+        for campo, tipo in self.layout:
+            struttura = struct.Struct('<' + _formato(tipo))
+            self._lettori[campo] = _lettore(struttura, scostamento, tipo)
+            scostamento += struttura.size
+        self._dimensione_record = scostamento
+        if self._inizio + self._n * scostamento > len(self._mm):
+            self.chiudi()
+            raise ValueError(f"Archivio troncato: {percorso}")
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __getitem__(self, indice: Any) -> Any:
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(self._n))]
+        if indice < 0:
+            indice += self._n
+        if not 0 <= indice < self._n:
+            raise IndexError('indice fuori dall\'archivio')
+        return ElementoMappato(self, self._inizio + indice * self._dimensione_record)
+
+    def __iter__(self) -> Iterator['ElementoMappato']:
+        passo = self._dimensione_record
+        for offset in range(self._inizio, self._inizio + self._n * passo, passo):
+            yield ElementoMappato(self, offset)
+
+    def legge_colonna(self, campo: str) -> List[Any]:
+        """Tutti i valori di un campo, senza creare le viste dei record."""
+        lettore = self._lettori[campo]
+        buf, passo = self._buf, self._dimensione_record
+        return [lettore(buf, o) for o in range(self._inizio, self._inizio + self._n * passo, passo)]
+
+    def chiudi(self) -> None:
+        """Rilascia la mappatura (le viste esistenti non sono più leggibili)."""
+        if self._mm is not None:
+            self._buf.release()
+            self._mm.close()
+            self._file.close()
+            self._mm = None
+
+    def __enter__(self) -> 'ArchivioMappato':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.chiudi()
+
+    def __repr__(self) -> str:
+        return f'ArchivioMappato(record={self._n}, layout={self.layout})'
+
+
+def _lettore(struttura: struct.Struct, scostamento: int, tipo: str) -> Callable[[Any, int], Any]:
+    unpack_from = struttura.unpack_from
+    if tipo[0] == 's':
+        def leggi_str(buf: Any, offset: int) -> str:
+            return unpack_from(buf, offset + scostamento)[0].rstrip(b'\x00').decode('utf-8')
+        return leggi_str
+
+    def leggi(buf: Any, offset: int) -> Any:
+        return unpack_from(buf, offset + scostamento)[0]
+    return leggi
+
+
+class ElementoMappato(Elemento):
+    """
+    Vista read-only di un record dell'archivio.
+
+    legge decodifica il campo direttamente dal buffer mappato;
+    scrive/modifica/elimina producono un Elemento normale.
+    """
+
+    __slots__ = ('_archivio', '_offset')
+
+    def __init__(self, archivio: ArchivioMappato, offset: int):
+        _IMPOSTA_ARCHIVIO(self, archivio)
+        _IMPOSTA_OFFSET(self, offset)
+        _IMPOSTA_META(self, META_VUOTO)
+
+    def __setattr__(self, nome: str, valore: Any) -> None:
+        raise TypeError("Record mappato immutabile: usa elemento.scrive")
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        raise TypeError("Record mappato immutabile: usa elemento.scrive")
+
+    @property
+    def _dati(self) -> Dict[str, Any]:
+        buf, offset = self._archivio._buf, self._offset
+        return {campo: lettore(buf, offset) for campo, lettore in self._archivio._lettori.items()}
+
+    def __repr__(self) -> str:
+        return f'ElementoMappato({self._dati!r})'
+
+    def __reduce__(self):
+        return (Elemento, (self._dati, self._meta))
+
+    # --- Interfaccia Elemento ---
+
+    def _legge(self, campo: str, default: Any) -> Any:
+        lettore = self._archivio._lettori.get(campo)
+        if lettore is None:
+            return default
+        return lettore(self._archivio._buf, self._offset)
+
+    def _con_modifiche(self, modifiche: Mapping[str, Any], meta: Meta) -> Elemento:
+        return Elemento(_dati=_con_campi(self._dati, modifiche), _meta=meta)
+
+    def _con_meta(self, meta: Meta) -> Elemento:
+        return Elemento(_dati=self._dati, _meta=meta)
+
+    def _campi(self) -> list:
+        return list(self._archivio._lettori)
+
+
+_IMPOSTA_ARCHIVIO = ElementoMappato._archivio.__set__
+_IMPOSTA_OFFSET = ElementoMappato._offset.__set__
+_IMPOSTA_META = Elemento._meta.__set__
@@ -15,8 +15,18 @@ MTM (Medium Term Memory):
 STM (Short Term Memory):
   - Foglie, livello 5+
   - Ring buffer, sovrascrive vecchi
+
+MEMO:
+  - @biocache.memo(livello=..., chiave=...) per celle pure
+  - MemoriaDisco: risultati content-addressed su disco (cartella o sqlite)
 """
 
 from .cache import BiocCache, LTM, MTM, STM
+from .memo import memo, impronta_argomenti
+from .disco import MemoriaDisco, impronta_canonica
 
-__all__ = ['BiocCache', 'LTM', 'MTM', 'STM']
+__all__ = [
+    'BiocCache', 'LTM', 'MTM', 'STM',
+    'memo', 'impronta_argomenti',
+    'MemoriaDisco', 'impronta_canonica'
+]
@@ -0,0 +1,364 @@
+"""
+BIOCACHE — Memoria su disco per celle pure
+
+Le celle pure danno lo stesso risultato per gli stessi input anche tra
+processi e riavvii. MemoriaDisco salva i risultati in modo content-addressed:
+
+    chiave = (identità cella, impronta canonica degli argomenti)
+
+Backend:
+  - cartella locale:  MemoriaDisco('/tmp/tic-cache')
+  - file sqlite:      MemoriaDisco('/tmp/tic-cache.sqlite')
+
+Pulizia LRU quando la dimensione totale supera max_bytes: si rimuovono
+i risultati meno usati fino a SOGLIA_PULIZIA × max_bytes, così la
+scansione dell'archivio (O(n)) capita una volta ogni ~20% di max_bytes
+scritti e non a ogni scrittura.
+
+Uso:
+    disco = MemoriaDisco('.tic-cache', max_bytes=512 * 1024 * 1024)
+
+    @disco.memo()
+    def prezzo_listino(prodotto):
+        ...
+
+    disco.statistiche()   # {'modulo.prezzo_listino': {'hit': .., 'miss': .., 'tasso_hit': ..}}
+"""
+
+from typing import Any, Callable, Dict, List, Tuple
+from collections.abc import Mapping as _MappingABC
+from functools import wraps
+import hashlib
+import os
+import pickle
+import re
+import sqlite3
+import struct
+import time
+
+from ..archetipi.elemento import Elemento
+from ..archetipi.indicizzato import ContenitoreIndicizzato
+from ..archetipi.ordinato import ContenitoreOrdinato
+from ..archetipi.persistente import VettorePersistente
+
+# La pulizia LRU scende a questa frazione di max_bytes
+SOGLIA_PULIZIA = 0.8
+
+
+class MemoriaDisco:
+    """
+    Archivio persistente dei risultati di celle pure.
+
+    Configurazione:
+        percorso:  cartella, oppure file .sqlite / .db
+        max_bytes: dimensione massima prima della pulizia LRU
+    """
+
+    def __init__(self, percorso: str, max_bytes: int = 256 * 1024 * 1024):
+        if percorso.endswith(('.sqlite', '.sqlite3', '.db')):
+            self._archivio = _ArchivioSqlite(percorso)
+        else:
+            self._archivio = _ArchivioCartella(percorso)
+        self._max_bytes = max_bytes
+        self._contatori: Dict[str, List[int]] = {}  # cella → [hit, miss]
+
+    def leggi(self, cella: str, impronta: str) -> Tuple[bool, Any]:
+        """
+        Legge un risultato. Ritorna (trovato, valore).
+        Aggiorna il contatore hit/miss della cella.
+        """
+        dati = self._archivio.leggi(cella, impronta)
+        contatore = self._contatori.setdefault(cella, [0, 0])
+        if dati is None:
+            contatore[1] += 1
+            return (False, None)
+        contatore[0] += 1
+        return (True, pickle.loads(dati))
+
+    def scrivi(self, cella: str, impronta: str, valore: Any) -> None:
+        """Scrive un risultato e applica la pulizia LRU se necessario."""
+        dati = pickle.dumps(valore, protocol=pickle.HIGHEST_PROTOCOL)
+        self._archivio.scrivi(cella, impronta, dati)
+        if self._archivio.dimensione() > self._max_bytes:
+            self._archivio.pulisci(int(self._max_bytes * SOGLIA_PULIZIA))
+
+    def memo(self, chiave: str = None, versione: str = ''):
+        """
+        Decoratore: memoizza una cella pura su disco.
+
+        chiave:   identità della cella (default: modulo.nome)
+        versione: da cambiare quando cambia il codice della cella
+        """
+        def decorator(func: Callable):
+            cella = chiave or f'{func.__module__}.{func.__qualname__}'
+            if versione:
+                cella = f'{cella}@{versione}'
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                impronta = impronta_canonica(args, kwargs)
+                trovato, valore = self.leggi(cella, impronta)
+                if trovato:
+                    return valore
+                risultato = func(*args, **kwargs)
+                self.scrivi(cella, impronta, risultato)
+                return risultato
+
+            return wrapper
+        return decorator
+
+    def statistiche(self) -> Dict[str, Dict[str, Any]]:
+        """Hit/miss per cella nel processo corrente."""
+        risultato = {}
+        for cella, (hit, miss) in self._contatori.items():
+            totale = hit + miss
+            risultato[cella] = {
+                'hit': hit,
+                'miss': miss,
+                'tasso_hit': hit / totale if totale else 0.0,
+            }
+        return risultato
+
+    def dimensione(self) -> int:
+        """Byte occupati dai risultati salvati."""
+        return self._archivio.dimensione()
+
+    def pulisci(self, max_bytes: int = None) -> None:
+        """Rimuove i risultati meno usati di recente fino a max_bytes."""
+        self._archivio.pulisci(self._max_bytes if max_bytes is None else max_bytes)
+
+    def chiudi(self) -> None:
+        """Chiude l'archivio (rilascia la connessione sqlite)."""
+        self._archivio.chiudi()
+
+
+# === Impronta canonica ===
+
+def impronta_canonica(args: Tuple[Any, ...], kwargs: Dict[str, Any] = None) -> str:
+    """
+    Impronta stabile tra processi degli argomenti di una cella.
+
+    A differenza di hash(), non dipende da PYTHONHASHSEED:
+    dict e set sono ordinati, float codificati esattamente.
+
+    >>> impronta_canonica((1, 'a')) == impronta_canonica((1, 'a'))
+    True
+    """
+    parti: List[bytes] = []
+    _canonico(tuple(args), parti)
+    _canonico(dict(kwargs or {}), parti)
+    return hashlib.blake2b(b''.join(parti), digest_size=20).hexdigest()
+
+
+def _canonico(valore: Any, parti: List[bytes]) -> None:
+    """Codifica canonica ricorsiva (tag + contenuto)."""
+    if valore is None:
+        parti.append(b'N')
+    elif valore is True:
+        parti.append(b'T')
+    elif valore is False:
+        parti.append(b'F')
+    elif isinstance(valore, int):
+        parti.append(b'i' + str(valore).encode() + b';')
+    elif isinstance(valore, float):
+        parti.append(b'f' + struct.pack('<d', valore))
+    elif isinstance(valore, str):
+        b = valore.encode('utf-8')
+        parti.append(b's' + str(len(b)).encode() + b':' + b)
+    elif isinstance(valore, bytes):
+        parti.append(b'b' + str(len(valore)).encode() + b':' + valore)
+    elif isinstance(valore, Elemento):
+        parti.append(b'E')
+        _canonico(dict(valore._dati), parti)
+        _canonico(bool(valore._meta.eliminato), parti)
+    elif isinstance(valore, _MappingABC):  # dict, DizionarioCongelato, MappaPersistente
+        voci = []
+        for k, v in valore.items():
+            pk: List[bytes] = []
+            pv: List[bytes] = []
+            _canonico(k, pk)
+            _canonico(v, pv)
+            voci.append((b''.join(pk), b''.join(pv)))
+        voci.sort()
+        parti.append(b'd' + str(len(voci)).encode() + b':')
+        for k, v in voci:
+            parti.append(k)
+            parti.append(v)
+    elif isinstance(valore, (list, tuple)):
+        _canonico_sequenza(b'l' if isinstance(valore, list) else b't', valore, parti)
+    elif isinstance(valore, ContenitoreIndicizzato):
+        parti.append(b'x')
+        _canonico(valore.chiavi, parti)
+        _canonico_sequenza(b'v', valore, parti)
+    elif isinstance(valore, VettorePersistente):
+        _canonico_sequenza(b'v', valore, parti)
+    elif isinstance(valore, ContenitoreOrdinato):
+        parti.append(b'o')
+        _canonico(_nome_chiave(valore.chiave), parti)
+        _canonico_sequenza(b'v', valore, parti)
+    elif isinstance(valore, (set, frozenset)):
+        voci = []
+        for v in valore:
+            pv: List[bytes] = []
+            _canonico(v, pv)
+            voci.append(b''.join(pv))
+        voci.sort()
+        parti.append(b'S' + str(len(voci)).encode() + b':')
+        parti.extend(voci)
+    else:
+        raise TypeError(f"Valore non canonicizzabile: {type(valore).__name__}")
+
+
+def _canonico_sequenza(tag: bytes, valore: Any, parti: List[bytes]) -> None:
+    parti.append(tag + str(len(valore)).encode() + b':')
+    for v in valore:
+        _canonico(v, parti)
+
+
+def _nome_chiave(chiave: Any) -> Any:
+    """Chiave di ordinamento canonicizzabile: il campo, o ('funzione', modulo.nome)."""
+    if isinstance(chiave, str):
+        return chiave
+    nome = getattr(chiave, '__qualname__', '<')
+    if '<' in nome:  # lambda o funzione locale: nessuna identità stabile tra processi
+        raise TypeError(f"Chiave di ordinamento non canonicizzabile: {chiave!r}")
+    return ('funzione', f'{chiave.__module__}.{nome}')
+
+
+# === Backend ===
+
+class _ArchivioCartella:
+    """
+    Un file per risultato: <cartella>/<cella>-<hash>/<hh>/<impronta>. LRU via mtime.
+
+    Il nome della cella è ripulito per il filesystem; l'hash del nome
+    originale evita che celle diverse finiscano nella stessa cartella.
+    """
+
+    def __init__(self, percorso: str):
+        self._radice = percorso
+        os.makedirs(percorso, exist_ok=True)
+        self._dimensione = sum(os.path.getsize(p) for p in self._file())
+
+    def _percorso(self, cella: str, impronta: str) -> str:
+        nome_cella = re.sub(r'[^A-Za-z0-9._@-]', '_', cella)
+        nome_cella += '-' + hashlib.blake2b(cella.encode('utf-8'), digest_size=4).hexdigest()
+        return os.path.join(self._radice, nome_cella, impronta[:2], impronta)
+
+    def leggi(self, cella: str, impronta: str):
+        percorso = self._percorso(cella, impronta)
+        try:
+            with open(percorso, 'rb') as f:
+                dati = f.read()
+        except FileNotFoundError:
+            return None
+        os.utime(percorso)  # accesso recente → ultimo a essere rimosso
+        return dati
+
+    def scrivi(self, cella: str, impronta: str, dati: bytes) -> None:
+        percorso = self._percorso(cella, impronta)
+        os.makedirs(os.path.dirname(percorso), exist_ok=True)
+        try:
+            self._dimensione -= os.path.getsize(percorso)
+        except FileNotFoundError:
+            pass
+        temporaneo = f'{percorso}.{os.getpid()}.tmp'
+        with open(temporaneo, 'wb') as f:
+            f.write(dati)
+        os.replace(temporaneo, percorso)
+        self._dimensione += len(dati)
+
+    def dimensione(self) -> int:
+        return self._dimensione
+
+    def pulisci(self, max_bytes: int) -> None:
+        voci = sorted((os.stat(p).st_mtime_ns, p) for p in self._file())
+        for _, percorso in voci:
+            if self._dimensione <= max_bytes:
+                break
+            self._dimensione -= os.path.getsize(percorso)
+            os.remove(percorso)
+
+    def _file(self):
+        for cartella, _, nomi in os.walk(self._radice):
+            for nome in nomi:
+                if not nome.endswith('.tmp'):
+                    yield os.path.join(cartella, nome)
+
+    def chiudi(self) -> None:
+        pass
+
+
+class _ArchivioSqlite:
+    """Tabella (cella, impronta) → valore, con colonna di accesso per LRU."""
+
+    def __init__(self, percorso: str):
+        self._db = sqlite3.connect(percorso)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS risultati ('
+            ' cella TEXT NOT NULL,'
+            ' impronta TEXT NOT NULL,'
+            ' valore BLOB NOT NULL,'
+            ' dimensione INTEGER NOT NULL,'
+            ' accesso REAL NOT NULL,'
+            ' PRIMARY KEY (cella, impronta))'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS risultati_accesso ON risultati (accesso)')
+        self._db.commit()
+        self._dimensione = self._db.execute(
+            'SELECT COALESCE(SUM(dimensione), 0) FROM risultati'
+        ).fetchone()[0]
+
+    def leggi(self, cella: str, impronta: str):
+        riga = self._db.execute(
+            'SELECT valore FROM risultati WHERE cella = ? AND impronta = ?',
+            (cella, impronta),
+        ).fetchone()
+        if riga is None:
+            return None
+        self._db.execute(
+            'UPDATE risultati SET accesso = ? WHERE cella = ? AND impronta = ?',
+            (time.time(), cella, impronta),
+        )
+        self._db.commit()
+        return riga[0]
+
+    def scrivi(self, cella: str, impronta: str, dati: bytes) -> None:
+        precedente = self._db.execute(
+            'SELECT dimensione FROM risultati WHERE cella = ? AND impronta = ?',
+            (cella, impronta),
+        ).fetchone()
+        if precedente is not None:
+            self._dimensione -= precedente[0]
+        self._db.execute(
+            'INSERT OR REPLACE INTO risultati VALUES (?, ?, ?, ?, ?)',
+            (cella, impronta, dati, len(dati), time.time()),
+        )
+        self._db.commit()
+        self._dimensione += len(dati)
+
+    def dimensione(self) -> int:
+        return self._dimensione
+
+    def pulisci(self, max_bytes: int) -> None:
+        eccesso = self._dimensione - max_bytes
+        if eccesso <= 0:
+            return
+        # Cursore sull'indice di accesso: si leggono solo le righe da rimuovere
+        righe = self._db.execute(
+            'SELECT cella, impronta, dimensione FROM risultati ORDER BY accesso'
+        )
+        da_rimuovere = []
+        for cella, impronta, dimensione in righe:
+            if eccesso <= 0:
+                break
+            da_rimuovere.append((cella, impronta))
+            eccesso -= dimensione
+            self._dimensione -= dimensione
+        self._db.executemany(
+            'DELETE FROM risultati WHERE cella = ? AND impronta = ?', da_rimuovere
+        )
+        self._db.commit()
+
+    def chiudi(self) -> None:
+        self._db.close()
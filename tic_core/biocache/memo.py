@@ -0,0 +1,109 @@
+"""
+BIOCACHE — Memoizzazione di celle pure
+
+Le celle costruite dagli archetipi sono deterministiche (Assioma 4, PUREZZA):
+stesso input → stesso output. Il risultato si può quindi salvare in BiocCache
+e riusare per ogni chiamata con gli stessi argomenti.
+
+Uso:
+    @biocache.memo(livello=MTM, chiave='carrello.totale')
+    def query_carrello_totale(carrello):
+        ...
+
+    # Chiave in cache: 'carrello.totale.<impronta argomenti>'
+    # Valore: (argomenti, kwargs, risultato), confrontati a ogni hit
+"""
+
+from typing import Any, Callable, Dict, Tuple
+from collections.abc import Mapping as _MappingABC
+from functools import wraps
+
+from ..archetipi.elemento import Elemento, elemento
+from .cache import BiocCache, Livello, STM, _cache_globale
+
+
+def impronta_argomenti(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> str:
+    """
+    Calcola l'impronta (esadecimale) degli argomenti di una cella.
+
+    Gli argomenti hashable usano hash() direttamente; Elemento, dict e list
+    (non hashable) passano per l'hash strutturale di elemento.impronta.
+    L'impronta può collidere (hash(-1) == hash(-2), 1 == 1.0 == True):
+    memo salva anche gli argomenti e li confronta con stessi_argomenti.
+    """
+    parti = tuple(_impronta_valore(a) for a in args)
+    if kwargs:
+        parti += tuple(sorted((k, _impronta_valore(v)) for k, v in kwargs.items()))
+    return format(hash(parti) & 0xFFFFFFFFFFFFFFFF, '016x')
+
+
+def _impronta_valore(valore: Any) -> int:
+    """Fast path per valori hashable, hash strutturale per gli altri."""
+    try:
+        return hash(valore)
+    except TypeError:
+        return elemento.impronta(valore)
+
+
+def stessi_argomenti(a: Any, b: Any) -> bool:
+    """
+    Uguaglianza strutturale che distingue i tipi: 1, 1.0 e True sono
+    diversi, come [1] e (1,). Degli Elemento conta solo il contenuto
+    (non i timbri).
+
+    >>> stessi_argomenti((1, [2]), (1, [2])), stessi_argomenti((1,), (1.0,))
+    (True, False)
+    """
+    if a is b:
+        return True
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, Elemento):
+        return (a._meta.eliminato == b._meta.eliminato
+                and stessi_argomenti(dict(a._dati.items()), dict(b._dati.items())))
+    if isinstance(a, _MappingABC):
+        return a.keys() == b.keys() and all(stessi_argomenti(v, b[k]) for k, v in a.items())
+    if isinstance(a, (set, frozenset)):
+        return {(type(x), x) for x in a} == {(type(x), x) for x in b}
+    if isinstance(a, (str, bytes)):
+        return a == b
+    try:
+        n = len(a)
+    except TypeError:
+        return a == b
+    return n == len(b) and all(stessi_argomenti(x, y) for x, y in zip(a, b))
+
+
+def memo(livello: Livello = STM, chiave: str = None, cache: BiocCache = None):
+    """
+    Decoratore: memoizza una cella pura in BiocCache.
+
+    livello: livello di memoria dei risultati (default STM, ring buffer)
+    chiave:  prefisso dot-path (default: nome della funzione)
+    cache:   istanza BiocCache (default: cache globale)
+
+    >>> @memo(chiave='quadrato')
+    ... def quadrato(x):
+    ...     return x * x
+    >>> quadrato(4)
+    16
+    """
+    def decorator(func: Callable):
+        prefisso = chiave or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            c = cache if cache is not None else _cache_globale
+            k = f'{prefisso}.{impronta_argomenti(args, kwargs)}'
+            if c.esiste(k):
+                # Gli argomenti salvati escludono le collisioni dell'impronta
+                salvati, kwargs_salvati, risultato = c.leggi(k)
+                if stessi_argomenti(salvati, args) and stessi_argomenti(kwargs_salvati, kwargs):
+                    return risultato
+            risultato = func(*args, **kwargs)
+            c.scrivi(k, (args, kwargs, risultato), livello)
+            return risultato
+
+        return wrapper
+    return decorator
+
@@ -20,6 +20,13 @@ Esempio:
         return [t for t in tavoli if t.stato == 'libero']
 
     # Quando tavolo.1.stato cambia → tavoli.liberi si aggiorna
+
+Con cache:
+    tessuto = Tessuto(cache=BiocCache(stm_size=10000))
+
+    # I derivati vivono in BiocCache sotto il nome del nodo, non in Nodo.valore,
+    # sempre nel livello dato (default STM): mai in LTM, che non fa eviction.
+    # Invalidazione = elimina dalla cache. Un derivato evicted si ricalcola.
 """
 
 from typing import Any, Callable, Dict, List, Optional, Set
@@ -28,6 +35,8 @@ from functools import wraps
 import re
 from collections import defaultdict
 
+from ..biocache.cache import Livello, STM
+
 
 @dataclass
 class Nodo:
@@ -51,7 +60,16 @@ class Tessuto:
     Gestisce fatti base, derivati e le connessioni tra loro.
     """
 
-    def __init__(self):
+    def __init__(self, cache=None, livello: Livello = STM):
+        """
+        cache: BiocCache opzionale per i valori derivati.
+               Se assente, i derivati restano in Nodo.valore.
+        livello: livello BiocCache dei derivati (default STM, ring buffer).
+                 Esplicito perché il livello automatico manda i nomi brevi
+                 (es. 'tavoli.liberi') in LTM, che non fa eviction.
+        """
+        self._cache = cache
+        self._livello = livello
         self._nodi: Dict[str, Nodo] = {}
         self._pattern_dipendenze: Dict[str, List[str]] = defaultdict(list)
         self._listeners: Dict[str, List[Callable]] = defaultdict(list)
@@ -142,6 +160,9 @@ class Tessuto:
 
         nodo = self._nodi[nome]
 
+        if nodo.è_derivato and self._cache is not None:
+            return self._legge_da_cache(nodo)
+
         if nodo.è_derivato and nodo.sporco:
             # Ricalcola il derivato
             nodo.valore = nodo.calcolatore()
@@ -149,6 +170,19 @@ class Tessuto:
 
         return nodo.valore
 
+    def _legge_da_cache(self, nodo: Nodo) -> Any:
+        """Legge un derivato da BiocCache, ricalcolandolo se freddo o evicted."""
+        if not nodo.sporco:
+            # Il valore è salvato come (valore,): un derivato None resta un hit
+            salvato = self._cache.leggi(nodo.nome)
+            if salvato is not None:
+                return salvato[0]
+
+        valore = nodo.calcolatore()
+        self._cache.scrivi(nodo.nome, (valore,), self._livello)
+        nodo.sporco = False
+        return valore
+
     def _propaga(self, nome: str) -> None:
         """Propaga il cambiamento ai nodi dipendenti."""
         if self._batch_mode:
@@ -160,6 +194,8 @@ class Tessuto:
         for dep_nome in da_aggiornare:
             if dep_nome in self._nodi:
                 self._nodi[dep_nome].sporco = True
+                if self._cache is not None:
+                    self._cache.elimina(dep_nome)
 
         # Propaga ai SALTI
         nodo = self._nodi.get(nome)